@@ -1,4 +1,4 @@
-from .conf import Conf, prop
+from .conf import Conf, derived, prop
 from .error import (
     ConfGroupExistsError,
     FrozenConfGroupError,
@@ -12,13 +12,24 @@ from . import prop_type
 
 
 __all__ = [
-    Conf,
-    FrozenConfPropError,
-    FrozenConfGroupError,
-    UnknownConfError,
-    ConfGroupExistsError,
-    prop_type,
-    make_prop_type,
-    ParameterError,
-    ParseError,
+    "Conf",
+    "FrozenConfPropError",
+    "FrozenConfGroupError",
+    "UnknownConfError",
+    "ConfGroupExistsError",
+    "prop_type",
+    "make_prop_type",
+    "prop",
+    "derived",
+    "ParameterError",
+    "ParseError",
 ]
+
+
+def __getattr__(name):
+    # Submodules with heavier imports are loaded on first access
+    if name == "layer":
+        import importlib
+
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,119 @@
+"""Command line interface of confect
+
+Compile configuration files into a snapshot at build time, so that production
+containers load the snapshot instead of evaluating the files.
+
+.. code:: console
+
+   $ python -m confect compile projx.core:conf \\
+         --import projx.db --import projx.api \\
+         --file path/to/project_conf.py --module projx_conf \\
+         --output conf.snapshot
+
+Generate the declaration manifest of a package for ``Conf.use_manifest()``.
+
+.. code:: console
+
+   $ python -m confect manifest projx --output confect_manifest.json
+"""
+import argparse
+import importlib
+import sys
+
+from confect import layer
+
+
+class _AppendLayer(argparse.Action):
+    """Collect layers of all layer options in command line order"""
+
+    def __init__(self, option_strings, dest, layer_cls, **kwargs):
+        self.layer_cls = layer_cls
+        super().__init__(option_strings, dest, **kwargs)
+
+    def __call__(self, parser, namespace, value, option_string=None):
+        layers = getattr(namespace, self.dest, None) or []
+        layers.append(self.layer_cls(value))
+        setattr(namespace, self.dest, layers)
+
+
+def _make_parser():
+    parser = argparse.ArgumentParser(prog="python -m confect")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser(
+        "compile", help="evaluate configuration files into a snapshot file"
+    )
+    compile_parser.add_argument(
+        "conf", help="Conf object in '<module>:<attribute>' format"
+    )
+    compile_parser.add_argument(
+        "-o", "--output", required=True, help="path of the snapshot file"
+    )
+    compile_parser.add_argument(
+        "-i",
+        "--import",
+        dest="imports",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="module to import for declaring configuration groups",
+    )
+    for option, layer_cls, metavar in [
+        ("--file", layer.File, "PATH"),
+        ("--module", layer.Module, "MODULE"),
+        ("--envvars", layer.EnvVars, "PREFIX"),
+    ]:
+        compile_parser.add_argument(
+            option,
+            dest="layers",
+            action=_AppendLayer,
+            layer_cls=layer_cls,
+            metavar=metavar,
+            help=f"load {layer_cls.__name__} layer, in command line order",
+        )
+
+    manifest_parser = subparsers.add_parser(
+        "manifest", help="generate the declaration manifest of a package"
+    )
+    manifest_parser.add_argument("package", help="package to scan")
+    manifest_parser.add_argument(
+        "-o", "--output", required=True, help="path of the manifest file"
+    )
+
+    return parser
+
+
+def _import_conf(target):
+    module_name, sep, attr = target.partition(":")
+    if not sep:
+        raise SystemExit(
+            f"Conf object should be in '<module>:<attribute>' format: {target!r}"
+        )
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def compile_snapshot(args):
+    conf = _import_conf(args.conf)
+    for module_name in args.imports:
+        importlib.import_module(module_name)
+
+    conf.load_layers(args.layers or [])
+    conf.dump_snapshot(args.output)
+
+
+def generate_manifest(args):
+    from confect import manifest
+
+    manifest.write(manifest.scan(args.package), args.output)
+
+
+def main(argv=None):
+    args = _make_parser().parse_args(argv)
+    if args.command == "compile":
+        compile_snapshot(args)
+    elif args.command == "manifest":
+        generate_manifest(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
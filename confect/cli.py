@@ -0,0 +1,246 @@
+"""Click commands with options created on demand
+
+``Conf.click_options()`` creates a ``click.Option`` for every property when
+the command is decorated, and click processes all of them on every
+invocation. With thousands of properties both become slow.
+
+Commands made by ``Conf.click_command()`` create the option of a property only
+when its ``--<group>-<prop>`` argument is given, or when the help message is
+shown. Options are limited to some groups with ``groups``, and the generic
+``--set <group>.<prop>=<value>`` option parses only the properties it is given.
+Given values are loaded as a ``Mapping`` layer named ``cli`` after parsing, so
+``Conf.provenance()`` and ``Conf.versions()`` see them.
+
+.. code:: python
+
+   @conf.click_command(groups=['db'])
+   def migrate():
+       ...
+"""
+import functools as fnt
+import weakref
+
+import click
+
+__all__ = ["ConfOptions", "ConfCommandMixin", "command_class"]
+
+SET_OPTION = "--set"
+
+
+class ConfOptions:
+    """Options of the configuration properties of a command
+
+    Parameters
+    ----------
+    conf : Conf
+        Conf object the options set
+    groups : Optional[Iterable[str]]
+        names of the groups with options, all groups by default
+    set_option : bool
+        whether to add the ``--set <group>.<prop>=<value>`` option
+    """
+
+    def __init__(self, conf, groups=None, set_option=True):
+        self._conf = conf
+        self._groups = None if groups is None else tuple(groups)
+        self._set_option = None
+        if set_option:
+            self._set_option = click.Option(
+                [SET_OPTION],
+                multiple=True,
+                metavar="GROUP.PROP=VALUE",
+                expose_value=False,
+                callback=self._record_set,
+                help="Set a configuration property, parsed from a string.",
+            )
+        #: {(group, prop): click.Option} created so far
+        self._options = {}
+        #: {ctx: {(group, prop): None} given in the arguments, or None for all}
+        self._given = weakref.WeakKeyDictionary()
+        #: {ctx: {group: {prop: value}}} parsed from the arguments
+        self._values = weakref.WeakKeyDictionary()
+        self._layer = None
+
+    def record_args(self, ctx, args):
+        """Find the properties given in ``args`` of the command of ``ctx``"""
+        help_names = set(ctx.help_option_names)
+        given = {}
+        for arg in args:
+            if arg == "--":
+                break
+            if not arg.startswith("--"):
+                continue
+
+            name = arg.split("=", 1)[0]
+            if name in help_names:
+                # all options are shown in the help message
+                given = None
+                break
+
+            key = self._key(name[2:])
+            if key is not None:
+                given[key] = None
+        self._given[ctx] = given
+
+    def params(self, ctx):
+        """Options of the command of ``ctx``
+
+        Returns
+        -------
+        List[click.Option]
+            options of the given properties, or of all properties in the
+            groups if the arguments aren't known yet or ask for help
+        """
+        given = self._given.get(ctx)
+        keys = self._all_keys() if given is None else given
+        params = [self._option(*key) for key in keys]
+        if self._set_option is not None:
+            params.append(self._set_option)
+        return params
+
+    def apply(self, ctx):
+        """Load the values parsed for ``ctx`` as the ``cli`` layer
+
+        The layer loaded by the previous invocation is replaced, so values of
+        one invocation don't leak into the next one.
+        """
+        from confect.layer import Mapping
+
+        values = self._values.pop(ctx, {})
+        conf = self._conf
+        loaded = self._layer is not None and any(
+            layer is self._layer for layer, _ in conf._layers
+        )
+        if not values:
+            if loaded:
+                conf.remove_layer(self._layer)
+            self._layer = None
+            return
+
+        layer = Mapping(values, name="cli")
+        if loaded:
+            conf.replace_layer(self._layer, layer)
+        else:
+            conf.load_layers([layer])
+        self._layer = layer
+
+    def _key(self, name):
+        group_name, _, prop_name = name.partition("-")
+        if self._groups is not None and group_name not in self._groups:
+            return None
+
+        group = self._conf._conf_groups.get(group_name)
+        if group is None:
+            return None
+
+        prop = group._properties.get(prop_name)
+        if prop is None or prop.prop_type is None:
+            return None
+        return group_name, prop_name
+
+    def _all_keys(self):
+        group_names = self._groups
+        if group_names is None:
+            group_names = list(self._conf._conf_groups)
+        for group_name in group_names:
+            group = self._conf[group_name]
+            for prop_name, prop in group._properties.items():
+                if prop.prop_type is not None:
+                    yield group_name, prop_name
+
+    def _option(self, group_name, prop_name):
+        key = (group_name, prop_name)
+        option = self._options.get(key)
+        if option is None:
+            prop = self._conf._conf_groups[group_name]._properties[prop_name]
+            option = self._options[key] = click.Option(
+                [f"--{group_name}-{prop_name}"],
+                default=prop.default,
+                callback=fnt.partial(self._record, group_name, prop_name),
+                expose_value=False,
+                type=prop.prop_type.click_param_type,
+                help=prop.desc,
+                show_default=True,
+            )
+        return option
+
+    def _record(self, group_name, prop_name, ctx, param, value):
+        if _is_given(ctx, param, value):
+            values = self._values.setdefault(ctx, {})
+            values.setdefault(group_name, {})[prop_name] = value
+
+    def _record_set(self, ctx, param, value):
+        strings = {}
+        for item in value:
+            path, sep, string = item.partition("=")
+            if not sep:
+                raise click.BadParameter(
+                    f"{item!r} is not in GROUP.PROP=VALUE form", ctx, param
+                )
+            strings[path] = string
+
+        parsed, errors = self._conf.parse_props(strings)
+        if errors:
+            raise click.BadParameter(
+                "\n".join(f"{path}: {exc}" for path, exc in errors.items()),
+                ctx,
+                param,
+            )
+
+        values = self._values.setdefault(ctx, {})
+        for group_name, group_values in parsed.items():
+            values.setdefault(group_name, {}).update(group_values)
+
+
+class ConfCommandMixin:
+    """Adds the options of ``conf_options`` to a ``click.Command`` class"""
+
+    conf_options = None
+
+    def parse_args(self, ctx, args):
+        self.conf_options.record_args(ctx, args)
+        args = super().parse_args(ctx, args)
+        self.conf_options.apply(ctx)
+        return args
+
+    def get_params(self, ctx):
+        params = super().get_params(ctx)
+        conf_params = self.conf_options.params(ctx)
+        # keep the help option last
+        help_option = self.get_help_option(ctx)
+        if help_option is not None and params and params[-1].name == help_option.name:
+            return params[:-1] + conf_params + params[-1:]
+        return params + conf_params
+
+
+def command_class(conf, base=None, *, groups=None, set_option=True):
+    """Return a subclass of ``base`` with options of configuration properties
+
+    Parameters
+    ----------
+    conf : Conf
+        Conf object the options set
+    base : Optional[Type[click.Command]]
+        command class, ``click.Command`` by default
+    groups : Optional[Iterable[str]]
+        names of the groups with options, all groups by default
+    set_option : bool
+        whether to add the ``--set <group>.<prop>=<value>`` option
+
+    Returns
+    -------
+    Type[click.Command]
+    """
+    if base is None:
+        base = click.Command
+    options = ConfOptions(conf, groups, set_option)
+    return type(base.__name__, (ConfCommandMixin, base), {"conf_options": options})
+
+
+def _is_given(ctx, param, value):
+    get_source = getattr(ctx, "get_parameter_source", None)
+    if get_source is None:
+        # click < 8 doesn't track where values come from
+        return value != param.default
+    source = get_source(param.name)
+    return source is not None and source.name == "COMMANDLINE"
@@ -0,0 +1,114 @@
+"""Cache of compiled configuration files for ``Conf.load_file()``
+
+Like ``__pycache__``, compiled code objects are stored in a file next to the
+configuration file, or in a separate cache directory. A cache file is valid if
+the modification time and size of the configuration file match. Otherwise, it
+is still reused if the content hash matches, which makes it survive a
+redeployment that only touches modification times.
+"""
+import hashlib
+import marshal
+import os
+import struct
+import sys
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+
+_MAGIC = MAGIC_NUMBER + b"cfct"
+# mtime_ns, size, sha1 digest of source
+_HEADER = struct.Struct("<qq20s")
+_HEADER_SIZE = len(_MAGIC) + _HEADER.size
+
+
+def cache_path(path, cache_dir=None):
+    """Path of the cache file of configuration file ``path``
+
+    Cache files are put into ``__pycache__`` next to the configuration file,
+    unless ``cache_dir`` or ``sys.pycache_prefix`` is set. Return ``None`` if
+    caching is not supported by this Python implementation.
+    """
+    cache_tag = sys.implementation.cache_tag
+    if cache_tag is None:
+        return None
+
+    path = Path(path).absolute()
+    if cache_dir is None:
+        # sys.pycache_prefix is new in python 3.8
+        cache_dir = getattr(sys, "pycache_prefix", None)
+
+    if cache_dir is None:
+        return path.parent / "__pycache__" / f"{path.name}.confect-{cache_tag}.pyc"
+
+    path_digest = hashlib.sha1(str(path).encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"{path.stem}.{path_digest}.confect-{cache_tag}.pyc"
+
+
+def load_code(path, cache_dir=None):
+    """Return the compiled code object of configuration file ``path``
+
+    The cache file is read if it's valid, and written otherwise unless
+    ``sys.dont_write_bytecode`` is set. Errors on reading or writing cache
+    files are ignored.
+    """
+    path = Path(path)
+    stat = path.stat()
+    pyc_path = cache_path(path, cache_dir)
+    header, data = _read_cache(pyc_path)
+
+    if header is not None:
+        mtime_ns, size, digest = header
+        if mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+            code = _unmarshal(data)
+            if code is not None:
+                return code
+
+    source = path.read_bytes()
+    source_digest = hashlib.sha1(source).digest()
+
+    code = None
+    if header is not None and header[2] == source_digest:
+        code = _unmarshal(data)
+    if code is None:
+        code = compile(source, str(path), "exec", dont_inherit=True)
+
+    if pyc_path is not None and not sys.dont_write_bytecode:
+        header = _HEADER.pack(stat.st_mtime_ns, stat.st_size, source_digest)
+        _write_cache(pyc_path, _MAGIC + header + marshal.dumps(code))
+
+    return code
+
+
+def _read_cache(pyc_path):
+    if pyc_path is None:
+        return None, None
+
+    try:
+        data = pyc_path.read_bytes()
+    except OSError:
+        return None, None
+
+    if len(data) < _HEADER_SIZE or not data.startswith(_MAGIC):
+        return None, None
+
+    header = _HEADER.unpack_from(data, len(_MAGIC))
+    return header, data[_HEADER_SIZE:]
+
+
+def _unmarshal(data):
+    try:
+        return marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_cache(pyc_path, data):
+    tmp_path = pyc_path.with_name(f"{pyc_path.name}.{os.getpid()}.tmp")
+    try:
+        pyc_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, pyc_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
@@ -1,11 +1,8 @@
 import functools as fnt
-import importlib
-import logging
-import os
 import weakref
+from collections import deque
 from contextlib import contextmanager
-from copy import deepcopy
-import warnings
+from contextvars import ContextVar
 
 
 import confect.prop_type
@@ -15,10 +12,9 @@ from confect.error import (
     FrozenConfPropError,
     UnknownConfError,
     ParameterError,
+    ParseError,
 )
 
-logger = logging.getLogger(__name__)
-
 
 class Undefined:
     """Undefined value"""
@@ -45,6 +41,28 @@ class Undefined:
 Undefined = Undefined()
 
 
+class Unparsed:
+    """String value that is parsed on first access of the property"""
+
+    __slots__ = ("prop_type", "string", "source")
+
+    def __init__(self, prop_type, string, source):
+        self.prop_type = prop_type
+        self.string = string
+        self.source = source
+
+    def parse(self):
+        try:
+            return self.prop_type.parse(self.string)
+        except Exception as exc:
+            raise ParseError(
+                f"Failed to parse {self.source}={self.string!r}: {exc}"
+            ) from exc
+
+    def __repr__(self):
+        return f"<{__name__}.{type(self).__qualname__} {self.source}={self.string!r}>"
+
+
 class ConfProperty:
 
     __slots__ = ("_value", "default", "prop_type", "desc")
@@ -96,6 +114,8 @@ class ConfProperty:
             )
 
         if parser is not None:
+            import warnings
+
             warnings.warn(
                 "`parser` argument of ConfProperty is deprecated.", DeprecationWarning
             )
@@ -117,15 +137,27 @@ class ConfProperty:
 
     @property
     def value(self):
-        if self._value is not Undefined:
-            return self._value
+        value = self._value
+        if value is Undefined:
+            return self.default
+
+        if type(value) is Unparsed:
+            value = self._value = value.parse()
 
-        return self.default
+        return value
 
     @value.setter
     def value(self, value):
         self._value = value
 
+    def _copy_declaration(self):
+        new_self = object.__new__(type(self))
+        new_self._value = Undefined
+        new_self.default = self.default
+        new_self.prop_type = self.prop_type
+        new_self.desc = self.desc
+        return new_self
+
     def click_callback(self, ctx, param, value):
         if param.default != value:
             self._value = value
@@ -142,6 +174,113 @@ class ConfProperty:
         return f"{self.desc} [default: {self.default!s}, value: {self.value!s}]"
 
 
+# Key of derived values cached in the local overrides of a mutate_locally block.
+# Overrides are never changed once assigned, so the cache is valid for all
+# contexts sharing them.
+_DERIVED_CACHE = object()
+
+# Live Conf objects, searched for declarations on unpickling
+_confs = weakref.WeakSet()
+
+
+class DerivedProperty:
+    """Configuration property computed from other properties
+
+    The result of ``func`` is cached. Properties read by ``func`` are
+    recorded as dependencies, and the cache is cleared once any of them
+    changes.
+    """
+
+    __slots__ = ("func", "desc", "_value", "_version", "_dependencies")
+
+    def __init__(self, func, *, desc=""):
+        self.func = func
+        self.desc = desc
+        self._value = Undefined
+        self._version = 0
+        self._dependencies = frozenset()
+
+    def get(self, group, name):
+        overrides = group._local_overrides.get()
+        if overrides:
+            return self._get_local(group, name, overrides)
+
+        value = self._value
+        if value is not Undefined:
+            return value
+
+        version = self._version
+        dependencies = set()
+        value = self.func(_DependencyTracker(group._conf, dependencies))
+        if version == self._version:
+            group._conf._set_dependencies(self, frozenset(dependencies))
+            self._value = value
+        return value
+
+    def _get_local(self, group, name, overrides):
+        key = (group._name, name)
+        cache = overrides.get(_DERIVED_CACHE)
+        if cache is not None and key in cache:
+            return cache[key]
+
+        if self._value is not Undefined and not any(
+            prop_name in overrides.get(group_name, ())
+            for group_name, prop_name in self._dependencies
+        ):
+            return self._value
+
+        value = self.func(_DependencyTracker(group._conf, set()))
+        overrides.setdefault(_DERIVED_CACHE, {})[key] = value
+        return value
+
+    def _invalidate(self):
+        self._value = Undefined
+        self._version += 1
+
+    def __repr__(self):
+        return (
+            f"<{__name__}.{type(self).__qualname__} "
+            f"func={self.func!r} value={self._value!r} desc={self.desc}>"
+        )
+
+
+class _DependencyTracker:
+    """Conf proxy that records properties read by a derived property"""
+
+    __slots__ = ("_conf", "_dependencies")
+
+    def __init__(self, conf, dependencies):
+        self._conf = conf
+        self._dependencies = dependencies
+
+    def __getitem__(self, group_name):
+        return _GroupDependencyTracker(self._conf[group_name], self._dependencies)
+
+    def __getattr__(self, group_name):
+        return self[group_name]
+
+
+class _GroupDependencyTracker:
+    __slots__ = ("_group", "_dependencies")
+
+    def __init__(self, group, dependencies):
+        self._group = group
+        self._dependencies = dependencies
+
+    def __getitem__(self, property_name):
+        group = self._group
+        value = group[property_name]
+        derived_prop = group._derived.get(property_name)
+        if derived_prop is None:
+            self._dependencies.add((group._name, property_name))
+        else:
+            self._dependencies.update(derived_prop._dependencies)
+        return value
+
+    def __getattr__(self, property_name):
+        return self[property_name]
+
+
 class Conf:
     """Configuration
 
@@ -171,12 +310,28 @@ class Conf:
     __slots__ = (
         "_is_setting_imported",
         "_is_frozen",
+        "_lock",
+        "_transaction_depth",
         "_conf_depot",
         "_conf_groups",
+        "_local_overrides",
+        "_layers",
+        "_provenance",
+        "_subscriptions",
+        "_changes",
+        "_dependents",
+        "_manifest",
+        "_fingerprint",
+        "_versions",
+        "_version",
+        "_max_versions",
+        "_read_counter",
+        "_load_records",
+        "_cprofile_loads",
         "__weakref__",
     )
 
-    def __init__(self):
+    def __init__(self, *, max_versions=100, max_load_records=100):
         """Create a new confect.Conf object
 
         >>> import confect
@@ -192,14 +347,54 @@ class Conf:
         >>> conf.dummy.opt1
         3
 
+        Parameters
+        ----------
+        max_versions : int
+            number of versions of global values kept for ``Conf.rollback()``
+        max_load_records : int
+            number of layer evaluations kept for ``Conf.load_records()``
+
         """
 
+        import threading
+
         from confect.conf_depot import ConfDepot
+        from confect.pmap import PersistentMap
 
         self._is_setting_imported = False
         self._is_frozen = True
+        # held by transactions changing global values or layers, e.g. while
+        # a watcher thread reloads a layer
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
         self._conf_depot = ConfDepot()
+        # (layer, values) of each loaded layer from lowest to highest precedence
+        self._layers = []
+        # {(group, prop): layer} of the layer that set the current value
+        self._provenance = {}
+        # {(group, prop or None): [callback]}
+        self._subscriptions = {}
+        # {(group, prop): value before the first change} of current transaction
+        self._changes = {}
+        # {(group, prop): {DerivedProperty}} for invalidating derived properties
+        self._dependents = {}
+        # {group: module} of groups declared lazily on first access
+        self._manifest = {}
+        # cached result of _schema_fingerprint(), reset on declaration
+        self._fingerprint = None
+        # {version: PersistentMap {(group, prop): assigned value}} from oldest
+        # to current, committed by each global transaction
+        self._versions = {0: PersistentMap()}
+        self._version = 0
+        self._max_versions = max_versions
+        # running confect.instrument.ReadCounter
+        self._read_counter = None
+        # confect.load_profile.LoadRecord of recent layer evaluations
+        self._load_records = deque(maxlen=max_load_records)
+        self._cprofile_loads = False
         self._conf_groups = {}
+        self._local_overrides = _new_local_overrides_var(self)
+        _confs.add(self)
 
     def declare_group(self, name, **default_properties):
         """Add new configuration group and all property names with default values
@@ -225,8 +420,11 @@ class Conf:
         if name in self._conf_groups:
             raise ConfGroupExistsError(f"configuration group {name!r} already exists")
 
-        with self.mutate_globally():
+        self._fingerprint = None
+        with self._transaction():
             group = ConfGroup(self, name)
+            if self._read_counter is not None:
+                object.__setattr__(group, "__class__", _CountingConfGroup)
             self._conf_groups[name] = group
             default_setter_ctx = group._default_setter()
             if default_properties:
@@ -235,17 +433,26 @@ class Conf:
             else:
                 return default_setter_ctx
 
-    def _backup(self):
-        return deepcopy(self._conf_groups)
-
-    def _restore(self, conf_groups):
-        self._conf_groups = conf_groups
-
     @contextmanager
     def mutate_locally(self):
         """Return a context manager that makes this Conf mutable temporarily.
 
         All configuration properties will be restored upon completion of the block.
+        Only the properties assigned inside the block are recorded and
+        restored, so the cost doesn't grow with the size of this Conf.
+        Values mutated in place (e.g. appending to a list property) are not
+        restored.
+
+        Changes are stored in a ``contextvars.ContextVar``. They are only
+        visible to the current thread or asyncio task, and to the tasks it
+        creates inside the block. Assignments made by those tasks and threads
+        are only visible to themselves. Groups declared inside the block are
+        global and stay declared.
+
+        Values loaded by ``load_*`` methods inside the block are assigned
+        like this as well, and restored upon completion of the block. Those
+        layers aren't added to the loaded layers, and their values of
+        undeclared properties are dropped.
 
         >>> conf = Conf()
         >>> with conf.declare_group('yummy') as yummy:
@@ -261,40 +468,326 @@ class Conf:
         fish
 
         """  # noqa
-        conf_groups_backup = self._backup()
-        with self.mutate_globally():
+        # Overrides are copied on write, so the block starts with the
+        # overrides of the enclosing block as they are.
+        overrides = self._local_overrides.get()
+        if overrides is None:
+            overrides = {}
+
+        token = self._local_overrides.set(overrides)
+        try:
             yield
-        self._restore(conf_groups_backup)
+        finally:
+            self._local_overrides.reset(token)
 
     @contextmanager
     def mutate_globally(self):
-        self._is_frozen = False
-        yield
-        self._is_frozen = True
+        """Return a context manager that makes this Conf mutable globally.
+
+        The outermost block is a transaction. Subscribers of properties
+        changed in it are notified once upon completion of the block. Loading
+        and reloading in other threads wait until the block completes.
+        """
+        with self._transaction():
+            is_frozen = self._is_frozen
+            self._is_frozen = False
+            try:
+                yield
+            finally:
+                self._is_frozen = is_frozen
 
     @contextmanager
-    def _confect_c_ctx(self):
-        import confect
+    def _transaction(self):
+        """Return a context manager that changes global values exclusively.
+
+        Global values are set through ``ConfGroup._set_value()`` in the block,
+        without unfreezing this Conf for other threads. Subscribers are
+        notified upon completion of the outermost block.
+        """
+        with self._lock:
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+                if not self._transaction_depth and self._changes:
+                    self._notify_changes()
+
+    def subscribe(self, group_name, prop_name, callback):
+        """Call ``callback(value)`` once the property changes globally.
+
+        Changes made by ``load_*`` methods, reloads and ``mutate_globally()``
+        blocks are coalesced, so the callback is called at most once per
+        loading or block. Changes made in ``mutate_locally()`` blocks are not
+        notified.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> unsubscribe = conf.subscribe('db', 'host', print)
+        >>> conf.load_layers([{'db': {'host': '127.0.0.1'}}])
+        127.0.0.1
+        >>> unsubscribe()
+
+        Returns
+        -------
+        Callable[[], None]
+            function that cancels the subscription
+        """
+        return self._subscribe((group_name, prop_name), callback)
+
+    def subscribe_group(self, group_name, callback):
+        """Call ``callback(changes)`` once properties of the group change globally.
+
+        ``changes`` is a ``{prop: value}`` dict of all changed properties of
+        the group. See ``Conf.subscribe()``.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> unsubscribe = conf.subscribe_group('db', print)
+        >>> conf.load_layers([{'db': {'host': '127.0.0.1', 'port': 3362}}])
+        {'host': '127.0.0.1', 'port': 3362}
+        """  # noqa
+        return self._subscribe((group_name, None), callback)
+
+    def _subscribe(self, key, callback):
+        self._subscriptions.setdefault(key, []).append(callback)
+
+        def unsubscribe():
+            callbacks = self._subscriptions.get(key, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._subscriptions.pop(key, None)
+
+        return unsubscribe
+
+    def _record_change(self, group_name, prop_name, conf_prop):
+        key = (group_name, prop_name)
+        for derived_prop in self._dependents.get(key, ()):
+            derived_prop._invalidate()
+        if key not in self._changes:
+            self._changes[key] = conf_prop._value
+
+    def _set_dependencies(self, derived_prop, dependencies):
+        for key in derived_prop._dependencies - dependencies:
+            self._dependents[key].discard(derived_prop)
+        for key in dependencies - derived_prop._dependencies:
+            self._dependents.setdefault(key, set()).add(derived_prop)
+        derived_prop._dependencies = dependencies
+
+    def versions(self):
+        """Versions of global values kept for rollback, from oldest to current
+
+        Each ``load_*`` call, reload and ``mutate_globally()`` block that
+        changes values creates a new version. Versions share unchanged values,
+        so keeping them costs memory in proportion to the changes. Only the
+        latest ``max_versions`` versions are kept.
+
+        Returns
+        -------
+        List[int]
+            version numbers
+        """
+        return list(self._versions)
+
+    def rollback(self, version):
+        """Restore global values of an earlier version
 
-        confect.c = self._conf_depot
-        yield
-        del confect.c
+        Only properties that differ from the version are assigned, and
+        subscribers are notified like after loading. The rollback creates a
+        new version, so it can be rolled back too.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> version = conf.versions()[-1]
+        >>> conf.load_layers([{'db': {'host': '127.0.0.1'}}])
+        >>> conf.db.host
+        '127.0.0.1'
+        >>> conf.rollback(version)
+        >>> conf.db.host
+        '10.3.14.15'
+
+        Parameters
+        ----------
+        version : int
+            version number returned by ``Conf.versions()``
+        """
+        try:
+            store = self._versions[version]
+        except KeyError:
+            raise ParameterError(f"Unknown or discarded version {version!r}") from None
+
+        with self._transaction():
+            keys = self._current_store().diff(store)
+            # changes of the enclosing transaction aren't committed yet
+            keys.update(self._changes)
+            for group_name, prop_name in keys:
+                group = self._conf_groups.get(group_name)
+                if group is not None and prop_name in group._properties:
+                    value = store.get((group_name, prop_name), Undefined)
+                    self._provenance.pop((group_name, prop_name), None)
+                    group._set_value(prop_name, value)
+            if keys:
+                # the map of the version shares all its nodes
+                self._add_version(store)
+
+    def _current_store(self):
+        return self._versions[self._version]
+
+    def _add_version(self, store):
+        versions = self._versions
+        self._version += 1
+        versions[self._version] = store
+        while len(versions) > self._max_versions:
+            del versions[next(iter(versions))]
+
+    def _commit_version(self, changes):
+        current_store = self._current_store()
+        items = []
+        for key in changes:
+            group_name, prop_name = key
+            value = self._conf_groups[group_name]._properties[prop_name]._value
+            if current_store.get(key, Undefined) is not value:
+                items.append((key, value))
+        if items:
+            self._add_version(current_store.update(items))
+
+    def _notify_changes(self):
+        changes, self._changes = self._changes, {}
+        self._commit_version(changes)
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return
+
+        changed_props = {}
+        for (group_name, prop_name), old_value in changes.items():
+            conf_prop = self._conf_groups[group_name]._properties[prop_name]
+            new_value = conf_prop._value
+            if old_value is Undefined:
+                old_value = conf_prop.default
+            if new_value is Undefined:
+                new_value = conf_prop.default
+            if _is_changed(old_value, new_value):
+                changed_props.setdefault(group_name, []).append(prop_name)
+
+        for group_name, prop_names in changed_props.items():
+            group_subscribed = (group_name, None) in subscriptions
+            props = {}
+            for prop_name in prop_names:
+                callbacks = subscriptions.get((group_name, prop_name), ())
+                if not callbacks and not group_subscribed:
+                    continue
+                try:
+                    value = self._conf_groups[group_name]._properties[prop_name].value
+                except ParseError:
+                    _logger().exception("Unable to notify subscribers")
+                    continue
+                props[prop_name] = value
+                for callback in callbacks:
+                    _call_subscriber(callback, value)
+
+            if props:
+                for callback in subscriptions.get((group_name, None), ()):
+                    _call_subscriber(callback, dict(props))
 
     def __contains__(self, group_name):
         return group_name in self._conf_groups
 
     def __getitem__(self, group_name):
-        if group_name not in self._conf_groups:
-            raise UnknownConfError(f"Unknown configuration group {group_name!r}")
+        try:
+            return self._conf_groups[group_name]
+        except KeyError:
+            pass
+
+        module_name = self._manifest.get(group_name)
+        if module_name is not None:
+            import importlib
+
+            importlib.import_module(module_name)
+            if group_name in self._conf_groups:
+                return self._conf_groups[group_name]
+
+        raise UnknownConfError(f"Unknown configuration group {group_name!r}")
+
+    def use_manifest(self, manifest):
+        """Declare configuration groups lazily with a declaration manifest.
+
+        A manifest maps group names to the modules that declare them. On the
+        first access of an undeclared group, its module is imported. Generate
+        the manifest by scanning the package with ``confect.manifest.scan()``
+        or ``python -m confect manifest <package> -o <path>``.
 
-        conf_group = self._conf_groups[group_name]
+        >>> conf = Conf()
+        >>> conf.use_manifest({'db': 'projx.db'})
+        >>> conf.use_manifest('confect_manifest.json')  # doctest: +SKIP
+
+        Parameters
+        ----------
+        manifest : Dict[str, str] or str or pathlib.Path
+            ``{group: module}`` dict, or path of a manifest file
+        """
+        if not isinstance(manifest, dict):
+            from confect.manifest import read
+
+            manifest = read(manifest)
+        self._manifest.update(manifest)
 
-        if group_name in self._conf_depot:
-            conf_depot_group = self._conf_depot[group_name]
-            conf_group._update_from_conf_depot_group(conf_depot_group)
-            del self._conf_depot[group_name]
+    def declare_manifest_groups(self):
+        """Import all modules in the manifest to declare their groups.
 
-        return conf_group
+        ``load_envvars()``, ``click_options()``, ``freeze()`` and snapshots
+        only see declared groups. Call this beforehand if they should cover
+        lazily declared groups.
+        """
+        import importlib
+
+        for module_name in dict.fromkeys(self._manifest.values()):
+            importlib.import_module(module_name)
+
+    def _merge_conf_depot(self, group_names=None):
+        """Move loaded values of declared properties from ConfDepot into groups
+
+        Values of undeclared groups and properties stay in ConfDepot until
+        they're declared. ``Conf.undeclared_props()`` lists them.
+        """
+        conf_depot = self._conf_depot
+        if group_names is None:
+            group_names = [name for name, _ in conf_depot._items()]
+
+        for group_name in group_names:
+            if group_name not in conf_depot or group_name not in self._conf_groups:
+                continue
+
+            conf_depot_group = conf_depot[group_name]
+            self._conf_groups[group_name]._update_from_conf_depot_group(
+                conf_depot_group
+            )
+            if not conf_depot_group:
+                del conf_depot[group_name]
+
+    def undeclared_props(self):
+        """Loaded properties that are not declared yet
+
+        Configuration files and environment variables may set properties
+        that were never declared, e.g. because of a typo. Those values are
+        kept until the group and property are declared.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15')
+        >>> conf.load_file('path/to/conf.py')  # doctest: +SKIP
+        >>> conf.undeclared_props()  # doctest: +SKIP
+        {'db': ['hots'], 'cache': ['expire']}
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            property names of each group
+        """
+        return {
+            group_name: [prop_name for prop_name, _ in conf_depot_group._items()]
+            for group_name, conf_depot_group in self._conf_depot._items()
+            if conf_depot_group
+        }
 
     def __getattr__(self, group_name):
         return self[group_name]
@@ -316,19 +809,41 @@ class Conf:
         return object.__dir__(self) + list(self._conf_groups.keys())
 
     def __deepcopy__(self, memo):
+        import threading
+        from copy import deepcopy
+
         cls = type(self)
         new_self = cls.__new__(cls)
         new_self._is_setting_imported = self._is_setting_imported
         new_self._is_frozen = self._is_frozen
+        new_self._lock = threading.RLock()
+        new_self._transaction_depth = 0
         new_self._conf_depot = deepcopy(self._conf_depot)
+        new_self._layers = list(self._layers)
+        new_self._provenance = dict(self._provenance)
+        new_self._subscriptions = {}
+        new_self._changes = {}
+        new_self._dependents = {}
+        new_self._manifest = dict(self._manifest)
+        new_self._fingerprint = self._fingerprint
+        new_self._versions = dict(self._versions)
+        new_self._version = self._version
+        new_self._max_versions = self._max_versions
+        new_self._read_counter = None
+        new_self._load_records = deque(self._load_records, self._load_records.maxlen)
+        new_self._cprofile_loads = False
         new_self._conf_groups = deepcopy(self._conf_groups)
+        new_self._local_overrides = _new_local_overrides_var(new_self)
+        _confs.add(new_self)
 
         for group in new_self._conf_groups.values():
             group._conf = weakref.proxy(new_self)
+            group._local_overrides = new_self._local_overrides
+            object.__setattr__(group, "__class__", ConfGroup)
 
         return new_self
 
-    def load_file(self, path):
+    def load_file(self, path, *, cache=True, cache_dir=None):
         """Load python configuration file through file path.
 
         All configuration groups and properties should be added through ``Conf.declare_group()`` in your source code.
@@ -344,21 +859,28 @@ class Conf:
             from confect import c
             c.yammy.kind = 'seafood'
             c.yammy.name = 'fish'
-        """  # noqa
-        from pathlib import Path
 
-        if not isinstance(path, Path):
-            path = Path(path)
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            path of the configuration file
+        cache : bool
+            cache the compiled configuration file like ``__pycache__`` does,
+            and skip compiling it if the file is unchanged
+        cache_dir : str or pathlib.Path
+            directory of the cache files. Defaults to ``__pycache__`` next
+            to the configuration file, or ``sys.pycache_prefix`` if it's set.
+        """  # noqa
+        from confect.layer import File
 
-        with self.mutate_globally():
-            with self._confect_c_ctx():
-                exec(path.open("r").read())
+        self.load_layers([File(path, cache=cache, cache_dir=cache_dir)])
 
     def load_module(self, module_name):
         """Load python configuration file through import.
 
         The module should be importable either through PYTHONPATH
-        or was install as a package.
+        or was install as a package. It's imported on the first loading, and
+        reloaded with ``importlib.reload()`` on later loading or reloading.
 
         All configuration groups and properties should be added through ``Conf.declare_group()`` in your source code.
         Otherwise, it won't be accessable even if it is in configuration file.
@@ -376,11 +898,11 @@ class Conf:
             c.yammy.name = 'fish'
 
         """  # noqa
-        with self.mutate_globally():
-            with self._confect_c_ctx():
-                importlib.import_module(module_name)
+        from confect.layer import Module
 
-    def load_envvars(self, prefix):
+        self.load_layers([Module(module_name)])
+
+    def load_envvars(self, *prefixes, lazy=False):
         """Load python configuration from environment variables
 
         This function automatically searches environment variable in
@@ -391,31 +913,638 @@ class Conf:
         property to the parsed value of ``proj_X__cache__expire_time``
         environment variable.
 
+        Only the environment variables of declared properties are looked up.
+        With multiple prefixes, the latter one takes precedence.
+
         >> conf = confect.Conf()
         >> conf.load_envvars('proj_X')  # doctest: +SKIP
+        >> conf.load_envvars('proj_X', 'proj_X_local')  # doctest: +SKIP
+
+        Parameters
+        ----------
+        prefixes : str
+            prefixes of environment variables
+        lazy : bool
+            parse values on the first access of each property. Otherwise,
+            all values are parsed while loading, and one ``ParseError`` is
+            raised for all failures.
+
+        """
+        from confect.layer import EnvVars
+
+        self.load_layers([EnvVars(*prefixes, lazy=lazy)])
+
+    def load_layers(self, layers, *, max_workers=None):
+        """Load multiple configuration sources at once.
+
+        Each source is evaluated separately, then all values are merged
+        into the declared groups in one pass. Later layers take precedence
+        over former ones.
+
+        Loading a layer with the same ``Layer.key`` as a loaded one, e.g.
+        loading the same file again, replaces the loaded layer, so repeated
+        loading doesn't grow the stack of layers. The new layer takes
+        precedence like any newly loaded layer, and properties only set by
+        the replaced layer fall back to the other layers.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> from confect import layer
+        >>> conf.load_layers([
+        ...     {'db': {'host': '127.0.0.1', 'port': 3362}},
+        ...     layer.Mapping({'db': {'port': 3363}}, name='personal'),
+        ... ])
+        >>> conf.db.host, conf.db.port
+        ('127.0.0.1', 3363)
+
+        A typical stack of layers looks like
+
+        .. code: python
+
+            conf.load_layers([
+                layer.File('path/to/project_conf.py'),
+                layer.File('path/to/team_conf.py'),
+                layer.Module('personal_conf'),
+                layer.EnvVars('projx'),
+            ], max_workers=4)
+
+        Parameters
+        ----------
+        layers : Iterable[confect.layer.Layer or pathlib.Path or dict]
+            configuration sources ordered from lowest to highest precedence.
+            ``pathlib.Path`` is loaded as configuration file and ``dict`` as
+            a ``{group: {prop: value}}`` mapping.
+        max_workers : int
+            evaluate configuration files and modules in a process pool
+            with this many workers. All values set in these files should be
+            picklable. Defaults to evaluating all layers in this process.
+        """
+        from confect.layer import of_source
+        from confect.load_profile import evaluate_in_worker
+
+        layers = [of_source(source) for source in layers]
+
+        if max_workers is None:
+            results = [self._evaluate_layer(layer) for layer in layers]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers) as executor:
+                futures = [
+                    executor.submit(evaluate_in_worker, layer, self._cprofile_loads)
+                    for layer in layers
+                    if layer.parallel
+                ]
+                futures.reverse()
+                results = [
+                    futures.pop().result()
+                    if layer.parallel
+                    else self._evaluate_layer(layer, record=False)
+                    for layer in layers
+                ]
+            # in the order of layers, like loading them in this process
+            for _, load_record in results:
+                self._record_load(load_record)
+
+        layer_values = [values for values, _ in results]
+        if self._local_overrides.get() is not None:
+            self._assign_locally(layer_values)
+            return
+
+        provenance = self._provenance
+        with self._transaction():
+            replaced_keys = self._remove_layers({layer.key for layer in layers})
+            self._layers.extend(zip(layers, layer_values))
+            for layer, values in zip(layers, layer_values):
+                for group_name, props in values.items():
+                    conf_depot_group = self._conf_depot[group_name]
+                    for prop_name, value in props.items():
+                        conf_depot_group[prop_name] = value
+                        provenance[group_name, prop_name] = layer
+                        replaced_keys.pop((group_name, prop_name), None)
+            self._merge_conf_depot()
+            # properties only set by replaced layers fall back to other layers
+            if replaced_keys:
+                self._resolve_layers(replaced_keys)
+
+    def _assign_locally(self, layer_values):
+        """Assign loaded values of declared properties in a mutate_locally() block"""
+        for values in layer_values:
+            for group_name, props in values.items():
+                group = self._conf_groups.get(group_name)
+                if group is None:
+                    continue
+                for prop_name, value in props.items():
+                    if prop_name in group._properties:
+                        if type(value) is Unparsed:
+                            value = value.parse()
+                        group[prop_name] = value
+
+    def _remove_layers(self, keys):
+        """Remove loaded layers with any of ``keys``
+
+        Return the ``(group, prop)`` keys set by the removed layers.
+        """
+        kept = []
+        removed_values = []
+        for layer, values in self._layers:
+            if layer.key in keys:
+                removed_values.append(values)
+            else:
+                kept.append((layer, values))
+        self._layers = kept
+        return _layer_keys(*removed_values)
+
+    def dump_snapshot(self, path):
+        """Write resolved values into a snapshot file.
+
+        The snapshot records the declared schema and the content hashes of
+        loaded configuration files. ``Conf.load_snapshot()`` loads it
+        without evaluating those files again. Values should be picklable.
+
+        >>> conf = Conf()
+        >>> conf.load_file('path/to/conf.py')  # doctest: +SKIP
+        >>> conf.dump_snapshot('conf.snapshot')  # doctest: +SKIP
+        """
+        from confect.snapshot import dump
+
+        dump(self, path)
+
+    def load_snapshot(self, path, *, check_sources=True):
+        """Load values from a snapshot file written by ``Conf.dump_snapshot()``.
+
+        The snapshot is rejected if it's missing, if the declared schema
+        differs, or if any of its source files changed. Snapshots are
+        pickled, only load snapshots you created yourself.
+
+        >>> conf = Conf()
+        >>> if not conf.load_snapshot('conf.snapshot'):  # doctest: +SKIP
+        ...     conf.load_file('path/to/conf.py')
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            path of the snapshot file
+        check_sources : bool
+            compare content hashes of source files. Set it to ``False`` if
+            the source files are not shipped along with the snapshot.
+
+        Returns
+        -------
+        bool
+            whether the snapshot is loaded
+        """
+        from confect.snapshot import load
+
+        return load(self, path, check_sources=check_sources)
+
+    def _schema_fingerprint(self):
+        """Hash of declared groups, properties and their property types"""
+        if self._fingerprint is not None:
+            return self._fingerprint
+
+        import hashlib
+
+        digest = hashlib.sha1()
+        for group_name in sorted(self._conf_groups):
+            group = self._conf_groups[group_name]
+            for prop_name in sorted(group._properties):
+                prop_type_cls = type(group._properties[prop_name].prop_type)
+                digest.update(
+                    f"{group_name}.{prop_name}:{prop_type_cls.__module__}."
+                    f"{prop_type_cls.__qualname__}\n".encode()
+                )
+            for prop_name in sorted(group._derived):
+                digest.update(f"{group_name}.{prop_name}:derived\n".encode())
+        self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def __reduce__(self):
+        """Pickle resolved property values and the schema fingerprint only
+
+        Declarations aren't pickled. Unpickling creates a new Conf object
+        from the declarations of a Conf object with the same fingerprint in
+        the unpickling process, so the modules declaring configuration groups
+        should be imported there before, e.g. in process pool workers.
+
+        Values assigned in ``mutate_locally()`` blocks are not included, since
+        process pools pickle arguments in another thread. Neither are layers
+        and undeclared properties.
+
+        >>> import pickle
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3306)
+        >>> with conf.mutate_globally():
+        ...     conf.db.port = 5432
+        >>> conf_copy = pickle.loads(pickle.dumps(conf))
+        >>> conf_copy.db.port
+        5432
+        """
+        return _unpickle_conf, (
+            self._schema_fingerprint(),
+            self._values(),
+            self._is_frozen,
+        )
+
+    def _copy_declarations(self):
+        """Create a Conf object with the same declarations and no values"""
+        new_self = type(self)(
+            max_versions=self._max_versions,
+            max_load_records=self._load_records.maxlen,
+        )
+        new_self._manifest = dict(self._manifest)
+        new_self._fingerprint = self._fingerprint
+        for group_name, group in self._conf_groups.items():
+            new_group = ConfGroup(new_self, group_name)
+            new_group._properties = {
+                prop_name: conf_prop._copy_declaration()
+                for prop_name, conf_prop in group._properties.items()
+            }
+            new_group._derived = {
+                name: DerivedProperty(derived_prop.func, desc=derived_prop.desc)
+                for name, derived_prop in group._derived.items()
+            }
+            new_self._conf_groups[group_name] = new_group
+        return new_self
+
+    def loaded_layers(self):
+        """Layers loaded by ``load_*`` methods, from lowest to highest precedence"""
+        return [layer for layer, _ in self._layers]
+
+    def reload_layer(self, layer):
+        """Evaluate a loaded layer again and apply the properties that changed.
+
+        Only the properties whose value in the layer changed are resolved
+        again, so values assigned after loading, e.g. by ``Conf.rollback()``,
+        are kept for the others. A changed property still keeps the value
+        from layers of higher precedence. A property removed from the layer
+        falls back to the value from layers of lower precedence or its
+        default value. If evaluating the layer fails, nothing is changed.
+
+        The layer is evaluated before taking the lock of this Conf, then all
+        new values are resolved and set in one transaction. It's safe to
+        reload from another thread, e.g. by ``Conf.watch()``.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> from confect import layer
+        >>> values = {'db': {'host': '127.0.0.1', 'port': 3362}}
+        >>> mapping = layer.Mapping(values)
+        >>> conf.load_layers([mapping])
+        >>> values['db'] = {'port': 3363}
+        >>> conf.reload_layer(mapping)
+        {'db': {'host': '10.3.14.15', 'port': 3363}}
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            new values of the changed properties
+        """
+        self._find_layer(layer)
+        new_values, _ = self._evaluate_layer(layer)
+        with self._transaction():
+            index, old_values = self._find_layer(layer)
+            self._layers[index] = (layer, new_values)
+            return self._resolve_layers(_changed_layer_keys(old_values, new_values))
+
+    def replace_layer(self, layer, new_layer):
+        """Replace a loaded layer with a new one at the same precedence.
+
+        Only the properties set by either of the layers are resolved again.
+        If evaluating the new layer fails, nothing is changed.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> from confect import layer
+        >>> staging = layer.Mapping({'db': {'host': 'staging'}})
+        >>> conf.load_layers([staging, {'db': {'port': 3362}}])
+        >>> conf.replace_layer(staging, layer.Mapping({'db': {'host': 'prod'}}))
+        {'db': {'host': 'prod'}}
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            new values of the changed properties
+        """
+        from confect.layer import of_source
+
+        new_layer = of_source(new_layer)
+        self._find_layer(layer)
+        new_values, _ = self._evaluate_layer(new_layer)
+        with self._transaction():
+            index, old_values = self._find_layer(layer)
+            self._layers[index] = (new_layer, new_values)
+            return self._resolve_layers(_layer_keys(old_values, new_values))
+
+    def remove_layer(self, layer):
+        """Unload a layer.
+
+        Properties set by the layer fall back to the values of the other
+        layers or to their default values. Only these properties are
+        resolved again.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> from confect import layer
+        >>> personal = layer.Mapping({'db': {'host': '127.0.0.1'}})
+        >>> conf.load_layers([{'db': {'host': '10.0.0.1'}}, personal])
+        >>> conf.remove_layer(personal)
+        {'db': {'host': '10.0.0.1'}}
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            new values of the changed properties
+        """
+        with self._transaction():
+            index, old_values = self._find_layer(layer)
+            del self._layers[index]
+            return self._resolve_layers(_layer_keys(old_values))
+
+    def provenance(self, path):
+        """Return the layer that set the current value of a property.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> conf.load_layers([{'db': {'host': '127.0.0.1'}}])
+        >>> conf.provenance('db.host')  # doctest: +ELLIPSIS
+        <confect.layer.Mapping mapping:...>
+        >>> conf.provenance('db.port') is None
+        True
+
+        Parameters
+        ----------
+        path : str
+            property path in ``'<group>.<prop>'`` format
+
+        Returns
+        -------
+        Optional[confect.layer.Layer]
+            the layer, or ``None`` if the property has its default value or
+            it was set without a layer, e.g. in a ``mutate_globally()``
+            block, by ``Conf.rollback()`` or by unpickling
+        """
+        group_name, prop_name = _split_path(path)
+        ConfGroup.__getitem__(self[group_name], prop_name)
+        return self._provenance.get((group_name, prop_name))
+
+    def _find_layer(self, layer):
+        for index, (loaded_layer, values) in enumerate(self._layers):
+            if loaded_layer is layer:
+                return index, values
+        raise ParameterError(f"Layer is not loaded: {layer!r}")
+
+    def _evaluate_layer(self, layer, *, record=True):
+        from confect.load_profile import evaluate
+
+        values, load_record = evaluate(layer, self, cprofile=self._cprofile_loads)
+        if record:
+            self._record_load(load_record)
+        return values, load_record
+
+    def _record_load(self, load_record):
+        from confect.load_profile import log
+
+        self._load_records.append(load_record)
+        log(load_record)
+
+    def load_records(self):
+        """Timing of recent evaluations of configuration layers
+
+        Each ``load_*`` call and reload records how long evaluating each
+        layer took and how many properties it set. The records are also
+        logged to the ``confect.load_profile`` logger at INFO level.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> conf.load_layers([{'db': {'host': '127.0.0.1'}}])
+        >>> [(record.layer.split(':')[0], record.props)
+        ...  for record in conf.load_records()]
+        [('mapping', 1)]
+
+        Returns
+        -------
+        List[confect.load_profile.LoadRecord]
+            records from oldest to latest
+        """
+        return list(self._load_records)
+
+    @contextmanager
+    def profile_loading(self):
+        """Return a context manager that profiles layers evaluated in the block
+
+        Each evaluation is run under ``cProfile``, and the statistics are
+        available as ``LoadRecord.stats`` of ``Conf.load_records()``.
+        Functions defined in configuration files are listed with their file
+        and line number.
+        """
+        cprofile_loads = self._cprofile_loads
+        self._cprofile_loads = True
+        try:
+            yield
+        finally:
+            self._cprofile_loads = cprofile_loads
+
+    def _resolve_layers(self, keys):
+        """Set properties of ``keys`` to the value of the top-most layer
+
+        Only the properties whose value changed are set, after all the new
+        values are resolved.
+        """
+        with self._transaction():
+            resolved = {}
+            provenance = self._provenance
+            for key in keys:
+                group_name, prop_name = key
+                value = Undefined
+                provenance.pop(key, None)
+                for layer, values in reversed(self._layers):
+                    props = values.get(group_name)
+                    if props is not None and prop_name in props:
+                        value = props[prop_name]
+                        provenance[key] = layer
+                        break
+
+                group = self._conf_groups.get(group_name)
+                if group is not None and prop_name in group._properties:
+                    current = group._properties[prop_name]._value
+                elif (
+                    group_name in self._conf_depot
+                    and prop_name in self._conf_depot[group_name]
+                ):
+                    current = self._conf_depot[group_name][prop_name]
+                else:
+                    current = Undefined
+
+                if _is_changed(current, value):
+                    resolved.setdefault(group_name, {})[prop_name] = value
+
+            changes = {}
+            for group_name, props in resolved.items():
+                group = self._conf_groups.get(group_name)
+                for prop_name, value in props.items():
+                    if group is not None and prop_name in group._properties:
+                        group._set_value(prop_name, value)
+                        value = group._properties[prop_name].value
+                    elif value is Undefined:
+                        conf_depot_group = self._conf_depot[group_name]
+                        del conf_depot_group[prop_name]
+                        if not conf_depot_group:
+                            del self._conf_depot[group_name]
+                        continue
+                    else:
+                        self._conf_depot[group_name][prop_name] = value
+                        continue
+
+                    changes.setdefault(group_name, {})[prop_name] = value
+
+            return changes
+
+    def watch(self, *, interval=1.0, callback=None, use_inotify=None):
+        """Return a watcher that reloads changed configuration files.
+
+        Files and modules loaded through ``load_file()``, ``load_module()``
+        and ``load_layers()`` are watched. Run the watcher in a thread with
+        ``watcher.start()``, or in an asyncio task with ``watcher.run()``.
+
+        .. code: python
+
+            watcher = conf.watch(interval=5).start()
+            ...
+            watcher.stop()
 
         Parameters
         ----------
-        prefix : str
-            prefix of environment variables
+        interval : float
+            seconds between checks. Files are checked immediately on change
+            if inotify is available.
+        callback : Callable[[Dict[str, Dict[str, Any]]], None]
+            called with the changed properties after each reload
+        use_inotify : bool
+            ``True`` to require inotify, ``False`` for polling only. By
+            default, inotify is used when available.
+
+        Returns
+        -------
+        confect.watch.Watcher
+        """
+        from confect.watch import Watcher
+
+        return Watcher(
+            self, interval=interval, callback=callback, use_inotify=use_inotify
+        )
 
+    def publish(self, path):
+        """Publish resolved values into a shared file for ``Conf.follow()``.
+
+        Call it in the master process of pre-fork workers after loading
+        configuration files, and again whenever values change. See
+        ``confect.shared`` for details.
+
+        Returns
+        -------
+        int
+            generation of the published values
+        """
+        from confect.shared import publish
+
+        return publish(self, path)
+
+    def follow(self, path):
+        """Load values published into a shared file by ``Conf.publish()``.
+
+        Worker processes call ``check()`` of the returned
+        ``confect.shared.Follower`` to load newly published values. Checking
+        reads a counter in shared memory, and values are loaded only when it
+        changed.
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'conf.shm')
+        >>> master = Conf()
+        >>> master.declare_group('db', host='10.3.14.15', port=3361)
+        >>> master.publish(path)
+        1
+        >>> worker = Conf()
+        >>> worker.declare_group('db', host='10.3.14.15', port=3361)
+        >>> follower = worker.follow(path)
+        >>> with master.mutate_globally():
+        ...     master.db.port = 3362
+        >>> master.publish(path)
+        2
+        >>> follower.check()
+        {'db': {'port': 3362}}
+        >>> worker.db.port
+        3362
         """
-        prefix = prefix + "__"
-        with self.mutate_globally():
-            for name, value in os.environ.items():
-                if name.startswith(prefix):
-                    _, group, prop = name.split("__")
-                    value = self.parse_prop(group, prop, value)
-                    self._conf_depot[group][prop] = value
+        from confect.shared import Follower
+
+        return Follower(self, path)
 
     def parse_prop(self, group, prop, string):
         return self[group].parse_prop(prop, string)
 
+    def parse_props(self, strings):
+        """Parse strings of many properties at once
+
+        Strings of properties with the same ``prop_type`` are parsed in one
+        ``PropertyType.parse_many()`` call. Failures don't stop parsing other
+        properties.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3306)
+        >>> values, errors = conf.parse_props({'db.port': '5432', 'db.host': 'x'})
+        >>> values
+        {'db': {'port': 5432, 'host': 'x'}}
+        >>> values, errors = conf.parse_props({'db.port': 'abc', 'db.user': 'x'})
+        >>> sorted(errors)
+        ['db.port', 'db.user']
+
+        Parameters
+        ----------
+        strings : Mapping[str, str]
+            string of each property in ``'<group>.<prop>'`` format
+
+        Returns
+        -------
+        Tuple[Dict[str, Dict[str, Any]], Dict[str, Exception]]
+            values of each group and property, which ``layer.Mapping`` loads,
+            and the exception of each property path that failed
+        """
+        items = []
+        errors = {}
+        for path, string in strings.items():
+            try:
+                group_name, prop_name = _split_path(path)
+                group = self[group_name]
+            except (ParameterError, UnknownConfError) as exc:
+                errors[path] = exc
+                continue
+
+            if prop_name not in group._properties:
+                errors[path] = UnknownConfError(
+                    f"Unknown {prop_name!r} property in "
+                    f"configuration group {group_name!r}"
+                )
+                continue
+
+            prop_type = group._properties[prop_name].prop_type
+            items.append(((group_name, prop_name), prop_type, string))
+
+        parsed, parse_errors = _parse_items(items)
+        values = {}
+        for (group_name, prop_name), value in parsed.items():
+            values.setdefault(group_name, {})[prop_name] = value
+        for (group_name, prop_name), exc in parse_errors.items():
+            errors[f"{group_name}.{prop_name}"] = exc
+        return values, errors
+
     def get_prop(self, group, prop):
         return self[group].get_prop(prop)
 
     @fnt.wraps(ConfProperty.__init__)
     def prop(self, *args, **kwargs):
+        import warnings
+
         warnings.warn(
             "`Conf.prop()` is deprecated. Use confect.prop instead.", DeprecationWarning
         )
@@ -426,14 +1555,44 @@ class Conf:
             for prop_name, prop in group._properties.items():
                 yield group_name, prop_name, prop
 
-    def click_options(self, cmd_func):
+    def _values(self):
+        """Values of properties assigned globally, by group and property"""
+        values = {}
+        for group_name, prop_name, conf_prop in self._iter_props():
+            if conf_prop._value is not Undefined:
+                values.setdefault(group_name, {})[prop_name] = conf_prop.value
+        return values
+
+    def click_options(self, cmd_func=None, *, groups=None):
         """Attaches all configurations to the command in
-        the `--<group>-<prop>` form."""
+        the `--<group>-<prop>` form.
+
+        Use it as ``@conf.click_options`` or ``@conf.click_options(groups=...)``.
+        An option is created for every property, see ``click_command()`` for
+        commands of many properties.
+
+        Parameters
+        ----------
+        cmd_func : Callable
+            command function
+        groups : Optional[Iterable[str]]
+            names of the groups with options, all groups by default
+        """
+        if cmd_func is None:
+            return fnt.partial(self.click_options, groups=groups)
+
         import click
 
-        props = reversed(list(self._iter_props()))
+        if groups is None:
+            props = list(self._iter_props())
+        else:
+            props = [
+                (group_name, prop_name, prop)
+                for group_name in groups
+                for prop_name, prop in self[group_name]._properties.items()
+            ]
 
-        for group_name, prop_name, prop in props:
+        for group_name, prop_name, prop in reversed(props):
             if prop.prop_type is None:
                 continue
 
@@ -449,6 +1608,166 @@ class Conf:
 
         return cmd_func
 
+    def click_command(
+        self, name=None, *, groups=None, set_option=True, cls=None, **attrs
+    ):
+        """Decorator like ``click.command()`` with options of the properties
+
+        Options in the `--<group>-<prop>` form are created only for the
+        arguments given to each invocation, and for the help message, so large
+        configurations don't slow down building and running the command. The
+        ``--set <group>.<prop>=<value>`` option sets any property from a
+        string. Values given are loaded as a layer named ``cli`` before the
+        command runs.
+
+        Parameters
+        ----------
+        name : Optional[str]
+            name of the command
+        groups : Optional[Iterable[str]]
+            names of the groups with options, all groups by default
+        set_option : bool
+            whether to add the ``--set`` option
+        cls : Optional[Type[click.Command]]
+            command class, ``click.Command`` by default
+        **attrs
+            other arguments of ``click.command()``
+        """
+        import click
+
+        from confect.cli import command_class
+
+        cls = command_class(self, cls, groups=groups, set_option=set_option)
+        return click.command(name, cls=cls, **attrs)
+
+    def freeze(self):
+        """Resolve all configuration groups into a read-only snapshot.
+
+        The snapshot doesn't follow later changes of this Conf. It is meant
+        for hot code paths where reading ``conf.group.prop`` has to be as
+        cheap as a plain attribute read.
+
+        Groups and properties become attributes of the snapshot, so their
+        names should be identifiers that don't start with ``__`` or shadow
+        attributes like ``getter`` and ``as_dict``. Otherwise
+        ``ParameterError`` is raised.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3361)
+        >>> frozen = conf.freeze()
+        >>> frozen.db.host
+        '10.3.14.15'
+        >>> frozen.db.host = '127.0.0.1'
+        Traceback (most recent call last):
+            ...
+        confect.error.FrozenConfPropError: Frozen configuration snapshot is read-only.
+        """  # noqa
+        groups = {name: self[name].as_dict() for name in self._conf_groups}
+        return _make_frozen_conf(groups)
+
+    def sweep(self, axes, *, samples=None, seed=None):
+        """Create variants of this Conf over axes of property values.
+
+        Variants are all combinations of axis values, or ``samples`` random
+        combinations. Iterating the returned ``confect.sweep.Sweep`` yields
+        a read-only view of each variant, which shares unchanged groups with
+        other views. ``Sweep.map()`` runs a function over the views in a
+        process pool.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('train', lr=0.1, epochs=10, optimizer='sgd')
+        >>> sweep = conf.sweep({'train.lr': [0.1, 0.01], 'train.epochs': [5, 20]})
+        >>> [(view.train.lr, view.train.epochs) for view in sweep]
+        [(0.1, 5), (0.1, 20), (0.01, 5), (0.01, 20)]
+
+        Parameters
+        ----------
+        axes : Mapping[str, Sequence[Any]]
+            values of each property path in ``'<group>.<prop>'`` format. With
+            ``samples``, it can also be a function that draws a value with a
+            ``random.Random`` instance.
+        samples : Optional[int]
+            number of random variants
+        seed : Optional[int]
+            seed of random variants
+
+        Returns
+        -------
+        confect.sweep.Sweep
+        """
+        from confect.sweep import Sweep, grid, sample
+
+        if samples is None:
+            variants = grid(axes)
+        else:
+            variants = sample(axes, samples, seed=seed)
+        return Sweep(self, variants)
+
+    def instrument(self, *, call_sites=False):
+        """Count reads of each property until ``ReadCounter.stop()``
+
+        Groups are switched to a class that counts reads, so reads cost
+        nothing extra when no counter is running.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15', port=3306)
+        >>> with conf.instrument() as counter:
+        ...     conf.db.host
+        '10.3.14.15'
+        >>> counter.hot()
+        [('db.host', 1)]
+        >>> counter.unread()
+        ['db.port']
+
+        Parameters
+        ----------
+        call_sites : bool
+            also record the ``'<file>:<line>'`` of the first read of each
+            property
+
+        Returns
+        -------
+        confect.instrument.ReadCounter
+            running read counter
+        """
+        from confect.instrument import ReadCounter
+
+        return ReadCounter(self, call_sites=call_sites).start()
+
+    def getter(self, path):
+        """Return a function that reads the property at dotted ``path``.
+
+        The path is validated once here, so that calling the returned
+        function skips the attribute lookups of ``conf.group.prop``.
+
+        >>> conf = Conf()
+        >>> conf.declare_group('db', host='10.3.14.15')
+        >>> get_host = conf.getter('db.host')
+        >>> get_host()
+        '10.3.14.15'
+        """
+        group_name, prop_name = _split_path(path)
+        group = self[group_name]
+        # validate the path without counting a read
+        ConfGroup.__getitem__(group, prop_name)
+        if prop_name in group._derived or self._read_counter is not None:
+            # look up __getitem__ on each call, since the class of the group
+            # is switched back once the read counter stops
+            return lambda: group[prop_name]
+
+        conf_prop = group._properties[prop_name]
+        local_overrides = self._local_overrides
+
+        def getter():
+            overrides = local_overrides.get()
+            if overrides and group_name in overrides:
+                group_overrides = overrides[group_name]
+                if prop_name in group_overrides:
+                    return group_overrides[prop_name]
+            return conf_prop.value
+
+        return getter
+
     def __repr__(self):
         return (
             f"<{__name__}.{type(self).__qualname__} "
@@ -472,14 +1791,24 @@ class ConfGroupPropertySetter:
             self[property_name] = value
 
     def __getitem__(self, property_name):
-        return self._conf_group._properties[property_name]
+        conf_group = self._conf_group
+        if property_name in conf_group._derived:
+            return conf_group._derived[property_name]
+        return conf_group._properties[property_name]
 
     def __setitem__(self, property_name, default):
+        self._conf_group._conf._fingerprint = None
+        if isinstance(default, DerivedProperty):
+            self._conf_group._properties.pop(property_name, None)
+            self._conf_group._derived[property_name] = default
+            return
+
         if isinstance(default, ConfProperty):
             conf_prop = default
         else:
             conf_prop = ConfProperty(default)
 
+        self._conf_group._derived.pop(property_name, None)
         self._conf_group._properties[property_name] = conf_prop
 
     def _update(self, default_properties):
@@ -488,33 +1817,66 @@ class ConfGroupPropertySetter:
 
 
 class ConfGroup:
-    __slots__ = ("_conf", "_name", "_properties")
+    __slots__ = ("_conf", "_name", "_properties", "_derived", "_local_overrides")
 
     def __init__(self, conf: Conf, name: str):
         self._conf = weakref.proxy(conf)
         self._name = name
         self._properties = {}
+        self._derived = {}
+        self._local_overrides = conf._local_overrides
 
     def __getattr__(self, property_name):
         return self[property_name]
 
     def __setattr__(self, property_name, value):
-        if property_name in self.__slots__:
+        if property_name in ConfGroup.__slots__:
             object.__setattr__(self, property_name, value)
         else:
             self[property_name] = value
 
     def __getitem__(self, property_name):
         if property_name not in self._properties:
+            if property_name in self._derived:
+                return self._derived[property_name].get(self, property_name)
+
             raise UnknownConfError(
                 f"Unknown {property_name!r} property in "
                 f"configuration group {self._name!r}"
             )
 
+        overrides = self._local_overrides.get()
+        if overrides and self._name in overrides:
+            group_overrides = overrides[self._name]
+            if property_name in group_overrides:
+                return group_overrides[property_name]
+
         return self._properties[property_name].value
 
     def __setitem__(self, property_name, value):
-        if self._conf._is_frozen:
+        if property_name not in self._properties:
+            if property_name in self._derived:
+                raise FrozenConfPropError(
+                    f"Derived property {property_name!r} in configuration "
+                    f"group {self._name!r} can't be set."
+                )
+
+            raise UnknownConfError(
+                f"Unknown {property_name!r} property in "
+                f"configuration group {self._name!r}"
+            )
+
+        overrides = self._local_overrides.get()
+        if overrides is not None:
+            # Copy on write, since tasks and threads created in the block
+            # share the overrides. Derived values cached in the block are
+            # dropped, since they may depend on the property.
+            group_overrides = dict(overrides.get(self._name, ()))
+            group_overrides[property_name] = value
+            overrides = {**overrides, self._name: group_overrides}
+            overrides.pop(_DERIVED_CACHE, None)
+            self._local_overrides.set(overrides)
+        elif self._conf._is_frozen:
             raise FrozenConfPropError(
                 "Configuration properties are frozen.\n"
                 "Configuration properties can only be changed globally by "
@@ -524,26 +1886,44 @@ class ConfGroup:
                 "created by `Conf.mutate_locally()`."
             )
         else:
-            self._properties[property_name].value = value
+            self._conf._provenance.pop((self._name, property_name), None)
+            self._set_value(property_name, value)
+
+    def _set_value(self, property_name, value):
+        """Set the global value of a property and record the change"""
+        conf_prop = self._properties[property_name]
+        self._conf._record_change(self._name, property_name, conf_prop)
+        conf_prop._value = value
 
     def __dir__(self):
-        return self._properties.keys()
+        return [*self._properties, *self._derived]
 
     @contextmanager
     def _default_setter(self):
         yield ConfGroupPropertySetter(self)
+        # Apply values loaded before this group was declared
+        with self._conf._transaction():
+            self._conf._merge_conf_depot([self._name])
 
     def _update_from_conf_depot_group(self, conf_depot_group):
-        for conf_property, value in conf_depot_group._items():
+        for conf_property, value in list(conf_depot_group._items()):
             if conf_property in self._properties:
-                self._properties[conf_property].value = value
+                self._set_value(conf_property, value)
+                del conf_depot_group[conf_property]
 
     def __deepcopy__(self, memo):
+        from copy import deepcopy
+
         cls = type(self)
         new_self = cls.__new__(cls)
         new_self._conf = self._conf  # Don't need to copy conf
         new_self._name = self._name
         new_self._properties = deepcopy(self._properties)
+        new_self._derived = {
+            name: DerivedProperty(derived_prop.func, desc=derived_prop.desc)
+            for name, derived_prop in self._derived.items()
+        }
+        new_self._local_overrides = self._local_overrides
         return new_self
 
     def get_prop(self, prop):
@@ -553,7 +1933,9 @@ class ConfGroup:
         return self.get_prop(prop).prop_type.parse(string)
 
     def as_dict(self):
-        return {name: prob.value for name, prob in self._properties.items()}
+        # not counted by Conf.instrument(), e.g. when called by Conf.freeze()
+        get = ConfGroup.__getitem__
+        return {name: get(self, name) for name in (*self._properties, *self._derived)}
 
     def __repr__(self):
         return (
@@ -562,6 +1944,311 @@ class ConfGroup:
         )
 
 
+def _call_subscriber(callback, *args):
+    try:
+        callback(*args)
+    except Exception:
+        _logger().exception("Error in configuration subscriber %r", callback)
+
+
+def _logger():
+    # logging is imported on first use to keep ``import confect`` light
+    import logging
+
+    return logging.getLogger(__name__)
+
+
+def _unpickle_conf(fingerprint, values, is_frozen):
+    from confect.pmap import PersistentMap
+
+    for schema_conf in list(_confs):
+        if schema_conf._schema_fingerprint() == fingerprint:
+            break
+    else:
+        raise UnknownConfError(
+            "No Conf object with the same declarations to unpickle into. Import "
+            "the modules declaring configuration groups before unpickling."
+        )
+
+    conf = schema_conf._copy_declarations()
+    for group_name, props in values.items():
+        properties = conf._conf_groups[group_name]._properties
+        for prop_name, value in props.items():
+            properties[prop_name]._value = value
+    conf._versions = {
+        0: PersistentMap(
+            ((group_name, prop_name), value)
+            for group_name, props in values.items()
+            for prop_name, value in props.items()
+        )
+    }
+    conf._is_frozen = is_frozen
+    return conf
+
+
+def _layer_keys(*layer_values):
+    """``(group, prop)`` keys set by any of the layer values, in order"""
+    return dict.fromkeys(
+        (group_name, prop_name)
+        for values in layer_values
+        for group_name, props in values.items()
+        for prop_name in props
+    )
+
+
+def _changed_layer_keys(old_values, new_values):
+    """``(group, prop)`` keys whose value differs between two evaluations"""
+    keys = {}
+    for group_name in {**old_values, **new_values}:
+        old_props = old_values.get(group_name, {})
+        new_props = new_values.get(group_name, {})
+        for prop_name in {**old_props, **new_props}:
+            if _is_changed(
+                old_props.get(prop_name, Undefined),
+                new_props.get(prop_name, Undefined),
+            ):
+                keys[group_name, prop_name] = None
+    return keys
+
+
+def _is_changed(old, new):
+    if old is new:
+        return False
+    try:
+        return bool(old != new)
+    except Exception:
+        return True
+
+
+def _new_local_overrides_var(conf):
+    # Maps group name to {property name: value} assigned in
+    # ``Conf.mutate_locally()`` blocks of the current context
+    return ContextVar(f"confect_local_overrides_{id(conf):x}", default=None)
+
+
+def _parse_items(items):
+    """Parse ``(key, prop_type, string)`` items with ``parse_many()``
+
+    Return parsed values and exceptions by key.
+    """
+    batches = {}
+    for key, prop_type, string in items:
+        keys, strings = batches.setdefault(prop_type, ([], []))
+        keys.append(key)
+        strings.append(string)
+
+    values = {}
+    errors = {}
+    for prop_type, (keys, strings) in batches.items():
+        try:
+            values.update(zip(keys, prop_type.parse_many(strings)))
+            continue
+        except ParseError as exc:
+            batch_errors = exc.errors
+
+        # Parse the strings that didn't fail one by one, since parse_many()
+        # doesn't return values on errors.
+        for i, (key, string) in enumerate(zip(keys, strings)):
+            if i in batch_errors:
+                errors[key] = batch_errors[i]
+                continue
+            try:
+                values[key] = prop_type.parse(string)
+            except Exception as exc:
+                errors[key] = exc
+    return values, errors
+
+
+def _split_path(path):
+    group_name, sep, prop_name = path.partition(".")
+    if not sep or not group_name or not prop_name or "." in prop_name:
+        raise ParameterError(
+            f"Property path should be in '<group>.<prop>' format: {path!r}"
+        )
+    return group_name, prop_name
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenConfPropError("Frozen configuration snapshot is read-only.")
+
+
+class _CountingConfGroup(ConfGroup):
+    """ConfGroup that counts reads, swapped in by ``Conf.instrument()``"""
+
+    __slots__ = ()
+
+    def __getitem__(self, property_name):
+        value = ConfGroup.__getitem__(self, property_name)
+        # the counter is unset right before the class is switched back
+        read_counter = self._conf._read_counter
+        if read_counter is not None:
+            read_counter._record(self._name, property_name)
+        return value
+
+
+class FrozenConfGroup:
+    """Read-only snapshot of a configuration group
+
+    Properties are stored in ``__slots__`` of a class generated per group,
+    so reading them costs the same as reading a plain attribute. There's no
+    ``__getattr__`` hook since it would slow down every attribute read.
+    Reading an unknown property as attribute raises ``AttributeError``,
+    while ``group[name]`` raises ``UnknownConfError``.
+    """
+
+    __slots__ = ()
+    _name = None
+    _prop_names = frozenset()
+
+    __setattr__ = _frozen_setattr
+    __delattr__ = _frozen_setattr
+
+    def __getitem__(self, property_name):
+        if property_name not in self._prop_names:
+            raise UnknownConfError(
+                f"Unknown {property_name!r} property in "
+                f"configuration group {self._name!r}"
+            )
+        return getattr(self, property_name)
+
+    def __setitem__(self, property_name, value):
+        _frozen_setattr(self, property_name, value)
+
+    def __contains__(self, property_name):
+        return property_name in self._prop_names
+
+    def __dir__(self):
+        return list(self.__slots__)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f"<{__name__}.{type(self).__qualname__} "
+            f"{self._name} properties={list(self.__slots__)}>"
+        )
+
+
+class FrozenConf:
+    """Read-only snapshot of a Conf created by ``Conf.freeze()``"""
+
+    __slots__ = ()
+    _group_names = frozenset()
+
+    __setattr__ = _frozen_setattr
+    __delattr__ = _frozen_setattr
+
+    def __getitem__(self, group_name):
+        if group_name not in self._group_names:
+            raise UnknownConfError(f"Unknown configuration group {group_name!r}")
+        return getattr(self, group_name)
+
+    def __setitem__(self, group_name, group):
+        _frozen_setattr(self, group_name, group)
+
+    def __contains__(self, group_name):
+        return group_name in self._group_names
+
+    def __dir__(self):
+        return list(self.__slots__)
+
+    def getter(self, path):
+        """Return a function that reads the property at dotted ``path``"""
+        group_name, prop_name = _split_path(path)
+        group = self[group_name]
+        group[prop_name]
+        return fnt.partial(getattr, group, prop_name)
+
+    def __reduce__(self):
+        # generated classes can't be pickled, so they are generated again
+        groups = {name: getattr(self, name).as_dict() for name in self.__slots__}
+        return _make_frozen_conf, (groups,)
+
+    def __repr__(self):
+        return f"<{__name__}.{type(self).__qualname__} groups={list(self.__slots__)}>"
+
+
+def _make_frozen_instance(base, name, attrs, **class_attrs):
+    cls = type(name, (base,), dict(__slots__=tuple(attrs), **class_attrs))
+    instance = object.__new__(cls)
+    for attr, value in attrs.items():
+        object.__setattr__(instance, attr, value)
+    return instance
+
+
+def _check_frozen_name(base, name, kind):
+    """Raise ParameterError if ``name`` can't be a slot of a ``base`` subclass"""
+    if not name.isidentifier() or name.startswith("__") or hasattr(base, name):
+        raise ParameterError(
+            f"Configuration {kind} {name!r} can't be frozen. Names of frozen "
+            f"groups and properties should be identifiers that don't start "
+            f"with '__' or conflict with attributes of {base.__name__}."
+        )
+
+
+def _make_frozen_conf(groups):
+    for group_name, properties in groups.items():
+        _check_frozen_name(FrozenConf, group_name, "group")
+        for prop_name in properties:
+            _check_frozen_name(FrozenConfGroup, prop_name, "property")
+
+    frozen_groups = {
+        group_name: _make_frozen_instance(
+            FrozenConfGroup,
+            f"FrozenConfGroup_{group_name}",
+            properties,
+            _name=group_name,
+            _prop_names=frozenset(properties),
+        )
+        for group_name, properties in groups.items()
+    }
+    return _make_frozen_instance(
+        FrozenConf, "FrozenConf", frozen_groups, _group_names=frozenset(groups)
+    )
+
+
+def _replace_frozen_groups(frozen_conf, groups):
+    """Copy a frozen conf with replaced groups, sharing the other groups
+
+    ``groups`` maps group names to all of their property values. The copy
+    reuses the generated classes of ``frozen_conf``.
+    """
+    new_conf = object.__new__(type(frozen_conf))
+    for group_name in frozen_conf.__slots__:
+        group = getattr(frozen_conf, group_name)
+        if group_name in groups:
+            properties = groups[group_name]
+            group = object.__new__(type(group))
+            for prop_name in group.__slots__:
+                object.__setattr__(group, prop_name, properties[prop_name])
+        object.__setattr__(new_conf, group_name, group)
+    return new_conf
+
+
 @fnt.wraps(ConfProperty.__init__)
 def prop(*args, **kwargs):
     return ConfProperty(*args, **kwargs)
+
+
+def derived(func, *, desc=""):
+    """Declare a property computed from other properties
+
+    ``func`` is called with the conf object. Its result is cached until
+    any property it read changes.
+
+    >>> import confect
+    >>> conf = confect.Conf()
+    >>> with conf.declare_group('db') as db:
+    ...     db.host = '10.3.14.15'
+    ...     db.port = 3361
+    ...     db.url = confect.derived(
+    ...         lambda conf: f'mysql://{conf.db.host}:{conf.db.port}')
+    >>> conf.db.url
+    'mysql://10.3.14.15:3361'
+    >>> with conf.mutate_locally():
+    ...     conf.db.port = 3362
+    ...     conf.db.url
+    'mysql://10.3.14.15:3362'
+    """
+    return DerivedProperty(func, desc=desc)
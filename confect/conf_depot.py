@@ -19,6 +19,9 @@ class ConfDepot:
         return self._depot_groups[group_name]
 
     def __getattr__(self, group_name):
+        # special methods looked up by copy and pickle aren't groups
+        if group_name.startswith('__'):
+            raise AttributeError(group_name)
         return self[group_name]
 
     def __setattr__(self, name, value):
@@ -39,6 +42,16 @@ class ConfDepot:
     def __dir__(self):
         return self._depot_groups.keys()
 
+    def _items(self):
+        return self._depot_groups.items()
+
+    def _as_dict(self):
+        return {
+            group_name: dict(conf_depot_group._items())
+            for group_name, conf_depot_group in self._depot_groups.items()
+            if conf_depot_group
+        }
+
 
 class ConfDepotGroup:
     __slots__ = '_depot_properties'
@@ -60,6 +73,15 @@ class ConfDepotGroup:
     def __setitem__(self, property_name, value):
         self._depot_properties[property_name] = value
 
+    def __delitem__(self, property_name):
+        del self._depot_properties[property_name]
+
+    def __contains__(self, property_name):
+        return property_name in self._depot_properties
+
+    def __len__(self):
+        return len(self._depot_properties)
+
     def __getattr__(self, property_name):
         return self[property_name]
 
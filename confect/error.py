@@ -18,4 +18,7 @@ class ParameterError(Exception):
     pass
 
 class ParseError(Exception):
-    pass
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        #: exceptions of each failed source when multiple strings are parsed
+        self.errors = {} if errors is None else errors
@@ -0,0 +1,175 @@
+"""Counting reads of configuration properties
+
+``Conf.instrument()`` swaps the class of every configuration group for a
+subclass that counts reads, and ``ReadCounter.stop()`` swaps it back. Reads
+cost nothing extra while no counter is running.
+
+.. code:: python
+
+   counter = conf.instrument(call_sites=True)
+   run_workload()
+   counter.stop()
+   print(counter.report())
+   print(counter.unread())  # declared but never read
+"""
+import sys
+
+__all__ = ["ReadCounter"]
+
+# Prometheus metric of read counts
+METRIC_NAME = "confect_property_reads_total"
+
+
+class ReadCounter:
+    """Read counts of each property of a Conf object
+
+    Create it with ``Conf.instrument()``. Reads through ``conf.group.prop``,
+    ``conf[group][prop]``, derived properties and ``Conf.getter()`` functions
+    created while counting are counted. ``as_dict()`` of groups, snapshots from
+    ``Conf.freeze()`` and sweep views aren't counted.
+
+    Parameters
+    ----------
+    conf : Conf
+        Conf object to count reads of
+    call_sites : bool
+        also record the ``'<file>:<line>'`` of the first read of each property
+    """
+
+    def __init__(self, conf, *, call_sites=False):
+        self._conf = conf
+        #: {(group, prop): number of reads}
+        self.counts = {}
+        #: {(group, prop): '<file>:<line>'} of the first read
+        self.call_sites = {}
+        self._call_sites = call_sites
+        self.running = False
+
+    def start(self):
+        from confect.conf import _CountingConfGroup
+
+        conf = self._conf
+        if conf._read_counter is not None:
+            raise RuntimeError("Reads of the Conf object are already counted")
+        conf._read_counter = self
+        for group in conf._conf_groups.values():
+            object.__setattr__(group, "__class__", _CountingConfGroup)
+        self.running = True
+        return self
+
+    def stop(self):
+        from confect.conf import ConfGroup
+
+        conf = self._conf
+        if conf._read_counter is self:
+            conf._read_counter = None
+            for group in conf._conf_groups.values():
+                object.__setattr__(group, "__class__", ConfGroup)
+        self.running = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _record(self, group_name, prop_name):
+        key = (group_name, prop_name)
+        counts = self.counts
+        if key in counts:
+            counts[key] += 1
+            return
+
+        counts[key] = 1
+        if self._call_sites:
+            self.call_sites[key] = _call_site()
+
+    def hot(self, limit=None):
+        """Most read properties
+
+        Returns
+        -------
+        List[Tuple[str, int]]
+            ``'<group>.<prop>'`` paths and their read counts, most read first
+        """
+        items = sorted(self.counts.items(), key=lambda item: -item[1])
+        return [(f"{group}.{prop}", count) for (group, prop), count in items][:limit]
+
+    def unread(self):
+        """Declared properties that haven't been read
+
+        Returns
+        -------
+        List[str]
+            ``'<group>.<prop>'`` paths in declaration order
+        """
+        return [
+            f"{group_name}.{prop_name}"
+            for group_name, prop_name in _declared(self._conf)
+            if (group_name, prop_name) not in self.counts
+        ]
+
+    def report(self, limit=20):
+        """Human readable report of the most read and unread properties"""
+        lines = ["Most read configuration properties:"]
+        for path, count in self.hot(limit):
+            call_site = self.call_sites.get(tuple(path.split(".", 1)))
+            line = f"  {count:>10}  {path}"
+            if call_site is not None:
+                line += f"  (first read at {call_site})"
+            lines.append(line)
+
+        unread = self.unread()
+        lines.append(f"Unread configuration properties ({len(unread)}):")
+        lines.extend(f"  {path}" for path in unread)
+        return "\n".join(lines)
+
+    def to_prometheus(self, metric=METRIC_NAME):
+        """Read counts in the Prometheus text exposition format
+
+        Unread properties are exported with zero counts, so dead properties
+        can be found with a query like ``confect_property_reads_total == 0``.
+        """
+        lines = [
+            f"# HELP {metric} Reads of configuration properties.",
+            f"# TYPE {metric} counter",
+        ]
+        counts = self.counts
+        keys = list(_declared(self._conf))
+        declared = set(keys)
+        keys.extend(key for key in counts if key not in declared)
+        for group_name, prop_name in keys:
+            count = counts.get((group_name, prop_name), 0)
+            lines.append(
+                f'{metric}{{group="{_escape(group_name)}",'
+                f'prop="{_escape(prop_name)}"}} {count}'
+            )
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self):
+        return (
+            f"<{__name__}.{type(self).__qualname__} "
+            f"running={self.running} properties={len(self.counts)}>"
+        )
+
+
+def _declared(conf):
+    for group_name, group in conf._conf_groups.items():
+        for prop_name in group._properties:
+            yield group_name, prop_name
+        for prop_name in group._derived:
+            yield group_name, prop_name
+
+
+def _call_site():
+    # skip frames of confect's own accessors
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get("__name__") == "confect.conf":
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+
+def _escape(label_value):
+    return label_value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,251 @@
+"""Configuration sources for ``Conf.load_layers()``
+
+Each layer evaluates its source into a separate ``{group: {prop: value}}``
+mapping. ``Conf.load_layers()`` then merges these mappings into the declared
+groups, with later layers taking precedence.
+"""
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+
+from .error import ParameterError, ParseError
+
+__all__ = ["Layer", "File", "Module", "EnvVars", "Mapping", "of_source"]
+
+
+class Layer(ABC):
+    """Source of configuration values"""
+
+    #: Whether the layer can be evaluated in a worker process. Those layers
+    #: get ``None`` instead of the Conf object in ``evaluate()``.
+    parallel = False
+
+    @property
+    @abstractmethod
+    def name(self):
+        """Human readable name of this layer"""
+
+    @abstractmethod
+    def evaluate(self, conf):
+        """Evaluate the source into configuration values
+
+        Parameters
+        ----------
+        conf : confect.Conf
+            the Conf object that loads this layer. ``None`` for layers
+            evaluated in a worker process.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            values of each configuration group
+        """
+
+    def source_paths(self):
+        """Paths of the files this layer reads, for watching changes"""
+        return ()
+
+    @property
+    def key(self):
+        """Key of the source. Loading a layer replaces the loaded layers with
+        the same key, e.g. when loading the same file again."""
+        return type(self), self.name
+
+    def __repr__(self):
+        return f"<{__name__}.{type(self).__qualname__} {self.name}>"
+
+
+class File(Layer):
+    """Python configuration file loaded through file path"""
+
+    parallel = True
+
+    def __init__(self, path, *, cache=True, cache_dir=None):
+        self.path = Path(path)
+        self.cache = cache
+        self.cache_dir = cache_dir
+
+    @property
+    def name(self):
+        return f"file:{self.path}"
+
+    def source_paths(self):
+        return (self.path,)
+
+    def evaluate(self, conf):
+        if self.cache:
+            from confect.code_cache import load_code
+
+            code = load_code(self.path, self.cache_dir)
+        else:
+            code = compile(
+                self.path.read_bytes(), str(self.path), "exec", dont_inherit=True
+            )
+
+        with _confect_c_ctx() as conf_depot:
+            exec(code, {"__name__": "__confect_conf__", "__file__": str(self.path)})
+        return conf_depot._as_dict()
+
+
+class Module(Layer):
+    """Python configuration file loaded through module importing
+
+    The module is imported on the first evaluation, and reloaded with
+    ``importlib.reload()`` on later evaluations, e.g. by
+    ``Conf.reload_layer()``. It stays in ``sys.modules``, so code importing
+    it gets the same module object.
+    """
+
+    parallel = True
+
+    def __init__(self, module_name):
+        self.module_name = module_name
+
+    @property
+    def name(self):
+        return f"module:{self.module_name}"
+
+    def source_paths(self):
+        from importlib.util import find_spec
+
+        spec = find_spec(self.module_name)
+        if spec is None or not spec.has_location:
+            return ()
+        return (Path(spec.origin),)
+
+    def evaluate(self, conf):
+        import importlib
+        import sys
+
+        with _confect_c_ctx() as conf_depot:
+            module = sys.modules.get(self.module_name)
+            if module is None:
+                importlib.import_module(self.module_name)
+            else:
+                importlib.reload(module)
+        return conf_depot._as_dict()
+
+
+class EnvVars(Layer):
+    """Environment variables in ``<prefix>__<group>__<prop>`` format
+
+    Only the variables of declared properties are looked up, so the cost
+    doesn't depend on the size of the environment. With multiple prefixes,
+    the latter one takes precedence.
+
+    Parameters
+    ----------
+    prefixes : str
+        prefixes of environment variables
+    lazy : bool
+        parse values on the first access of each property. Otherwise, all
+        values are parsed on evaluation, and one ``ParseError`` is raised for
+        all failures.
+    """
+
+    def __init__(self, *prefixes, lazy=False):
+        if not prefixes:
+            raise ParameterError("At least one prefix is required.")
+        self.prefixes = prefixes
+        self.lazy = lazy
+
+    @property
+    def name(self):
+        return f"envvars:{','.join(self.prefixes)}"
+
+    def evaluate(self, conf):
+        from confect.conf import Unparsed, _parse_items
+
+        environ = os.environ
+        prefixes = self.prefixes[::-1]
+        values = {}
+        items = []
+        for group_name, prop_name, conf_prop in conf._iter_props():
+            suffix = f"__{group_name}__{prop_name}"
+            for prefix in prefixes:
+                var_name = prefix + suffix
+                string = environ.get(var_name)
+                if string is not None:
+                    break
+            else:
+                continue
+
+            if self.lazy:
+                value = Unparsed(conf_prop.prop_type, string, var_name)
+                values.setdefault(group_name, {})[prop_name] = value
+            else:
+                key = (group_name, prop_name, var_name)
+                items.append((key, conf_prop.prop_type, string))
+
+        parsed, errors = _parse_items(items)
+        if errors:
+            raise ParseError(
+                f"Failed to parse {len(errors)} environment variable(s):\n"
+                + "\n".join(
+                    f"  {var_name}={environ[var_name]!r}: {exc}"
+                    for (_, _, var_name), exc in errors.items()
+                ),
+                {var_name: exc for (_, _, var_name), exc in errors.items()},
+            )
+
+        for (group_name, prop_name, _), value in parsed.items():
+            values.setdefault(group_name, {})[prop_name] = value
+
+        return values
+
+
+class Mapping(Layer):
+    """Configuration values in ``{group: {prop: value}}`` mapping"""
+
+    def __init__(self, values, name=None):
+        self.values = values
+        self._name = name
+
+    @property
+    def name(self):
+        if self._name is None:
+            return f"mapping:{id(self.values):x}"
+        return f"mapping:{self._name}"
+
+    def evaluate(self, conf):
+        return {group: dict(props) for group, props in self.values.items()}
+
+
+def of_source(source):
+    """Return the layer of ``source``
+
+    ``pathlib.Path`` is loaded as a configuration file, and ``dict`` as a
+    mapping of values. Other sources should be wrapped in a Layer explicitly.
+    """
+    if isinstance(source, Layer):
+        return source
+    if isinstance(source, Path):
+        return File(source)
+    if isinstance(source, dict):
+        return Mapping(source)
+
+    raise ParameterError(
+        f"Unable to infer configuration layer of {source!r}. Use "
+        "confect.layer.File, Module, EnvVars or Mapping explicitly."
+    )
+
+
+# ``confect.c`` is shared by the whole process. Keep layers evaluated in other
+# threads, e.g. by a watcher, from replacing it in the middle of a file.
+_confect_c_lock = threading.RLock()
+
+
+@contextmanager
+def _confect_c_ctx():
+    import confect
+    from confect.conf_depot import ConfDepot
+
+    conf_depot = ConfDepot()
+    with _confect_c_lock:
+        confect.c = conf_depot
+        try:
+            yield conf_depot
+        finally:
+            del confect.c
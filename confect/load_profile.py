@@ -0,0 +1,134 @@
+"""Timing of configuration sources
+
+Every evaluation of a layer by ``Conf.load_*()`` and ``Conf.reload_layer()``
+is timed into a ``LoadRecord``. Records are kept by the Conf object and
+logged to the ``confect.load_profile`` logger, with the record in the
+``confect_load`` attribute of the log record for structured handlers.
+
+.. code:: python
+
+   with conf.profile_loading():
+       conf.load_file('path/to/project_conf.py')
+   for record in conf.load_records():
+       print(record.layer, record.seconds, record.props)
+   conf.load_records()[-1].stats.sort_stats('cumulative').print_stats(10)
+"""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["LoadRecord"]
+
+
+class LoadRecord:
+    """Evaluation of a configuration layer
+
+    Attributes
+    ----------
+    layer : str
+        name of the layer, e.g. ``'file:path/to/conf.py'``
+    seconds : float
+        wall time of evaluating the layer
+    props : int
+        number of properties set by the layer
+    worker : bool
+        whether the layer was evaluated in a worker process
+    """
+
+    __slots__ = ("layer", "seconds", "props", "worker", "_profile_stats")
+
+    def __init__(self, layer, seconds, props, worker=False, profile_stats=None):
+        self.layer = layer
+        self.seconds = seconds
+        self.props = props
+        self.worker = worker
+        self._profile_stats = profile_stats
+
+    @property
+    def stats(self):
+        """``pstats.Stats`` of the evaluation, or ``None`` if not profiled
+
+        Only evaluations in ``Conf.profile_loading()`` blocks are profiled.
+        """
+        if self._profile_stats is None:
+            return None
+
+        import pstats
+
+        return pstats.Stats(_ProfileData(dict(self._profile_stats)))
+
+    def as_dict(self):
+        return {
+            "layer": self.layer,
+            "seconds": self.seconds,
+            "props": self.props,
+            "worker": self.worker,
+        }
+
+    def __repr__(self):
+        return (
+            f"<{__name__}.{type(self).__qualname__} {self.layer} "
+            f"seconds={self.seconds:.6f} props={self.props}>"
+        )
+
+
+def evaluate(layer, conf, *, cprofile=False, worker=False):
+    """Evaluate ``layer`` and time it
+
+    Returns
+    -------
+    Tuple[Dict[str, Dict[str, Any]], LoadRecord]
+        values of the layer and the record of the evaluation
+    """
+    profiler = None
+    if cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
+    start = time.perf_counter()
+    if profiler is None:
+        values = layer.evaluate(conf)
+    else:
+        profiler.enable()
+        try:
+            values = layer.evaluate(conf)
+        finally:
+            profiler.disable()
+    seconds = time.perf_counter() - start
+
+    profile_stats = None
+    if profiler is not None:
+        profiler.create_stats()
+        # plain dicts and tuples, picklable from worker processes
+        profile_stats = profiler.stats
+
+    props = sum(len(group_values) for group_values in values.values())
+    record = LoadRecord(layer.name, seconds, props, worker, profile_stats)
+    return values, record
+
+
+def evaluate_in_worker(layer, cprofile):
+    """Evaluate ``layer`` in a worker process of ``Conf.load_layers()``"""
+    return evaluate(layer, None, cprofile=cprofile, worker=True)
+
+
+def log(record):
+    logger.info(
+        "Evaluated configuration layer %s in %.3f s, %d properties",
+        record.layer,
+        record.seconds,
+        record.props,
+        extra={"confect_load": record},
+    )
+
+
+class _ProfileData:
+    """Profiler-like holder of raw stats, accepted by ``pstats.Stats``"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
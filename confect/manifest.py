@@ -0,0 +1,111 @@
+"""Declaration manifest for declaring configuration groups lazily
+
+A manifest maps configuration group names to the modules that declare them.
+With ``Conf.use_manifest()``, accessing an undeclared group imports its module,
+so applications don't have to import every declaring module eagerly.
+
+Manifests are generated by scanning the source code of a package for
+``declare_group('<name>', ...)`` calls without importing it.
+"""
+import ast
+import json
+import sys
+from pathlib import Path
+
+from .error import ConfGroupExistsError, ParameterError
+
+__all__ = ["scan", "read", "write"]
+
+
+def scan(package):
+    """Scan a package for configuration group declarations
+
+    Only ``declare_group()`` calls with a string literal group name are
+    found.
+
+    Parameters
+    ----------
+    package : str
+        name of an importable package
+
+    Returns
+    -------
+    Dict[str, str]
+        module name of each configuration group
+    """
+    from importlib.util import find_spec
+
+    spec = find_spec(package)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {package!r}", name=package)
+
+    if spec.submodule_search_locations is None:
+        sources = [(package, Path(spec.origin))]
+    else:
+        sources = [
+            (_module_name(package, Path(location), path), path)
+            for location in spec.submodule_search_locations
+            for path in sorted(Path(location).rglob("*.py"))
+        ]
+
+    manifest = {}
+    for module_name, path in sources:
+        for group_name in _declared_groups(path):
+            if manifest.get(group_name, module_name) != module_name:
+                raise ConfGroupExistsError(
+                    f"configuration group {group_name!r} is declared in both "
+                    f"{manifest[group_name]!r} and {module_name!r}"
+                )
+            manifest[group_name] = module_name
+    return manifest
+
+
+def read(path):
+    """Read a manifest file written by ``write()``"""
+    with open(path) as f:
+        manifest = json.load(f)
+
+    if not isinstance(manifest, dict):
+        raise ParameterError(f"Invalid declaration manifest: {path}")
+    return manifest
+
+
+def write(manifest, path):
+    """Write a manifest into a JSON file"""
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _module_name(package, location, path):
+    parts = list(path.relative_to(location).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join([package, *parts])
+
+
+def _declared_groups(path):
+    try:
+        tree = ast.parse(path.read_bytes(), str(path))
+    except SyntaxError:
+        return
+
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "declare_group"
+            and node.args
+        ):
+            group_name = _str_literal(node.args[0])
+            if group_name is not None:
+                yield group_name
+
+
+def _str_literal(node):
+    if sys.version_info < (3, 8):
+        # string literals are parsed into ast.Str before python 3.8
+        return node.s if isinstance(node, ast.Str) else None
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
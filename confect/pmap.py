@@ -0,0 +1,385 @@
+"""Persistent hash map
+
+``PersistentMap`` is an immutable hash array mapped trie. ``set()`` and
+``delete()`` return new maps that share all nodes off the path to the changed
+key, so keeping many versions costs memory in proportion to the changes
+rather than to the size of the map. ``diff()`` skips shared nodes.
+"""
+
+__all__ = ["PersistentMap"]
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_MISSING = object()
+
+
+def _hash(key):
+    return hash(key) & 0xFFFFFFFFFFFFFFFF
+
+
+def _index(bitmap, bit):
+    return bin(bitmap & (bit - 1)).count("1")
+
+
+class _Node:
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children
+
+
+class _Entry:
+    __slots__ = ("hash", "key", "value")
+
+    def __init__(self, hash_, key, value):
+        self.hash = hash_
+        self.key = key
+        self.value = value
+
+
+class _Collision:
+    """Entries of keys with the same hash"""
+
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, hash_, entries):
+        self.hash = hash_
+        self.entries = entries
+
+
+_EMPTY_NODE = _Node(0, ())
+
+
+class PersistentMap:
+    """Immutable mapping with cheap modified copies
+
+    >>> m1 = PersistentMap().set('a', 1).set('b', 2)
+    >>> m2 = m1.set('a', 3)
+    >>> m1.get('a'), m2.get('a')
+    (1, 3)
+    >>> sorted(m1.diff(m2))
+    ['a']
+    """
+
+    __slots__ = ("_root", "_len")
+
+    def __init__(self, items=()):
+        self._root = _EMPTY_NODE
+        self._len = 0
+        if items:
+            self._root, self._len = _update(self._root, _entries(items), 0)
+
+    def get(self, key, default=None):
+        value = _get(self._root, _hash(key), key)
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key):
+        value = _get(self._root, _hash(key), key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return _get(self._root, _hash(key), key) is not _MISSING
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for key, _ in _items(self._root):
+            yield key
+
+    def items(self):
+        return _items(self._root)
+
+    def set(self, key, value):
+        """Return a map with ``key`` set to ``value``"""
+        root, added = _set(self._root, _hash(key), key, value, 0)
+        if root is self._root:
+            return self
+        return self._new(root, self._len + added)
+
+    def update(self, items):
+        """Return a map with keys set to values of ``items``
+
+        A map mostly made of new keys is built bottom-up, so it's faster
+        than calling ``set()`` for each key, e.g. on the first load.
+
+        Parameters
+        ----------
+        items : Union[Mapping[Any, Any], Iterable[Tuple[Any, Any]]]
+            keys and values
+        """
+        entries = _entries(items)
+        if len(entries) > self._len:
+            root, added = _update(self._root, entries, 0)
+        else:
+            root, added = self._root, 0
+            for hash_, key, value in entries:
+                root, key_added = _set(root, hash_, key, value, 0)
+                added += key_added
+        if root is self._root:
+            return self
+        return self._new(root, self._len + added)
+
+    def delete(self, key):
+        """Return a map without ``key``"""
+        root = _delete(self._root, _hash(key), key, 0)
+        if root is self._root:
+            raise KeyError(key)
+        return self._new(root, self._len - 1)
+
+    def diff(self, other):
+        """Keys with different values in this map and ``other``
+
+        Values are compared by identity.
+        """
+        keys = set()
+        for key in _diff(self._root, other._root):
+            if self.get(key, _MISSING) is not other.get(key, _MISSING):
+                keys.add(key)
+        return keys
+
+    def _new(self, root, length):
+        new_self = object.__new__(type(self))
+        new_self._root = root
+        new_self._len = length
+        return new_self
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+def _get(node, hash_, key):
+    shift = 0
+    while True:
+        bit = 1 << ((hash_ >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+
+        child = node.children[_index(node.bitmap, bit)]
+        if type(child) is _Node:
+            node = child
+            shift += _BITS
+        elif type(child) is _Entry:
+            if child.hash == hash_ and child.key == key:
+                return child.value
+            return _MISSING
+        else:
+            if child.hash == hash_:
+                for entry_key, value in child.entries:
+                    if entry_key == key:
+                        return value
+            return _MISSING
+
+
+def _set(node, hash_, key, value, shift):
+    """Return the node with ``key`` set, and whether the key was added"""
+    bit = 1 << ((hash_ >> shift) & _MASK)
+    index = _index(node.bitmap, bit)
+    children = node.children
+    if not node.bitmap & bit:
+        children = children[:index] + (_Entry(hash_, key, value),) + children[index:]
+        return _Node(node.bitmap | bit, children), True
+
+    child = children[index]
+    if type(child) is _Node:
+        new_child, added = _set(child, hash_, key, value, shift + _BITS)
+    elif type(child) is _Entry:
+        if child.hash == hash_ and child.key == key:
+            if child.value is value:
+                return node, False
+            new_child, added = _Entry(hash_, key, value), False
+        elif child.hash == hash_:
+            entries = ((child.key, child.value), (key, value))
+            new_child, added = _Collision(hash_, entries), True
+        else:
+            new_child = _merge(child, _Entry(hash_, key, value), shift + _BITS)
+            added = True
+    elif child.hash == hash_:
+        entries = [entry for entry in child.entries if entry[0] != key]
+        added = len(entries) == len(child.entries)
+        entries.append((key, value))
+        new_child = _Collision(hash_, tuple(entries))
+    else:
+        new_child = _merge(child, _Entry(hash_, key, value), shift + _BITS)
+        added = True
+
+    if new_child is child:
+        return node, False
+    children = children[:index] + (new_child,) + children[index + 1 :]
+    return _Node(node.bitmap, children), added
+
+
+def _entries(items):
+    if hasattr(items, "items"):
+        items = items.items()
+    return [(_hash(key), key, value) for key, value in items]
+
+
+def _update(node, entries, shift):
+    """Return the node with ``entries`` set, and the number of added keys"""
+    buckets = {}
+    for entry in entries:
+        buckets.setdefault((entry[0] >> shift) & _MASK, []).append(entry)
+
+    bitmap = node.bitmap
+    children = list(node.children)
+    # {bit: child} of buckets without a child in the node
+    new_children = {}
+    added = 0
+    for index, bucket in buckets.items():
+        bit = 1 << index
+        if not bitmap & bit:
+            if len(bucket) == 1:
+                new_children[bit] = _Entry(*bucket[0])
+                added += 1
+            else:
+                new_children[bit], bucket_added = _update_leaf(None, bucket, shift)
+                added += bucket_added
+            continue
+
+        position = _index(bitmap, bit)
+        child = children[position]
+        if type(child) is _Node:
+            children[position], bucket_added = _update(child, bucket, shift + _BITS)
+        else:
+            children[position], bucket_added = _update_leaf(child, bucket, shift)
+        added += bucket_added
+
+    if new_children:
+        merged = []
+        old_children = iter(children)
+        combined = bitmap
+        for bit in new_children:
+            combined |= bit
+        remaining = combined
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            if bit in new_children:
+                merged.append(new_children[bit])
+            else:
+                merged.append(next(old_children))
+        return _Node(combined, tuple(merged)), added
+    return _Node(bitmap, tuple(children)), added
+
+
+def _update_leaf(leaf, bucket, shift):
+    """Replace an entry, collision or nothing with ``bucket`` entries set"""
+    if leaf is None:
+        leaf_entries = []
+    elif type(leaf) is _Entry:
+        leaf_entries = [(leaf.hash, leaf.key, leaf.value)]
+    else:
+        leaf_entries = [(leaf.hash, *entry) for entry in leaf.entries]
+    bucket = leaf_entries + bucket
+
+    if any(entry[0] != bucket[0][0] for entry in bucket):
+        sub_node, added = _update(_EMPTY_NODE, bucket, shift + _BITS)
+    else:
+        # keys of the same hash end up in a collision node
+        sub_node, added = _EMPTY_NODE, 0
+        for hash_, key, value in bucket:
+            sub_node, key_added = _set(sub_node, hash_, key, value, shift)
+            added += key_added
+        sub_node = sub_node.children[0]
+    return sub_node, added - len(leaf_entries)
+
+
+def _merge(leaf1, leaf2, shift):
+    """Node of two leaves with different hashes"""
+    index1 = (leaf1.hash >> shift) & _MASK
+    index2 = (leaf2.hash >> shift) & _MASK
+    if index1 == index2:
+        return _Node(1 << index1, (_merge(leaf1, leaf2, shift + _BITS),))
+    if index1 > index2:
+        leaf1, leaf2 = leaf2, leaf1
+    return _Node((1 << index1) | (1 << index2), (leaf1, leaf2))
+
+
+def _delete(node, hash_, key, shift):
+    """Return the node without ``key``, ``node`` itself if it's missing"""
+    bit = 1 << ((hash_ >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+
+    index = _index(node.bitmap, bit)
+    child = node.children[index]
+    if type(child) is _Node:
+        new_child = _delete(child, hash_, key, shift + _BITS)
+        if new_child is child:
+            return node
+        if not new_child.bitmap:
+            new_child = None
+    elif type(child) is _Entry:
+        if child.hash != hash_ or child.key != key:
+            return node
+        new_child = None
+    else:
+        if child.hash != hash_:
+            return node
+        entries = tuple(entry for entry in child.entries if entry[0] != key)
+        if len(entries) == len(child.entries):
+            return node
+        if len(entries) == 1:
+            new_child = _Entry(hash_, *entries[0])
+        else:
+            new_child = _Collision(hash_, entries)
+
+    children = node.children
+    if new_child is None:
+        return _Node(node.bitmap & ~bit, children[:index] + children[index + 1 :])
+    return _Node(node.bitmap, children[:index] + (new_child,) + children[index + 1 :])
+
+
+def _items(node):
+    for child in node.children:
+        if type(child) is _Node:
+            yield from _items(child)
+        elif type(child) is _Entry:
+            yield child.key, child.value
+        else:
+            yield from child.entries
+
+
+def _diff(node1, node2):
+    """Keys in children of two nodes that aren't shared"""
+    if node1 is node2:
+        return
+
+    for child1, child2 in _child_pairs(node1, node2):
+        if child1 is child2:
+            continue
+        if type(child1) is _Node and type(child2) is _Node:
+            yield from _diff(child1, child2)
+            continue
+        for child in (child1, child2):
+            if type(child) is _Node:
+                for key, _ in _items(child):
+                    yield key
+            elif type(child) is _Entry:
+                yield child.key
+            elif child is not None:
+                for key, _ in child.entries:
+                    yield key
+
+
+def _child_pairs(node1, node2):
+    """Children of two nodes at the same index, None if missing"""
+    if node1.bitmap == node2.bitmap:
+        return zip(node1.children, node2.children)
+
+    pairs = []
+    bitmap = node1.bitmap | node2.bitmap
+    while bitmap:
+        bit = bitmap & -bitmap
+        bitmap ^= bit
+        child1 = child2 = None
+        if node1.bitmap & bit:
+            child1 = node1.children[_index(node1.bitmap, bit)]
+        if node2.bitmap & bit:
+            child2 = node2.children[_index(node2.bitmap, bit)]
+        pairs.append((child1, child2))
+    return pairs
@@ -1,6 +1,6 @@
-import ast
 import datetime as dt
-import json
+import sys
+
 from .error import ParseError
 
 __all__ = [
@@ -17,17 +17,35 @@ __all__ = [
     "List",
     "Tuple",
     "Dict",
+    "Decimal",
+    "Path",
     "DatePDL",
     "DateTimePDL",
     "make_prop_type",
+    "register",
 ]
 
 from abc import ABC, abstractmethod, abstractproperty
 
-try:
-    import click
-except ImportError as e:
-    pass
+# Property type class of each python type
+_registry = {}
+
+# Property type instance of each looked up python type, including subclasses
+# of registered python types
+_resolved = {}
+
+_entry_points_loaded = False
+
+ENTRY_POINT_GROUP = "confect.prop_types"
+
+
+def _is_prop_type_cls(obj):
+    return isinstance(obj, type) and issubclass(obj, PropertyType)
+
+
+def _add(prop_type_cls):
+    if _registry.setdefault(prop_type_cls.python_type, prop_type_cls) is prop_type_cls:
+        _resolved.clear()
 
 
 class PropertyType(ABC):
@@ -35,11 +53,13 @@ class PropertyType(ABC):
         if args or kwargs:
             return super().__new__(cls)
 
-        # reuse existing PropertyType instance
-        if not hasattr(cls, "_instance"):
-            cls._instance = super().__new__(cls)
+        # reuse existing PropertyType instance, which isn't inherited from
+        # the parent class
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = cls._instance = super().__new__(cls)
 
-        return cls._instance
+        return instance
 
     @property
     @abstractmethod
@@ -66,6 +86,42 @@ class PropertyType(ABC):
             instance of `python_type`
         """
 
+    def parse_many(self, strings):
+        """Parse strings into Python type
+
+        All strings are parsed before raising ``ParseError`` for failures, and
+        its ``errors`` maps the index of each failed string to its exception.
+
+        Parameters
+        --------------------
+        strings : Iterable[str]
+            strings to parse
+
+        Returns
+        --------------------
+        List[Any]
+            instances of `python_type`
+        """
+        strings = list(strings)
+        values = []
+        errors = {}
+        for i, s in enumerate(strings):
+            try:
+                values.append(self.parse(s))
+            except Exception as exc:
+                errors[i] = exc
+
+        if errors:
+            raise ParseError(
+                f"Failed to parse {len(errors)} of {len(strings)} string(s) "
+                f"as {self.name}:\n"
+                + "\n".join(
+                    f"  [{i}] {strings[i]!r}: {exc}" for i, exc in errors.items()
+                ),
+                errors,
+            )
+        return values
+
     @classmethod
     def prop_types(cls):
         for prop_type in cls.__subclasses__:
@@ -83,6 +139,8 @@ class PropertyType(ABC):
         return self._click_param_type_cache
 
     def _make_click_param_type(self):
+        import click
+
         cap_name = self.name.capitalize()
 
         def convert(self_, value, param, ctx):
@@ -115,6 +173,7 @@ class String(PropertyType):
 
     @property
     def click_param_type(self):
+        import click
 
         return click.STRING
 
@@ -148,6 +207,8 @@ class Bytes(PropertyType):
 
 class PythonLiteralParserBase(PropertyType):
     def parse(self, s):
+        import ast
+
         try:
             value = ast.literal_eval(s)
         except ValueError as exc:
@@ -177,6 +238,8 @@ class Bool(PropertyType):
 
     @property
     def click_param_type(self):
+        import click
+
         return click.BOOL
 
 
@@ -184,8 +247,17 @@ class Integer(PythonLiteralParserBase):
     name = "int"
     python_type = int
 
+    def parse_many(self, strings):
+        strings = list(strings)
+        values = _parse_numbers(strings, "int64")
+        if values is None:
+            return super().parse_many(strings)
+        return values
+
     @property
     def click_param_type(self):
+        import click
+
         return click.INT
 
 
@@ -193,24 +265,77 @@ class Float(PythonLiteralParserBase):
     name = "float"
     python_type = float
 
+    def parse_many(self, strings):
+        strings = list(strings)
+        values = _parse_numbers(strings, "float64")
+        if values is None:
+            return super().parse_many(strings)
+        return values
+
     @property
     def click_param_type(self):
+        import click
+
         return click.FLOAT
 
 
+def _parse_numbers(strings, dtype):
+    """Parse numeric strings at once with NumPy
+
+    NumPy is used only if the application imported it. Return ``None`` if it
+    isn't imported, or if NumPy may not parse the strings into the same values
+    as ``parse()``, so that the caller parses them one by one instead.
+    """
+    np = sys.modules.get("numpy")
+    if np is None or not strings:
+        return None
+
+    # NumPy accepts non-ASCII digits, which aren't Python literals
+    try:
+        if not "".join(strings).isascii():
+            return None
+    except TypeError:
+        return None
+
+    try:
+        array = np.array(strings, dtype=str)
+        values = array.astype(dtype)
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+    # NumPy also accepts integers with leading zeros, and floats without "."
+    # or exponent, "nan" and "inf"
+    if dtype == "int64":
+        digits = np.char.lstrip(np.char.strip(array), "+-")
+        if (np.char.startswith(digits, "0") & (np.char.str_len(digits) > 1)).any():
+            return None
+    elif dtype == "float64":
+        literal = (np.char.find(array, ".") >= 0) | (np.char.find(array, "e") >= 0)
+        literal |= np.char.find(array, "E") >= 0
+        if not (literal.all() and np.isfinite(values).all()):
+            return None
+
+    return values.tolist()
+
+
 class Tuple(PropertyType):
     name = "tuple"
     python_type = tuple
 
     def parse(self, s):
-        return tuple(json.load(s))
+        import json
+
+        return tuple(json.loads(s))
 
 
 class JsonParserBase(PropertyType):
     def parse(self, s):
-        value = json.load(s)
+        import json
+
+        value = json.loads(s)
         if not isinstance(value, self.python_type):
             raise ParseError("unable")
+        return value
 
 
 class List(JsonParserBase):
@@ -227,33 +352,232 @@ class Date(PropertyType):
     name = "date"
     python_type = dt.date
 
+    _iso_regex = None
+
     def parse(self, s):
-        return dt.datetime.strptime(s, "%Y-%m-%d").date()
+        # fromisoformat() accepts more formats since python 3.11, e.g.
+        # "20200102". It's only given the format all versions accept, so that
+        # the accepted strings don't depend on the python version.
+        if Date._iso_regex is None:
+            import re
+
+            Date._iso_regex = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+        if Date._iso_regex.fullmatch(s):
+            try:
+                return dt.date.fromisoformat(s)
+            except ValueError:
+                pass
+
+        # fromisoformat() doesn't accept months and days without zero padding
+        try:
+            return dt.datetime.strptime(s, "%Y-%m-%d").date()
+        except ValueError as exc:
+            raise ParseError(f"Unable to parse date string: {s!r}") from exc
 
 
 class DateTime(PropertyType):
     name = "datetime"
     python_type = dt.datetime
 
+    _iso_regex = None
+    _format_regex = None
+
     def parse(self, s):
-        formats = [
-            "%Y-%m-%dT%H:%M:%S%z",
-            "%Y-%m-%dT%H:%M%z",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d %H:%M",
-        ]
-        for fmt in formats:
+        # Like Date.parse(), fromisoformat() is only given the formats python
+        # versions before 3.11 accept too. Newer versions also accept e.g.
+        # "20200102T030405" and "+08" UTC offsets.
+        if DateTime._iso_regex is None:
+            import re
+
+            DateTime._iso_regex = re.compile(
+                r"[0-9]{4}-[0-9]{2}-[0-9]{2}"
+                r"(?:.[0-9]{2}(?::[0-9]{2}(?::[0-9]{2}(?:\.[0-9]{3}(?:[0-9]{3})?)?)?)?"
+                r"(?:[+-][0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]{6})?)?)?)?",
+                re.DOTALL,
+            )
+
+        if DateTime._iso_regex.fullmatch(s):
+            try:
+                return dt.datetime.fromisoformat(s)
+            except ValueError:
+                pass
+
+        # Formats fromisoformat() may not accept, e.g. "Z" and "+0800" UTC
+        # offsets or fields without zero padding. The regex picks the only
+        # strptime format that could match.
+        if DateTime._format_regex is None:
+            import re
+
+            DateTime._format_regex = re.compile(
+                r"\d{4}-\d{1,2}-\d{1,2}"
+                r"(?:(?P<t>T)\d{1,2}:\d{1,2}(?P<t_sec>:\d{1,2})?(?P<offset>\S+)?"
+                r"| \d{1,2}:\d{1,2}(?P<sec>:\d{1,2})?)"
+            )
+
+        match = DateTime._format_regex.fullmatch(s)
+        if match is not None:
+            if match["t"]:
+                fmt = "%Y-%m-%dT%H:%M"
+                fmt += ":%S" if match["t_sec"] else ""
+                fmt += "%z" if match["offset"] else ""
+            else:
+                fmt = "%Y-%m-%d %H:%M"
+                fmt += ":%S" if match["sec"] else ""
             try:
                 return dt.datetime.strptime(s, fmt)
-            except ValueError as e:
-                continue
+            except ValueError:
+                pass
 
         raise ParseError(f"Unable to parse datetime string: {s!r}")
 
 
-try:
+# Only built-in property types and the ones passed to `register()` or loaded
+# from entry points are looked up by python type. Other subclasses, e.g. the
+# ones created by `make_prop_type()`, are only used when given explicitly.
+for _prop_type_cls in (
+    String,
+    Bytes,
+    Bool,
+    Integer,
+    Float,
+    Tuple,
+    List,
+    Dict,
+    Date,
+    DateTime,
+):
+    _add(_prop_type_cls)
+del _prop_type_cls
+
+
+def register(prop_type_cls):
+    """Register a property type class for its ``python_type``
+
+    It replaces the property type registered for the same python type, and
+    applies to subclasses of the python type without property types of their
+    own. Can be used as a class decorator.
+
+    Third-party packages can register property types through the
+    ``confect.prop_types`` entry point group, which is loaded on the first
+    lookup of an unregistered python type.
+
+    Parameters
+    ----------
+    prop_type_cls : Type[PropertyType]
+        property type class with ``name`` and ``python_type``
+
+    Returns
+    -------
+    Type[PropertyType]
+        ``prop_type_cls``
+    """
+    if not _is_prop_type_cls(prop_type_cls):
+        raise TypeError(f"Not a PropertyType class: {prop_type_cls!r}")
+
+    _registry[prop_type_cls.python_type] = prop_type_cls
+    _resolved.clear()
+    return prop_type_cls
+
+
+def _lookup(python_type):
+    try:
+        return _resolved[python_type]
+    except KeyError:
+        pass
+
+    _define_imported_prop_types()
+    prop_type_cls = _find_registered(python_type)
+    if prop_type_cls is None and not _entry_points_loaded:
+        # Scanning entry points is slow, so it's left until a python type
+        # has no registered property type.
+        _load_entry_points()
+        prop_type_cls = _find_registered(python_type)
+    if prop_type_cls is None:
+        return None
+
+    prop_type = _resolved[python_type] = prop_type_cls()
+    return prop_type
+
+
+def _find_registered(python_type):
+    for base in getattr(python_type, "__mro__", (python_type,)):
+        prop_type_cls = _registry.get(base)
+        if prop_type_cls is not None:
+            return prop_type_cls
+    return None
+
+
+def _load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # python < 3.8
+        return
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        eps = eps.select(group=ENTRY_POINT_GROUP)
+    else:
+        eps = eps.get(ENTRY_POINT_GROUP, ())
+
+    for ep in eps:
+        try:
+            prop_type_cls = ep.load()
+        except Exception as exc:
+            import warnings
+
+            warnings.warn(f"Unable to load property type {ep.name!r}: {exc}")
+            continue
+
+        # Property types defined by third-party packages don't replace the
+        # registered ones.
+        if _is_prop_type_cls(prop_type_cls):
+            _add(prop_type_cls)
+
+
+
+def _define_decimal_prop_type():
+    global Decimal
+    import decimal
+
+    class Decimal(PropertyType):
+        """decimal.Decimal"""
+
+        name = "decimal"
+        python_type = decimal.Decimal
+
+        def parse(self, s):
+            try:
+                return decimal.Decimal(s)
+            except decimal.InvalidOperation as exc:
+                raise ParseError(f"Failed to parse decimal string: {s!r}") from exc
+
+    _add(Decimal)
+
+
+def _define_path_prop_type():
+    global Path
+    import pathlib
+
+    class Path(PropertyType):
+        """pathlib.Path"""
+
+        name = "path"
+        python_type = pathlib.Path
+
+        def parse(self, s):
+            return pathlib.Path(s)
+
+    _add(Path)
+
+
+def _define_pendulum_prop_types():
+    global DatePDL, DateTimePDL
     import pendulum as pdl
 
     class DatePDL(PropertyType):
@@ -274,18 +598,43 @@ try:
         def parse(self, s):
             return pdl.parse(s)
 
+    _add(DatePDL)
+    _add(DateTimePDL)
+
+
+# Property types of modules that confect doesn't import by itself, since they
+# are slow to import. Values of their types can only exist after the
+# application imported them.
+_lazy_prop_types = {
+    "decimal": (("Decimal",), _define_decimal_prop_type),
+    "pathlib": (("Path",), _define_path_prop_type),
+    "pendulum": (("DatePDL", "DateTimePDL"), _define_pendulum_prop_types),
+}
 
-except ModuleNotFoundError:
-    pass
+
+def _define_imported_prop_types():
+    for module_name in list(_lazy_prop_types):
+        if module_name in sys.modules:
+            _, define = _lazy_prop_types.pop(module_name)
+            define()
+
+
+def __getattr__(name):
+    for module_name, (names, define) in list(_lazy_prop_types.items()):
+        if name not in names:
+            continue
+        try:
+            define()
+        except ImportError:
+            break
+        del _lazy_prop_types[module_name]
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def of_value(value):
-    for prop_type_cls in PropertyType.all_prop_type_cls():
-        if type(value) == prop_type_cls.python_type:
-            return prop_type_cls()
+    return _lookup(type(value))
 
 
 def of_type(python_type):
-    for prop_type_cls in PropertyType.all_prop_type_cls():
-        if python_type == prop_type_cls.python_type:
-            return prop_type_cls()
+    return _lookup(python_type)
@@ -0,0 +1,169 @@
+"""Configuration values shared by pre-fork worker processes
+
+The master process evaluates configuration files and publishes the resolved
+values into a memory-mapped file, e.g. on ``/dev/shm``. Worker processes
+follow the file instead of evaluating the configuration files themselves.
+
+The file starts with a generation counter that works as a sequence lock. The
+publisher makes it odd while writing and even when done. Followers map the
+file into memory, so checking for a new generation reads the counter from
+shared pages without any system call. Values are unpickled only when the
+generation changes.
+
+.. code:: python
+
+   # master, e.g. in gunicorn's on_starting hook
+   conf.load_file('path/to/project_conf.py')
+   conf.publish('/dev/shm/projx.conf')
+   conf.watch(callback=lambda _: conf.publish('/dev/shm/projx.conf')).start()
+
+   # worker, e.g. in gunicorn's post_fork hook
+   follower = conf.follow('/dev/shm/projx.conf')
+
+   # worker, at the start of each request
+   follower.check()
+"""
+import mmap
+import os
+import pickle
+import struct
+import time
+
+__all__ = ["publish", "Follower"]
+
+_MAGIC = b"CFCTSHM\x01"
+# magic, sequence, payload length
+_HEADER = struct.Struct("<8sQQ")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 8
+
+# Attempts to read a consistent payload while the publisher writes it
+_READ_ATTEMPTS = 100
+
+
+def publish(conf, path):
+    """Publish the values of ``conf`` into the shared file ``path``
+
+    There should be only one publisher of a file. Values should be picklable.
+
+    Returns
+    -------
+    int
+        generation of the published values
+    """
+    payload = pickle.dumps(conf._values(), protocol=pickle.HIGHEST_PROTOCOL)
+    size = _HEADER.size + len(payload)
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        file_size = os.fstat(fd).st_size
+        if file_size < size:
+            # Never shrink the file, since followers may map all of it.
+            # Grow it twice as needed to remap less often.
+            file_size = max(size * 2, mmap.PAGESIZE)
+            os.ftruncate(fd, file_size)
+
+        with mmap.mmap(fd, file_size) as mm:
+            magic, sequence, _ = _HEADER.unpack_from(mm)
+            if magic != _MAGIC:
+                sequence = 0
+                _HEADER.pack_into(mm, 0, _MAGIC, sequence, 0)
+            # an odd sequence was left by a publisher that failed while writing
+            sequence += 1 + sequence % 2
+
+            _SEQUENCE.pack_into(mm, _SEQUENCE_OFFSET, sequence)
+            mm[_HEADER.size : size] = payload
+            _HEADER.pack_into(mm, 0, _MAGIC, sequence + 1, len(payload))
+    finally:
+        os.close(fd)
+
+    return (sequence + 1) // 2
+
+
+class Follower:
+    """Follow values published into a shared file
+
+    Create it with ``Conf.follow()``. The published values are loaded into
+    the Conf object as a layer of the highest precedence at creation, and
+    again by ``check()`` whenever a new generation is published.
+    """
+
+    def __init__(self, conf, path):
+        from confect.layer import Mapping
+
+        self._conf = conf
+        self.path = path
+        self._mmap = None
+        self._sequence = None
+        self._layer = Mapping({}, name=f"published:{path}")
+        self._map()
+
+        result = self._read()
+        if result is None:
+            raise TimeoutError(f"Published configuration is being written: {path}")
+        self._layer.values, self._sequence = result
+        conf.load_layers([self._layer])
+
+    @property
+    def generation(self):
+        """Generation of the loaded values"""
+        return self._sequence // 2
+
+    def check(self):
+        """Load the values if a new generation was published
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            new values of the changed properties
+        """
+        if _SEQUENCE.unpack_from(self._mmap, _SEQUENCE_OFFSET)[0] == self._sequence:
+            return {}
+
+        result = self._read()
+        if result is None:
+            # the publisher is still writing, try on the next check
+            return {}
+
+        self._layer.values, self._sequence = result
+        return self._conf.reload_layer(self._layer)
+
+    def close(self):
+        """Unmap the shared file
+
+        The file should be updated in place by ``publish()``. A follower
+        doesn't notice a file deleted and created again.
+        """
+        self._mmap.close()
+
+    def _map(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _read(self):
+        for _ in range(_READ_ATTEMPTS):
+            magic, sequence, length = _HEADER.unpack_from(self._mmap)
+            if magic != _MAGIC:
+                raise ValueError(f"Not a published configuration file: {self.path}")
+            if sequence % 2:
+                time.sleep(0.001)
+                continue
+
+            if _HEADER.size + length > len(self._mmap):
+                # the publisher grew the file
+                self._map()
+                continue
+
+            payload = self._mmap[_HEADER.size : _HEADER.size + length]
+            if _SEQUENCE.unpack_from(self._mmap, _SEQUENCE_OFFSET)[0] == sequence:
+                return pickle.loads(payload), sequence
+
+        return None
+
+    def __repr__(self):
+        return (
+            f"<{__name__}.{type(self).__qualname__} "
+            f"{self.path} generation={self.generation}>"
+        )
@@ -0,0 +1,91 @@
+"""Snapshot files of resolved configuration values
+
+A snapshot stores the values of all declared properties that differ from
+their defaults, along with a fingerprint of the declared schema and the
+content hashes of the loaded configuration files. Loading a snapshot skips
+evaluating those files, e.g. in production containers that get the snapshot
+from the build step.
+
+Snapshots are pickled. Only load snapshots you created yourself.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["dump", "load"]
+
+_MAGIC = b"CONFECT-SNAPSHOT\x01"
+
+
+def dump(conf, path):
+    """Write the resolved values of ``conf`` into snapshot file ``path``"""
+    sources = []
+    for layer in conf.loaded_layers():
+        for source_path in layer.source_paths():
+            sources.append((str(source_path), _file_digest(source_path)))
+
+    data = _MAGIC + pickle.dumps(
+        {
+            "schema": conf._schema_fingerprint(),
+            "sources": sources,
+            "values": conf._values(),
+        },
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def load(conf, path, *, check_sources=True):
+    """Load the values in snapshot file ``path`` into ``conf``
+
+    Return ``False`` without changing ``conf`` if the snapshot is missing,
+    broken, created with another schema or, when ``check_sources`` is set,
+    if any of its source files changed.
+    """
+    from confect.layer import Mapping
+
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        logger.info("Unable to read configuration snapshot %s", path)
+        return False
+
+    if not data.startswith(_MAGIC):
+        logger.warning("Invalid configuration snapshot %s", path)
+        return False
+
+    try:
+        snapshot = pickle.loads(data[len(_MAGIC) :])
+    except Exception:
+        logger.warning("Invalid configuration snapshot %s", path, exc_info=True)
+        return False
+
+    if snapshot["schema"] != conf._schema_fingerprint():
+        logger.info("Configuration snapshot %s has another schema", path)
+        return False
+
+    if check_sources:
+        for source_path, digest in snapshot["sources"]:
+            if _file_digest(source_path) != digest:
+                logger.info(
+                    "Source %s of configuration snapshot %s changed", source_path, path
+                )
+                return False
+
+    conf.load_layers([Mapping(snapshot["values"], name=f"snapshot:{path}")])
+    return True
+
+
+def _file_digest(path):
+    try:
+        return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
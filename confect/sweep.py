@@ -0,0 +1,177 @@
+"""Parameter sweeps over configuration properties
+
+A sweep creates read-only views of a Conf object, one for each variant of
+property values. Views are built like ``Conf.freeze()`` snapshots, but only
+the groups changed by a variant are copied. Other groups are shared with the
+snapshot of the Conf object, so memory grows with the number of variants and
+the size of changed groups rather than the size of the Conf.
+"""
+import itertools
+
+from confect.conf import (
+    _is_changed,
+    _make_frozen_conf,
+    _replace_frozen_groups,
+    _split_path,
+)
+
+__all__ = ["Sweep", "grid", "sample"]
+
+
+def grid(axes):
+    """Generate variants of all combinations of axis values
+
+    >>> list(grid({'db.port': [1, 2], 'db.host': ['a']}))
+    [{'db.port': 1, 'db.host': 'a'}, {'db.port': 2, 'db.host': 'a'}]
+
+    Parameters
+    ----------
+    axes : Mapping[str, Sequence[Any]]
+        values of each property path in ``'<group>.<prop>'`` format
+
+    Returns
+    -------
+    Iterator[Dict[str, Any]]
+        value of each property path
+    """
+    paths = list(axes)
+    for values in itertools.product(*(axes[path] for path in paths)):
+        yield dict(zip(paths, values))
+
+
+def sample(axes, samples, *, seed=None):
+    """Generate variants with randomly chosen axis values
+
+    Parameters
+    ----------
+    axes : Mapping[str, Union[Sequence[Any], Callable[[random.Random], Any]]]
+        values of each property path to choose from, or function that draws
+        a value with a ``random.Random`` instance, e.g.
+        ``lambda rng: rng.uniform(0.1, 1.0)``
+    samples : int
+        number of variants
+    seed : Optional[int]
+        seed of the random number generator
+
+    Returns
+    -------
+    Iterator[Dict[str, Any]]
+        value of each property path
+    """
+    import random
+
+    rng = random.Random(seed)
+    for _ in range(samples):
+        yield {
+            path: axis(rng) if callable(axis) else rng.choice(axis)
+            for path, axis in axes.items()
+        }
+
+
+class Sweep:
+    """Variants of a Conf object
+
+    Create it with ``Conf.sweep()``, or with variants of your own. Iterating
+    it yields a read-only view of each variant.
+
+    Parameters
+    ----------
+    conf : Conf
+        Conf object of the properties to sweep
+    variants : Iterable[Mapping[str, Any]]
+        value of each property path in ``'<group>.<prop>'`` format
+    """
+
+    def __init__(self, conf, variants):
+        self._conf = conf
+        self.variants = [dict(variant) for variant in variants]
+
+    def __len__(self):
+        return len(self.variants)
+
+    def __iter__(self):
+        base = self._conf.freeze()
+        for groups in self._iter_changed_groups(base):
+            yield _replace_frozen_groups(base, groups)
+
+    def map(self, func, *, max_workers=None, chunksize=1):
+        """Call ``func`` with the view of each variant in a process pool
+
+        Values of the Conf object are sent to each worker process once, and
+        each variant sends only the groups it changes. ``func``, its results
+        and property values should be picklable.
+
+        Parameters
+        ----------
+        func : Callable[[FrozenConf], Any]
+            function to call, e.g. a module-level function
+        max_workers : Optional[int]
+            number of worker processes
+        chunksize : int
+            number of variants sent to a worker at once
+
+        Returns
+        -------
+        List[Any]
+            results in the order of variants
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        base = self._conf.freeze()
+        base_groups = {name: base[name].as_dict() for name in base._group_names}
+        with ProcessPoolExecutor(
+            max_workers, initializer=_init_worker, initargs=(base_groups,)
+        ) as executor:
+            return list(
+                executor.map(
+                    _call_variant,
+                    itertools.repeat(func),
+                    self._iter_changed_groups(base),
+                    chunksize=chunksize,
+                )
+            )
+
+    def _iter_changed_groups(self, base):
+        conf = self._conf
+        derived_groups = [
+            (name, group) for name, group in conf._conf_groups.items() if group._derived
+        ]
+        for variant in self.variants:
+            with conf.mutate_locally():
+                changed = set()
+                for path, value in variant.items():
+                    group_name, prop_name = _split_path(path)
+                    conf[group_name][prop_name] = value
+                    changed.add(group_name)
+
+                # derived properties read properties changed by the variant
+                for group_name, group in derived_groups:
+                    base_group = base[group_name]
+                    if group_name not in changed and any(
+                        _is_changed(base_group[name], group[name])
+                        for name in group._derived
+                    ):
+                        changed.add(group_name)
+
+                groups = {
+                    group_name: conf[group_name].as_dict() for group_name in changed
+                }
+
+            # The caller resumes outside of the block, so it sees the values
+            # of the Conf object rather than the variant.
+            yield groups
+
+    def __repr__(self):
+        return f"<{__name__}.{type(self).__qualname__} variants={len(self)}>"
+
+
+_worker_base = None
+
+
+def _init_worker(base_groups):
+    global _worker_base
+    _worker_base = _make_frozen_conf(base_groups)
+
+
+def _call_variant(func, groups):
+    return func(_replace_frozen_groups(_worker_base, groups))
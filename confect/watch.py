@@ -0,0 +1,228 @@
+"""Hot reload of configuration files
+
+``Watcher`` checks the files of layers loaded into a Conf object, and reloads
+the layers whose files changed through ``Conf.reload_layer()``. It waits for
+changes with inotify on Linux, and falls back to polling elsewhere.
+"""
+import logging
+import os
+import select
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Watcher"]
+
+
+class Watcher:
+    """Reload changed configuration files of a Conf object
+
+    Create it with ``Conf.watch()``. Run it in a daemon thread with
+    ``start()``, or in an asyncio task with ``run()``.
+    """
+
+    def __init__(self, conf, *, interval=1.0, callback=None, use_inotify=None):
+        self._conf = conf
+        self.interval = interval
+        self.callback = callback
+        self._use_inotify = use_inotify
+        self._stats = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._snapshot_stats()
+
+    def _snapshot_stats(self):
+        for layer in self._conf.loaded_layers():
+            for path in layer.source_paths():
+                self._stats.setdefault(path, _stat(path))
+
+    def check(self):
+        """Reload the layers whose files changed since the last check
+
+        Errors on reloading a layer are logged, and the layer keeps its
+        values until the file changes again. Errors raised by the callback
+        are logged too, so they don't stop the watcher.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            new values of the changed properties
+        """
+        changes = {}
+        for layer in self._conf.loaded_layers():
+            changed = False
+            for path in layer.source_paths():
+                stat = _stat(path)
+                if path not in self._stats:
+                    # layer loaded after the last check
+                    self._stats[path] = stat
+                elif self._stats[path] != stat:
+                    self._stats[path] = stat
+                    changed = True
+
+            if not changed:
+                continue
+
+            try:
+                layer_changes = self._conf.reload_layer(layer)
+            except Exception:
+                logger.exception("Failed to reload configuration layer %r", layer)
+                continue
+
+            logger.info("Reloaded configuration layer %r", layer)
+            for group_name, props in layer_changes.items():
+                changes.setdefault(group_name, {}).update(props)
+
+        if changes and self.callback is not None:
+            try:
+                self.callback(changes)
+            except Exception:
+                logger.exception("Error in watcher callback %r", self.callback)
+        return changes
+
+    def start(self):
+        """Run the watcher in a daemon thread"""
+        if self._thread is not None:
+            raise RuntimeError("Watcher is already started")
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run_thread, name="confect-watcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the watcher thread or task"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run_thread(self):
+        inotify = self._open_inotify()
+        try:
+            while not self._stop_event.is_set():
+                if inotify is None:
+                    self._stop_event.wait(self.interval)
+                else:
+                    inotify.watch(self._watched_dirs())
+                    select.select([inotify], [], [], self.interval)
+                    inotify.drain()
+                if not self._stop_event.is_set():
+                    self.check()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    async def run(self):
+        """Run the watcher in the current asyncio task until ``stop()``"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        inotify = self._open_inotify()
+        changed = asyncio.Event()
+        self._stop_event.clear()
+        if inotify is not None:
+            loop.add_reader(inotify.fileno(), changed.set)
+
+        try:
+            while not self._stop_event.is_set():
+                if inotify is not None:
+                    inotify.watch(self._watched_dirs())
+                try:
+                    await asyncio.wait_for(changed.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                changed.clear()
+                if inotify is not None:
+                    inotify.drain()
+                if not self._stop_event.is_set():
+                    self.check()
+        finally:
+            if inotify is not None:
+                loop.remove_reader(inotify.fileno())
+                inotify.close()
+
+    def _open_inotify(self):
+        if self._use_inotify is False:
+            return None
+        inotify = _Inotify.open()
+        if inotify is None and self._use_inotify:
+            raise OSError("inotify is not available")
+        return inotify
+
+    def _watched_dirs(self):
+        # Watch directories rather than files, since editors and deployment
+        # tools often replace files instead of writing them in place.
+        return {os.path.dirname(os.path.abspath(path)) for path in self._stats}
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class _Inotify:
+    """Minimal inotify binding through ctypes"""
+
+    _IN_MODIFY = 0x00000002
+    _IN_ATTRIB = 0x00000004
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_DELETE = 0x00000200
+    _MASK = (
+        _IN_MODIFY
+        | _IN_ATTRIB
+        | _IN_CLOSE_WRITE
+        | _IN_MOVED_TO
+        | _IN_CREATE
+        | _IN_DELETE
+    )
+
+    def __init__(self, libc, fd):
+        self._libc = libc
+        self._fd = fd
+        self._dirs = set()
+
+    @classmethod
+    def open(cls):
+        if not sys.platform.startswith("linux"):
+            return None
+
+        try:
+            import ctypes
+
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+
+        if fd < 0:
+            return None
+        return cls(libc, fd)
+
+    def fileno(self):
+        return self._fd
+
+    def watch(self, dirs):
+        for dir_path in dirs - self._dirs:
+            if self._libc.inotify_add_watch(
+                self._fd, os.fsencode(dir_path), self._MASK
+            ) >= 0:
+                self._dirs.add(dir_path)
+
+    def drain(self):
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self._fd)
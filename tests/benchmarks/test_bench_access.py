@@ -0,0 +1,54 @@
+import pytest
+
+from confect import Conf
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+
+class PlainGroup:
+    def __init__(self):
+        self.host = '10.3.14.15'
+
+
+@pytest.fixture(scope='module')
+def db_conf():
+    conf = Conf()
+    conf.declare_group('db', host='10.3.14.15', port=3361)
+    return conf
+
+
+@pytest.mark.benchmark(group='access')
+def test_plain_attribute(benchmark):
+    group = PlainGroup()
+    benchmark(lambda: group.host)
+
+
+@pytest.mark.benchmark(group='access')
+def test_conf_access(benchmark, db_conf):
+    benchmark(lambda: db_conf.db.host)
+
+
+@pytest.mark.benchmark(group='access')
+def test_frozen_access(benchmark, db_conf):
+    frozen = db_conf.freeze()
+    benchmark(lambda: frozen.db.host)
+
+
+@pytest.mark.benchmark(group='access')
+def test_frozen_group_access(benchmark, db_conf):
+    db = db_conf.freeze().db
+    benchmark(lambda: db.host)
+
+
+@pytest.mark.benchmark(group='access')
+def test_getter_access(benchmark, db_conf):
+    get_host = db_conf.getter('db.host')
+    benchmark(get_host)
+
+
+@pytest.mark.benchmark(group='access')
+def test_instrumented_access(benchmark, db_conf):
+    with db_conf.instrument():
+        benchmark(lambda: db_conf.db.host)
@@ -0,0 +1,28 @@
+import datetime as dt
+
+import pytest
+
+from confect import Conf
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+N_PROPS = 10_000
+
+DEFAULTS = [1, 1.5, 'text', b'bytes', True, dt.date(2020, 1, 1)]
+
+
+def declare_props():
+    conf = Conf()
+    conf.declare_group(
+        'generated',
+        **{f'prop_{i}': DEFAULTS[i % len(DEFAULTS)] for i in range(N_PROPS)},
+    )
+    return conf
+
+
+@pytest.mark.benchmark(group='declare')
+def test_declare_props(benchmark):
+    conf = benchmark(declare_props)
+    assert len(conf.generated.as_dict()) == N_PROPS
@@ -0,0 +1,81 @@
+import sys
+
+import pytest
+
+from confect import Conf
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+N_GROUPS = 100
+N_PROPS = 100
+
+
+@pytest.fixture(scope='module')
+def big_conf_file(tmp_path_factory):
+    lines = ['from confect import c']
+    for i in range(N_GROUPS):
+        for j in range(N_PROPS):
+            lines.append(f'c.group{i}.prop{j} = {{"value": [{i}, {j}]}}')
+
+    path = tmp_path_factory.mktemp('conf') / 'big_conf.py'
+    path.write_text('\n'.join(lines))
+    return path
+
+
+@pytest.fixture
+def big_conf():
+    conf = Conf()
+    for i in range(N_GROUPS):
+        conf.declare_group(
+            f'group{i}', **{f'prop{j}': 0 for j in range(N_PROPS)})
+    return conf
+
+
+@pytest.mark.benchmark(group='load_file')
+def test_load_file_uncached(benchmark, big_conf, big_conf_file):
+    benchmark(big_conf.load_file, big_conf_file, cache=False)
+
+
+@pytest.mark.benchmark(group='load_file')
+def test_load_file_cached(benchmark, big_conf, big_conf_file, tmp_path,
+                          monkeypatch):
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+    big_conf.load_file(big_conf_file, cache_dir=tmp_path)
+    benchmark(big_conf.load_file, big_conf_file, cache_dir=tmp_path)
+
+
+@pytest.fixture
+def big_environ(monkeypatch):
+    for i in range(5000):
+        monkeypatch.setenv(f'OTHER_SERVICE_{i}_HOST', f'10.0.0.{i % 256}')
+    for i in range(N_GROUPS):
+        monkeypatch.setenv(f'projx__group{i}__prop0', '1')
+
+
+@pytest.mark.benchmark(group='load_envvars')
+@pytest.mark.parametrize('lazy', [False, True])
+def test_load_envvars_prefixes(benchmark, big_conf, big_environ, lazy):
+    benchmark(big_conf.load_envvars, 'projx', 'projx_team', 'projx_local',
+              lazy=lazy)
+
+
+@pytest.mark.benchmark(group='layers')
+def test_replace_small_layer(benchmark, big_conf):
+    from confect.layer import Mapping
+
+    big_conf.load_layers([
+        {f'group{i}': {f'prop{j}': 1 for j in range(N_PROPS)}
+         for i in range(N_GROUPS)}
+    ])
+    layer = Mapping({'group0': {f'prop{j}': 2 for j in range(10)}})
+    big_conf.load_layers([layer])
+
+    def replace():
+        nonlocal layer
+        new_layer = Mapping(dict(layer.values))
+        big_conf.replace_layer(layer, new_layer)
+        layer = new_layer
+
+    benchmark(replace)
@@ -0,0 +1,44 @@
+import pytest
+
+from confect import Conf
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope='module')
+def big_conf():
+    conf = Conf()
+    for i in range(100):
+        conf.declare_group(
+            f'group{i}', **{f'prop{j}': list(range(100)) for j in range(10)})
+    return conf
+
+
+@pytest.mark.benchmark(group='mutate_locally')
+def test_mutate_locally_one_write(benchmark, big_conf):
+    def mutate():
+        with big_conf.mutate_locally():
+            big_conf.group0.prop0 = []
+
+    benchmark(mutate)
+
+
+@pytest.mark.benchmark(group='mutate_locally_concurrent')
+@pytest.mark.parametrize('n_tasks', [10, 100, 1000])
+def test_mutate_locally_asyncio_tasks(benchmark, big_conf, n_tasks):
+    import asyncio
+
+    async def task(i):
+        with big_conf.mutate_locally():
+            big_conf.group0.prop0 = i
+            await asyncio.sleep(0)
+            for _ in range(10):
+                assert big_conf.group0.prop0 == i
+                big_conf.group1.prop1
+
+    async def main():
+        await asyncio.gather(*(task(i) for i in range(n_tasks)))
+
+    benchmark(lambda: asyncio.run(main()))
@@ -0,0 +1,57 @@
+import sys
+
+import pytest
+
+from confect import Conf, prop_type
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+DATETIME_STRINGS = [
+    '2020-01-02T03:04:05+08:00',
+    '2020-01-02T03:04Z',
+    '2020-01-02 03:04:05',
+    '2020-01-02 03:04',
+] * 250
+
+
+@pytest.mark.benchmark(group='parse')
+def test_parse_datetime(benchmark):
+    parse = prop_type.DateTime().parse
+    benchmark(lambda: [parse(s) for s in DATETIME_STRINGS])
+
+
+@pytest.mark.benchmark(group='parse')
+def test_parse_date(benchmark):
+    parse = prop_type.Date().parse
+    benchmark(lambda: [parse(s[:10]) for s in DATETIME_STRINGS])
+
+
+INT_STRINGS = [str(i) for i in range(10_000)]
+
+
+@pytest.mark.benchmark(group='parse_many')
+def test_parse_ints(benchmark):
+    parse = prop_type.Integer().parse
+    benchmark(lambda: [parse(s) for s in INT_STRINGS])
+
+
+@pytest.mark.benchmark(group='parse_many')
+def test_parse_many_ints(benchmark, monkeypatch):
+    monkeypatch.delitem(sys.modules, 'numpy', raising=False)
+    benchmark(prop_type.Integer().parse_many, INT_STRINGS)
+
+
+@pytest.mark.benchmark(group='parse_many')
+def test_parse_many_ints_numpy(benchmark):
+    pytest.importorskip('numpy')
+    benchmark(prop_type.Integer().parse_many, INT_STRINGS)
+
+
+@pytest.mark.benchmark(group='parse_many')
+def test_parse_props(benchmark):
+    conf = Conf()
+    conf.declare_group('sweep', **{f'p{i}': 0 for i in range(len(INT_STRINGS))})
+    strings = {f'sweep.p{i}': s for i, s in enumerate(INT_STRINGS)}
+    benchmark(conf.parse_props, strings)
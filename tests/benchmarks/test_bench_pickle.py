@@ -0,0 +1,54 @@
+import pickle
+
+import pytest
+
+from confect import Conf
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+N_GROUPS = 100
+N_PROPS = 100
+
+
+@pytest.fixture(scope='module')
+def big_conf():
+    conf = Conf()
+    for i in range(N_GROUPS):
+        conf.declare_group(
+            f'group_{i}', **{f'prop_{j}': f'default {j}' for j in range(N_PROPS)}
+        )
+    return conf
+
+
+@pytest.fixture(scope='module')
+def loaded_conf(big_conf):
+    conf = pickle.loads(pickle.dumps(big_conf))
+    with conf.mutate_globally():
+        for i in range(N_GROUPS):
+            for j in range(0, N_PROPS, 10):
+                conf[f'group_{i}'][f'prop_{j}'] = f'loaded {j}'
+    return conf
+
+
+@pytest.mark.benchmark(group='pickle')
+@pytest.mark.parametrize('name', ['big_conf', 'loaded_conf'])
+def test_pickle_conf(benchmark, request, name):
+    conf = request.getfixturevalue(name)
+    data = benchmark(pickle.dumps, conf)
+    benchmark.extra_info['bytes'] = len(data)
+
+
+@pytest.mark.benchmark(group='pickle')
+def test_pickle_frozen(benchmark, loaded_conf):
+    frozen = loaded_conf.freeze()
+    data = benchmark(pickle.dumps, frozen)
+    benchmark.extra_info['bytes'] = len(data)
+
+
+@pytest.mark.benchmark(group='unpickle')
+@pytest.mark.parametrize('name', ['big_conf', 'loaded_conf'])
+def test_unpickle_conf(benchmark, request, name):
+    data = pickle.dumps(request.getfixturevalue(name))
+    benchmark(pickle.loads, data)
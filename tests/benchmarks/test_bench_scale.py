@@ -0,0 +1,178 @@
+"""Hot paths of confect at 10, 1k and 100k properties
+
+Compare with the stored baselines, see "Benchmarks" in README.rst.
+"""
+import os
+
+import pytest
+
+from confect import Conf, prop_type
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = [10, 1_000, 100_000]
+PROPS_PER_GROUP = 100
+
+
+def rounds(size):
+    # slow cases get fewer rounds to keep the suite under a minute
+    return max(3, min(100, 100_000 // size))
+
+
+def group_sizes(size):
+    """Names and sizes of the groups holding ``size`` properties"""
+    for i, start in enumerate(range(0, size, PROPS_PER_GROUP)):
+        yield f'group{i}', min(PROPS_PER_GROUP, size - start)
+
+
+def declare(conf, size):
+    for group_name, n_props in group_sizes(size):
+        conf.declare_group(group_name, **{f'prop{j}': j for j in range(n_props)})
+    return conf
+
+
+_confs = {}
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f'{size}props')
+def size(request):
+    return request.param
+
+
+@pytest.fixture
+def sized_conf(size):
+    # declaring 100k properties is slow, so conf objects are shared by tests
+    # that don't change them
+    if size not in _confs:
+        _confs[size] = declare(Conf(), size)
+    return _confs[size]
+
+
+@pytest.mark.benchmark(group='scale_read')
+def test_read_property(benchmark, sized_conf):
+    benchmark(lambda: sized_conf.group0.prop0)
+
+
+@pytest.mark.benchmark(group='scale_mutate_locally')
+def test_mutate_locally(benchmark, sized_conf):
+    def mutate():
+        with sized_conf.mutate_locally():
+            sized_conf.group0.prop0 = -1
+
+    benchmark(mutate)
+
+
+@pytest.mark.benchmark(group='scale_declare')
+def test_declare_group(benchmark, size):
+    benchmark.pedantic(
+        declare, setup=lambda: ((Conf(), size), {}), rounds=rounds(size)
+    )
+
+
+@pytest.fixture
+def sized_conf_file(size, tmp_path):
+    lines = ['from confect import c']
+    for group_name, n_props in group_sizes(size):
+        lines.extend(f'c.{group_name}.prop{j} = {j + 1}' for j in range(n_props))
+    path = tmp_path / 'conf.py'
+    path.write_text('\n'.join(lines))
+    return path
+
+
+@pytest.mark.benchmark(group='scale_load_file')
+def test_load_file(benchmark, size, sized_conf_file, tmp_path):
+    def setup():
+        return (declare(Conf(), size), sized_conf_file), {'cache_dir': tmp_path}
+
+    benchmark.pedantic(
+        lambda conf, path, cache_dir: conf.load_file(path, cache_dir=cache_dir),
+        setup=setup,
+        rounds=rounds(size),
+    )
+
+
+@pytest.fixture
+def sized_environ(size, monkeypatch):
+    # Setting 100k variables in the real environment takes minutes, since
+    # each setenv() scans the environment. Lookups in a dict are a bit faster
+    # than in os.environ.
+    environ = dict(os.environ)
+    # unrelated variables of a big deployment
+    for i in range(10_000):
+        environ[f'OTHER_SERVICE_{i}_HOST'] = f'10.0.{i // 256}.{i % 256}'
+    for group_name, n_props in group_sizes(size):
+        for j in range(n_props):
+            environ[f'projx__{group_name}__prop{j}'] = str(j + 1)
+    monkeypatch.setattr(os, 'environ', environ)
+
+
+@pytest.mark.benchmark(group='scale_load_envvars')
+def test_load_envvars(benchmark, size, sized_environ):
+    benchmark.pedantic(
+        lambda conf: conf.load_envvars('projx'),
+        setup=lambda: ((declare(Conf(), size),), {}),
+        rounds=rounds(size),
+    )
+
+
+@pytest.mark.benchmark(group='scale_click_options')
+def test_click_options(benchmark, size, sized_conf):
+    click = pytest.importorskip('click')
+
+    def build():
+        def cli():
+            pass
+
+        return click.command()(sized_conf.click_options(cli))
+
+    benchmark.pedantic(build, rounds=rounds(size))
+
+
+@pytest.mark.benchmark(group='scale_click_invoke')
+@pytest.mark.parametrize('lazy', [False, True], ids=['click_options', 'click_command'])
+def test_click_invoke(benchmark, size, sized_conf, lazy):
+    click = pytest.importorskip('click')
+
+    def cli():
+        pass
+
+    if lazy:
+        cmd = sized_conf.click_command()(cli)
+    else:
+        cmd = click.command()(sized_conf.click_options(cli))
+    args = ['--group0-prop1', '2']
+    benchmark.pedantic(
+        lambda: cmd.main(args, standalone_mode=False), rounds=rounds(size)
+    )
+
+
+PARSE_STRINGS = {
+    'String': 'some string',
+    'Bytes': 'some bytes',
+    'Bool': 'true',
+    'Integer': '42',
+    'Float': '3.14',
+    'Tuple': '[1, 2]',
+    'List': '[1, 2]',
+    'Dict': '{"a": 1}',
+    'Date': '2020-01-02',
+    'DateTime': '2020-01-02T03:04:05+08:00',
+    'Decimal': '3.14',
+    'Path': '/etc/projx',
+    'DatePDL': '2020-01-02',
+    'DateTimePDL': '2020-01-02T03:04:05+08:00',
+}
+
+
+@pytest.mark.benchmark(group='scale_parse')
+@pytest.mark.parametrize('type_name', list(PARSE_STRINGS))
+def test_parse(benchmark, size, type_name):
+    if type_name.endswith('PDL'):
+        pytest.importorskip('pendulum')
+    parse = getattr(prop_type, type_name)().parse
+    strings = [PARSE_STRINGS[type_name]] * size
+    benchmark.pedantic(
+        lambda: [parse(string) for string in strings], rounds=rounds(size)
+    )
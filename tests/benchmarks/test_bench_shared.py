@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from confect import Conf
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture
+def published(tmp_path):
+    path = str(tmp_path / 'conf.shm')
+    conf = Conf()
+    conf.declare_group('db', **{f'prop_{i}': i for i in range(1000)})
+    with conf.mutate_globally():
+        conf.db.prop_0 = -1
+    conf.publish(path)
+    return conf, path
+
+
+@pytest.mark.benchmark(group='shared')
+def test_follower_check(benchmark, published):
+    conf, path = published
+    follower = conf.follow(path)
+    benchmark(follower.check)
+
+
+@pytest.mark.benchmark(group='shared')
+def test_stat_check(benchmark, published):
+    # what polling a configuration file costs on each check
+    _, path = published
+    benchmark(os.stat, path)
+
+
+@pytest.mark.benchmark(group='shared')
+def test_follower_check_new_generation(benchmark, published):
+    conf, path = published
+    follower = conf.follow(path)
+
+    def publish_and_check():
+        conf.publish(path)
+        follower.check()
+
+    benchmark(publish_and_check)
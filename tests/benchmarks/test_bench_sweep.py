@@ -0,0 +1,40 @@
+import copy
+
+import pytest
+
+from confect import Conf
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+N_GROUPS = 20
+N_PROPS = 50
+AXES = {'group_0.prop_0': list(range(5)), 'group_1.prop_0': list(range(4))}
+
+
+@pytest.fixture(scope='module')
+def big_conf():
+    conf = Conf()
+    for i in range(N_GROUPS):
+        conf.declare_group(f'group_{i}', **{f'prop_{j}': j for j in range(N_PROPS)})
+    return conf
+
+
+@pytest.mark.benchmark(group='sweep')
+def test_deepcopy_variants(benchmark, big_conf):
+    def variants():
+        for variant in big_conf.sweep(AXES).variants:
+            conf = copy.deepcopy(big_conf)
+            with conf.mutate_globally():
+                for path, value in variant.items():
+                    group_name, prop_name = path.split('.')
+                    conf[group_name][prop_name] = value
+            yield conf
+
+    benchmark(lambda: list(variants()))
+
+
+@pytest.mark.benchmark(group='sweep')
+def test_sweep_views(benchmark, big_conf):
+    benchmark(lambda: list(big_conf.sweep(AXES)))
@@ -0,0 +1,54 @@
+import copy
+
+import pytest
+
+from confect import Conf
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+N_GROUPS = 100
+N_PROPS = 100
+
+
+@pytest.fixture(scope='module')
+def big_conf():
+    conf = Conf()
+    for i in range(N_GROUPS):
+        conf.declare_group(
+            f'group_{i}', **{f'prop_{j}': f'default {j}' for j in range(N_PROPS)}
+        )
+    conf.load_layers(
+        [
+            {
+                f'group_{i}': {f'prop_{j}': f'loaded {j}' for j in range(N_PROPS)}
+                for i in range(N_GROUPS)
+            }
+        ]
+    )
+    return conf
+
+
+def reload_one_prop(conf, n):
+    with conf.mutate_globally():
+        conf.group_0.prop_0 = n
+
+
+@pytest.mark.benchmark(group='versions')
+def test_commit_version(benchmark, big_conf):
+    counter = iter(range(10 ** 9))
+    benchmark(lambda: reload_one_prop(big_conf, next(counter)))
+
+
+@pytest.mark.benchmark(group='versions')
+def test_rollback(benchmark, big_conf):
+    reload_one_prop(big_conf, -1)
+    # undo the last change, alternating between two values
+    benchmark(lambda: big_conf.rollback(big_conf.versions()[-2]))
+
+
+@pytest.mark.benchmark(group='versions')
+def test_deepcopy_backup(benchmark, big_conf):
+    # keeping an old state by copying the whole Conf, for comparison
+    benchmark(copy.deepcopy, big_conf)
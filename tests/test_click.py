@@ -95,3 +95,125 @@ def test_other_types(conf, click_runner):
     assert conf.yummy.some_day == dt.date(2018, 8, 3)
     assert conf.yummy.some_time == pdl.datetime(
         2018, 8, 3, 3, 3, tz='Asia/Taipei')
+
+
+def test_click_options_of_groups(conf, click_runner):
+    @click.command()
+    @conf.click_options(groups=['dummy'])
+    def cli():
+        click.echo(f'dummy.x = {conf.dummy.x}')
+
+    result = click_runner.invoke(cli, ['--help'])
+    assert '--dummy-x' in result.output
+    assert '--yummy-name' not in result.output
+
+    result = click_runner.invoke(cli, ['--dummy-x', '5'])
+    assert result.output == 'dummy.x = 5\n'
+
+
+def test_click_command_help(conf, click_runner):
+    @conf.click_command(groups=['dummy'])
+    def cli():
+        return
+
+    result = click_runner.invoke(cli, ['--help'])
+    assert result.output == ('''Usage: cli [OPTIONS]
+
+Options:
+  --dummy-x INTEGER       [default: 3]
+  --dummy-y TEXT          [default: some string]
+  --set GROUP.PROP=VALUE  Set a configuration property, parsed from a string.
+  --help                  Show this message and exit.
+''')
+
+
+def test_click_command(conf, click_runner):
+    @conf.click_command()
+    def cli():
+        click.echo(f'yummy.rank = {conf.yummy.rank}')
+        click.echo(f'yummy.color = {conf.yummy.color}')
+        click.echo(f'dummy.x = {conf.dummy.x}')
+
+    result = click_runner.invoke(
+        cli, ['--yummy-rank=4', '--set', 'yummy.color=blue', '--set', 'dummy.x=7'],
+        catch_exceptions=False)
+    assert result.output == ('yummy.rank = 4\n'
+                             'yummy.color = Color.BLUE\n'
+                             'dummy.x = 7\n')
+
+    # only options of the given properties are created
+    assert list(cli.conf_options._options) == [('yummy', 'rank')]
+    [layer] = conf.loaded_layers()
+    assert layer.name == 'mapping:cli'
+    assert conf.provenance('yummy.rank') is layer
+    assert conf.provenance('dummy.x') is layer
+
+
+def test_click_command_replaces_layer(conf, click_runner):
+    @conf.click_command()
+    def cli():
+        return
+
+    conf.load_layers([{'dummy': {'x': 5}}])
+    click_runner.invoke(cli, ['--dummy-x', '6'])
+    assert conf.dummy.x == 6
+    click_runner.invoke(cli, ['--dummy-y', 'other'])
+    assert (conf.dummy.x, conf.dummy.y) == (5, 'other')
+    click_runner.invoke(cli, [])
+    assert (conf.dummy.x, conf.dummy.y) == (5, 'some string')
+    assert len(conf.loaded_layers()) == 1
+
+
+@pytest.mark.parametrize('args, error', [
+    (['--set', 'dummy.x'], "'dummy.x' is not in GROUP.PROP=VALUE form"),
+    (['--set', 'dummy.x=abc'], 'dummy.x: '),
+    (['--set', 'dummy.z=1'], 'dummy.z: '),
+    (['--yummy-name', 'octopus'], "No such option '--yummy-name'"),
+])
+def test_click_command_errors(conf, click_runner, args, error):
+    @conf.click_command(groups=['dummy'])
+    def cli():
+        return
+
+    result = click_runner.invoke(cli, args)
+    assert result.exit_code == 2
+    assert error in result.output
+    assert conf.loaded_layers() == []
+
+
+def test_click_command_set_errors(conf, click_runner):
+    @conf.click_command(groups=['dummy'])
+    def cli():
+        return
+
+    result = click_runner.invoke(
+        cli, ['--set', 'dummy.x=abc', '--set', 'dummy.y=ok', '--set', 'dummy.z=1'])
+    assert result.exit_code == 2
+    assert 'dummy.x: ' in result.output
+    assert 'dummy.z: ' in result.output
+    assert 'dummy.y' not in result.output
+
+
+def test_click_command_groups_per_subcommand(conf, click_runner):
+    @click.group()
+    def cli():
+        return
+
+    @conf.click_command(groups=['yummy'], set_option=False)
+    def sell():
+        click.echo(f'yummy.sold = {conf.yummy.sold}')
+
+    @conf.click_command(groups=['dummy'], set_option=False)
+    def show():
+        click.echo(f'dummy.x = {conf.dummy.x}')
+
+    cli.add_command(sell)
+    cli.add_command(show)
+
+    result = click_runner.invoke(cli, ['sell', '--yummy-sold', 'false'])
+    assert result.output == 'yummy.sold = False\n'
+    result = click_runner.invoke(cli, ['show', '--dummy-x', '1'])
+    assert result.output == 'dummy.x = 1\n'
+    result = click_runner.invoke(cli, ['show', '--yummy-sold', 'true'])
+    assert result.exit_code == 2
+    assert '--set' not in click_runner.invoke(cli, ['show', '--help']).output
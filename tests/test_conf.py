@@ -2,7 +2,7 @@
 import pytest
 
 from confect import (Conf, FrozenConfGroupError, FrozenConfPropError,
-                     UnknownConfError)
+                     ParameterError, UnknownConfError)
 
 
 def test_declare_group():
@@ -65,3 +65,185 @@ def test_setitem(conf):
 
     with pytest.raises(FrozenConfGroupError):
         conf['dummy'] = {'x': 5}
+
+
+def test_freeze(conf):
+    frozen = conf.freeze()
+    assert frozen.dummy.x == 3
+    assert frozen['dummy']['y'] == 'some string'
+    assert 'dummy' in frozen
+    assert 'x' in frozen.dummy
+    assert frozen.dummy.as_dict() == {'x': 3, 'y': 'some string'}
+
+    with pytest.raises(FrozenConfPropError):
+        frozen.dummy.x = 5
+
+    with pytest.raises(FrozenConfPropError):
+        frozen['dummy'] = {'x': 5}
+
+    with pytest.raises(AttributeError):
+        frozen.dummy.some_prop
+
+    with pytest.raises(UnknownConfError):
+        frozen.dummy['some_prop']
+
+    with pytest.raises(UnknownConfError):
+        frozen['unknown_group']
+
+    with conf.mutate_locally():
+        conf.dummy.x = 5
+        assert conf.freeze().dummy.x == 5
+    assert frozen.dummy.x == 3
+
+
+@pytest.mark.parametrize('name', ['not-identifier', '_name', '_prop_names',
+                                  'as_dict', '__private'])
+def test_freeze_invalid_prop_name(name):
+    conf = Conf()
+    conf.declare_group('dummy', **{name: 1})
+    with pytest.raises(ParameterError, match='can.t be frozen'):
+        conf.freeze()
+
+
+@pytest.mark.parametrize('name', ['getter', '_group_names', 'not-identifier'])
+def test_freeze_invalid_group_name(name):
+    conf = Conf()
+    conf.declare_group(name, x=1)
+    with pytest.raises(ParameterError, match='can.t be frozen'):
+        conf.freeze()
+
+
+def test_getter(conf):
+    get_x = conf.getter('dummy.x')
+    assert get_x() == 3
+    with conf.mutate_locally():
+        conf.dummy.x = 5
+        assert get_x() == 5
+    assert get_x() == 3
+
+    assert conf.freeze().getter('dummy.x')() == 3
+
+    with pytest.raises(ParameterError):
+        conf.getter('dummy')
+
+    with pytest.raises(UnknownConfError):
+        conf.getter('dummy.some_prop')
+
+
+def test_mutate_locally_nested(conf):
+    with conf.mutate_locally():
+        conf.dummy.x = 5
+        with conf.mutate_locally():
+            conf.dummy.x = 6
+            conf.dummy.y = 'other string'
+            assert conf.dummy.x == 6
+        assert conf.dummy.x == 5
+        assert conf.dummy.y == 'some string'
+        conf.dummy.x = 7
+    assert conf.dummy.x == 3
+
+    with pytest.raises(FrozenConfPropError):
+        conf.dummy.x = 5
+
+
+def test_mutate_locally_exception(conf):
+    with pytest.raises(RuntimeError):
+        with conf.mutate_locally():
+            conf.dummy.x = 5
+            raise RuntimeError
+
+    assert conf.dummy.x == 3
+    with pytest.raises(FrozenConfPropError):
+        conf.dummy.x = 5
+
+
+def test_mutate_locally_declare_group(conf):
+    with conf.mutate_locally():
+        conf.declare_group('local', z=1)
+        conf.local.z = 2
+        assert conf.local.z == 2
+        conf.dummy.x = 5
+        assert conf.dummy.x == 5
+
+    assert conf.local.z == 1
+    assert conf.dummy.x == 3
+
+
+def test_mutate_locally_records_writes_only(conf):
+    with conf.mutate_locally():
+        conf.dummy.x = 5
+        conf.dummy.x = 6
+        assert conf._local_overrides.get() == {'dummy': {'x': 6}}
+    assert conf._local_overrides.get() is None
+
+
+def test_mutate_locally_threads(conf):
+    import threading
+
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def worker(x):
+        with conf.mutate_locally():
+            conf.dummy.x = x
+            barrier.wait()
+            results[x] = conf.dummy.x
+            barrier.wait()
+        results[x, 'after'] = conf.dummy.x
+
+    threads = [threading.Thread(target=worker, args=(x,)) for x in (5, 6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {5: 5, 6: 6, (5, 'after'): 3, (6, 'after'): 3}
+
+    with pytest.raises(FrozenConfPropError):
+        conf.dummy.x = 5
+
+
+def test_mutate_locally_asyncio(conf):
+    import asyncio
+
+    async def task(x):
+        with conf.mutate_locally():
+            conf.dummy.x = x
+            await asyncio.sleep(0)
+            return conf.dummy.x, conf.freeze().dummy.x, conf.getter('dummy.x')()
+
+    async def main():
+        return await asyncio.gather(*(task(x) for x in range(10)))
+
+    assert asyncio.run(main()) == [(x, x, x) for x in range(10)]
+    assert conf.dummy.x == 3
+
+
+def test_mutate_locally_asyncio_children(conf):
+    import asyncio
+
+    async def child(x):
+        conf.dummy.x = x
+        await asyncio.sleep(0)
+        return conf.dummy.x, conf.dummy.y
+
+    async def main():
+        with conf.mutate_locally():
+            conf.dummy.y = 'parent'
+            results = await asyncio.gather(child(5), child(6))
+            return results, conf.dummy.x, conf.dummy.y
+
+    assert asyncio.run(main()) == ([(5, 'parent'), (6, 'parent')], 3, 'parent')
+    assert conf.dummy.x == 3
+
+
+def test_deepcopy():
+    import copy
+
+    conf = Conf()
+    conf.declare_group('dummy', x=3)
+    conf_copy = copy.deepcopy(conf)
+    with conf_copy.mutate_globally():
+        conf_copy.dummy.x = 4
+    assert conf_copy.dummy.x == 4
+    assert conf.dummy.x == 3
@@ -0,0 +1,79 @@
+import pytest
+
+import confect
+from confect import Conf, FrozenConfPropError
+
+
+@pytest.fixture
+def url_calls():
+    return []
+
+
+@pytest.fixture
+def conf(url_calls):
+    conf = Conf()
+
+    def url(conf):
+        url_calls.append(1)
+        return f'mysql://{conf.db.host}:{conf.db.port}'
+
+    with conf.declare_group('db') as db:
+        db.host = '10.3.14.15'
+        db.port = 3361
+        db.name = 'projx'
+        db.url = confect.derived(url)
+        db.full_url = confect.derived(
+            lambda conf: f"{conf['db']['url']}/{conf.db.name}")
+
+    return conf
+
+
+def test_derived(conf, url_calls):
+    assert conf.db.url == 'mysql://10.3.14.15:3361'
+    assert conf.db.url == 'mysql://10.3.14.15:3361'
+    assert len(url_calls) == 1
+    assert conf.db.full_url == 'mysql://10.3.14.15:3361/projx'
+    assert conf.getter('db.url')() == 'mysql://10.3.14.15:3361'
+    assert conf.freeze().db.url == 'mysql://10.3.14.15:3361'
+    assert len(url_calls) == 1
+
+    with pytest.raises(FrozenConfPropError):
+        conf.db.url = 'mysql://localhost'
+
+
+def test_derived_invalidation(conf, url_calls):
+    assert conf.db.full_url == 'mysql://10.3.14.15:3361/projx'
+
+    conf.load_layers([{'db': {'name': 'other'}}])
+    assert conf.db.url == 'mysql://10.3.14.15:3361'
+    assert len(url_calls) == 1
+    assert conf.db.full_url == 'mysql://10.3.14.15:3361/other'
+
+    conf.load_layers([{'db': {'port': 3362}}])
+    assert conf.db.full_url == 'mysql://10.3.14.15:3362/other'
+    assert conf.db.url == 'mysql://10.3.14.15:3362'
+    assert len(url_calls) == 2
+
+
+def test_derived_mutate_locally(conf, url_calls):
+    assert conf.db.url == 'mysql://10.3.14.15:3361'
+
+    with conf.mutate_locally():
+        conf.db.name = 'other'
+        assert conf.db.url == 'mysql://10.3.14.15:3361'
+        assert len(url_calls) == 1
+
+        conf.db.port = 3362
+        assert conf.db.url == 'mysql://10.3.14.15:3362'
+        assert conf.db.full_url == 'mysql://10.3.14.15:3362/other'
+        assert conf.db.url == 'mysql://10.3.14.15:3362'
+        assert len(url_calls) == 2
+
+        with conf.mutate_locally():
+            conf.db.host = 'localhost'
+            assert conf.db.full_url == 'mysql://localhost:3362/other'
+
+        assert conf.db.url == 'mysql://10.3.14.15:3362'
+
+    assert conf.db.url == 'mysql://10.3.14.15:3361'
+    assert conf.db.full_url == 'mysql://10.3.14.15:3361/projx'
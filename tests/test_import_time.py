@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative `import confect` time in microseconds, excluding the interpreter
+# startup. Eager imports of click and pendulum alone used to take ~60ms.
+IMPORT_TIME_BUDGET_US = 30_000
+
+HEAVY_MODULES = [
+    "ast",
+    "click",
+    "confect.layer",
+    "copy",
+    "json",
+    "logging",
+    "pathlib",
+    "pendulum",
+    "threading",
+    "typing",
+]
+
+
+def run_python(code, tmp_path, *options):
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(tmp_path))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time_us(tmp_path):
+    stderr = run_python("import confect", tmp_path, "-X", "importtime").stderr
+    for line in stderr.splitlines():
+        _, _, times = line.partition(":")
+        self_us, cumulative_us, name = times.split("|")
+        if name.strip() == "confect":
+            return int(cumulative_us)
+    raise AssertionError(f"confect not found in import time report:\n{stderr}")
+
+
+def test_no_heavy_imports(tmp_path):
+    code = (
+        "import sys, confect\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    assert run_python(code, tmp_path).stdout.strip() == ""
+
+
+def test_import_time_budget(tmp_path):
+    run_python("import confect", tmp_path)  # warm up bytecode cache
+    best_us = min(import_time_us(tmp_path) for _ in range(5))
+    assert best_us < IMPORT_TIME_BUDGET_US
+
+
+def test_lazy_attributes():
+    import confect
+
+    assert confect.layer.File is not None
+    with pytest.raises(AttributeError):
+        confect.no_such_attribute
+
+
+def test_pendulum_prop_types():
+    pdl = pytest.importorskip("pendulum")
+    import confect
+
+    value = pdl.datetime(2020, 1, 1)
+    assert confect.prop_type.of_value(value) == confect.prop_type.DateTimePDL()
+    assert confect.prop_type.of_type(pdl.Date) == confect.prop_type.DatePDL()
+
+
+def test_star_import():
+    namespace = {}
+    exec("from confect import *", namespace)
+    assert namespace["derived"] is __import__("confect").derived
@@ -0,0 +1,95 @@
+import copy
+
+import pytest
+
+import confect
+from confect import Conf
+from confect.conf import ConfGroup
+
+
+@pytest.fixture
+def conf():
+    conf = Conf()
+    with conf.declare_group('db') as db:
+        db.host = '10.3.14.15'
+        db.port = 3306
+        db.url = confect.derived(lambda conf: f'{conf.db.host}:{conf.db.port}')
+    conf.declare_group('cache', expire=60)
+    return conf
+
+
+def test_count_reads(conf):
+    counter = conf.instrument()
+    for _ in range(3):
+        conf.db.host
+    conf.cache['expire']
+    with conf.mutate_locally():
+        conf.cache.expire = 1
+        assert conf.cache.expire == 1
+    counter.stop()
+    conf.db.host
+
+    assert counter.counts == {('db', 'host'): 3, ('cache', 'expire'): 2}
+    assert counter.hot(1) == [('db.host', 3)]
+    assert counter.unread() == ['db.port', 'db.url']
+    assert type(conf.db) is ConfGroup
+
+
+def test_derived_and_getter(conf):
+    get_port = conf.getter('db.port')
+    with conf.instrument() as counter:
+        get_port()
+        conf.getter('db.port')()
+        conf.db.url
+        conf.freeze()
+        conf.declare_group('late', flag=True)
+        conf.late.flag
+    assert counter.counts == {
+        ('db', 'port'): 2,
+        ('db', 'url'): 1,
+        ('db', 'host'): 1,
+        ('late', 'flag'): 1,
+    }
+    assert type(conf.late) is ConfGroup
+
+
+def test_getter_after_stop(conf):
+    with conf.instrument() as counter:
+        get_port = conf.getter('db.port')
+        get_port()
+    assert get_port() == 3306
+    assert counter.counts == {('db', 'port'): 1}
+
+
+def test_call_sites(conf):
+    with conf.instrument(call_sites=True) as counter:
+        conf.db.host
+        conf.db.host
+    filename, lineno = counter.call_sites[('db', 'host')].rsplit(':', 1)
+    assert filename == __file__
+    assert counter.report().splitlines()[:2] == [
+        'Most read configuration properties:',
+        f'           2  db.host  (first read at {filename}:{lineno})',
+    ]
+
+
+def test_prometheus(conf):
+    with conf.instrument() as counter:
+        conf.db.port
+    assert counter.to_prometheus().splitlines() == [
+        '# HELP confect_property_reads_total Reads of configuration properties.',
+        '# TYPE confect_property_reads_total counter',
+        'confect_property_reads_total{group="db",prop="host"} 0',
+        'confect_property_reads_total{group="db",prop="port"} 1',
+        'confect_property_reads_total{group="db",prop="url"} 0',
+        'confect_property_reads_total{group="cache",prop="expire"} 0',
+    ]
+
+
+def test_single_counter(conf):
+    with conf.instrument():
+        with pytest.raises(RuntimeError):
+            conf.instrument()
+        conf_copy = copy.deepcopy(conf)
+        assert type(conf_copy.db) is ConfGroup
+        conf_copy.db.host
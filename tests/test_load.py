@@ -123,3 +123,154 @@ def test_declare_group_after_load_conf(conf1_file):
 
     with pytest.raises(FrozenConfPropError):
         conf.dummy.x = 5
+
+
+def test_load_file_merges_eagerly(conf, conf1_file, conf2_file):
+    conf.load_file(conf1_file)
+    conf.load_file(conf2_file)
+    assert conf.undeclared_props() == {}
+    assert 'dummy' not in conf._conf_depot
+    assert conf.dummy.x == 6
+    assert conf.yummy.name == 'octopus'
+
+
+def test_undeclared_props(conf1_file, conf2_file):
+    conf = Conf()
+    conf.load_file(conf1_file)
+    conf.load_file(conf2_file)
+    assert conf.undeclared_props() == {'dummy': ['x', 'y'], 'yummy': ['name']}
+
+    with conf.declare_group('dummy') as g:
+        g.x = 3
+    assert conf.dummy.x == 6
+    assert conf.undeclared_props() == {'dummy': ['y'], 'yummy': ['name']}
+
+    with conf.declare_group('yummy') as g:
+        g.name = 'fish'
+    assert conf.yummy.name == 'octopus'
+    assert conf.undeclared_props() == {'dummy': ['y']}
+
+
+@pytest.fixture
+def write_bytecode(monkeypatch):
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+
+
+def test_load_file_cache(conf, tmp_path, write_bytecode):
+    from confect.code_cache import cache_path
+
+    conf_file = tmp_path / 'conf.py'
+    conf_file.write_text('from confect import c\nc.dummy.x = 5\n')
+    conf.load_file(conf_file)
+    assert conf.dummy.x == 5
+    assert cache_path(conf_file) == (
+        tmp_path / '__pycache__' /
+        f'conf.py.confect-{sys.implementation.cache_tag}.pyc')
+    assert cache_path(conf_file).exists()
+
+    # cache file is reused, even after the file is touched
+    conf_file.touch()
+    conf.load_file(conf_file)
+    assert conf.dummy.x == 5
+
+    conf_file.write_text('from confect import c\nc.dummy.x = 6\n')
+    conf.load_file(conf_file)
+    assert conf.dummy.x == 6
+
+    # broken cache file is ignored
+    cache_path(conf_file).write_bytes(b'broken')
+    conf.load_file(conf_file)
+    assert conf.dummy.x == 6
+
+
+def test_load_file_cache_dir(conf, tmp_path, write_bytecode):
+    from confect.code_cache import cache_path
+
+    conf_file = tmp_path / 'src' / 'conf.py'
+    conf_file.parent.mkdir()
+    conf_file.write_text('from confect import c\nc.dummy.x = 5\n')
+    cache_dir = tmp_path / 'cache'
+
+    conf.load_file(conf_file, cache_dir=cache_dir)
+    assert conf.dummy.x == 5
+    assert cache_path(conf_file, cache_dir).parent == cache_dir
+    assert cache_path(conf_file, cache_dir).exists()
+    assert not (conf_file.parent / '__pycache__').exists()
+
+
+def test_load_file_without_cache(conf, tmp_path, write_bytecode):
+    conf_file = tmp_path / 'conf.py'
+    conf_file.write_text('from confect import c\nc.dummy.x = 5\n')
+    conf.load_file(conf_file, cache=False)
+    assert conf.dummy.x == 5
+    assert not (tmp_path / '__pycache__').exists()
+
+
+def test_load_layers(conf, conf1_file, conf2_file, monkeypatch):
+    from pathlib import Path
+
+    from confect import layer
+
+    monkeypatch.setenv('proj_L__yummy__rank', '5')
+    conf.load_layers([
+        Path(conf2_file),
+        layer.File(conf1_file),
+        layer.EnvVars('proj_L'),
+        {'yummy': {'rank': 6, 'kind': 'dessert'}},
+        layer.Mapping({'yummy': {'kind': 'fruit'}}, name='personal'),
+    ])
+    assert conf.dummy.x == 5
+    assert conf.dummy.y == 'other string'
+    assert conf.yummy.name == 'octopus'
+    assert conf.yummy.rank == 6
+    assert conf.yummy.kind == 'fruit'
+
+
+def test_load_layers_module(conf, conf1_file):
+    from confect import layer
+
+    with pytest.raises(ImportError):
+        conf.load_layers([layer.Module('conf_does_not_exist')])
+
+    sys.path.append(str(conf1_file.dirpath()))
+    conf.load_layers([layer.Module('conf1')])
+    assert conf.dummy.x == 5
+
+
+def test_load_module_keeps_module(conf, tmp_path, monkeypatch):
+    module_file = tmp_path / 'conf_module.py'
+    module_file.write_text('from confect import c\nc.dummy.x = 5\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'conf_module', raising=False)
+
+    conf.load_module('conf_module')
+    assert conf.dummy.x == 5
+    module = sys.modules['conf_module']
+    import conf_module
+    assert conf_module is module
+
+    # size differs, since .pyc files store mtime in seconds
+    module_file.write_text('from confect import c\nc.dummy.x = 60\n')
+    [module_layer] = conf.loaded_layers()
+    assert conf.reload_layer(module_layer) == {'dummy': {'x': 60}}
+    assert sys.modules['conf_module'] is module
+
+
+def test_load_layers_parallel(conf, conf1_file, conf2_file):
+    from confect import layer
+
+    conf.load_layers([
+        layer.File(conf1_file),
+        {'dummy': {'x': 7}},
+        layer.File(conf2_file),
+    ], max_workers=2)
+    assert conf.dummy.x == 6
+    assert conf.dummy.y == 'other string'
+    assert conf.yummy.name == 'octopus'
+
+
+def test_load_layers_unknown_source(conf):
+    from confect import ParameterError
+
+    with pytest.raises(ParameterError):
+        conf.load_layers(['conf1'])
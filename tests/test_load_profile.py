@@ -0,0 +1,99 @@
+import logging
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from confect import Conf
+from confect.layer import Mapping
+
+
+@pytest.fixture
+def slow_conf_file(tmp_path):
+    path = tmp_path / 'slow_conf.py'
+    path.write_text(textwrap.dedent('''
+        from confect import c
+
+        def compute_x():
+            return sum(range(1000))
+
+        c.dummy.x = compute_x()
+        c.yummy.name = 'octopus'
+        '''))
+    return path
+
+
+def test_load_records(conf, conf1_file, monkeypatch):
+    monkeypatch.setenv('proj__dummy__x', '7')
+    conf.load_file(conf1_file)
+    conf.load_envvars('proj')
+    conf.load_layers([{'dummy': {'x': 1}}, {}])
+
+    records = conf.load_records()
+    assert [record.layer for record in records][:2] == [
+        f'file:{conf1_file}',
+        'envvars:proj',
+    ]
+    assert [record.props for record in records] == [2, 1, 1, 0]
+    assert all(record.seconds >= 0 for record in records)
+    assert records[0].stats is None
+    assert records[0].as_dict() == {
+        'layer': f'file:{conf1_file}',
+        'seconds': records[0].seconds,
+        'props': 2,
+        'worker': False,
+    }
+
+
+def test_reload_records(conf):
+    layer = Mapping({'dummy': {'x': 1}}, name='mutable')
+    conf.load_layers([layer])
+    conf.reload_layer(layer)
+    assert [record.layer for record in conf.load_records()] == [
+        'mapping:mutable',
+        'mapping:mutable',
+    ]
+
+
+def test_max_load_records():
+    conf = Conf(max_load_records=2)
+    for i in range(3):
+        conf.load_layers([Mapping({}, name=str(i))])
+    assert [record.layer for record in conf.load_records()] == [
+        'mapping:1',
+        'mapping:2',
+    ]
+
+
+def test_profile_loading(conf, slow_conf_file):
+    with conf.profile_loading():
+        conf.load_file(slow_conf_file)
+    conf.load_layers([{}])
+
+    profiled, not_profiled = conf.load_records()
+    assert not_profiled.stats is None
+    functions = {
+        (Path(filename).name, name)
+        for filename, _, name in profiled.stats.stats
+    }
+    assert ('slow_conf.py', 'compute_x') in functions
+
+
+def test_profile_in_workers(conf, slow_conf_file, conf1_file):
+    with conf.profile_loading():
+        conf.load_layers([slow_conf_file, Path(conf1_file), {}], max_workers=2)
+    records = conf.load_records()
+    assert [record.worker for record in records] == [True, True, False]
+    assert [record.props for record in records] == [2, 2, 0]
+    assert all(record.stats is not None for record in records)
+    assert conf.dummy.x == 5
+
+
+def test_logging_hook(conf, conf1_file, caplog):
+    with caplog.at_level(logging.INFO, logger='confect.load_profile'):
+        conf.load_file(conf1_file)
+    [log_record] = caplog.records
+    assert log_record.confect_load is conf.load_records()[-1]
+    assert log_record.getMessage().startswith(
+        f'Evaluated configuration layer file:{conf1_file} in '
+    )
@@ -0,0 +1,65 @@
+import sys
+import textwrap
+
+import pytest
+
+from confect import UnknownConfError, manifest
+
+
+@pytest.fixture
+def lazy_pkg(tmp_path, monkeypatch):
+    pkg = tmp_path / 'lazypkg'
+    (pkg / 'api').mkdir(parents=True)
+    (pkg / '__init__.py').write_text('')
+    (pkg / 'core.py').write_text(textwrap.dedent('''
+        import confect
+        conf = confect.Conf()
+        '''))
+    (pkg / 'db.py').write_text(textwrap.dedent('''
+        from lazypkg.core import conf
+        conf.declare_group('db', host='10.3.14.15')
+        '''))
+    (pkg / 'api' / '__init__.py').write_text(textwrap.dedent('''
+        from lazypkg.core import conf
+        with conf.declare_group('api') as api:
+            api.prefix = 'v2'
+        '''))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'lazypkg'
+    for name in list(sys.modules):
+        if name.startswith('lazypkg'):
+            del sys.modules[name]
+
+
+def test_scan(lazy_pkg):
+    assert manifest.scan(lazy_pkg) == {'api': 'lazypkg.api', 'db': 'lazypkg.db'}
+    assert 'lazypkg.db' not in sys.modules
+
+
+def test_use_manifest(lazy_pkg, tmp_path):
+    from lazypkg.core import conf
+
+    manifest_path = tmp_path / 'manifest.json'
+    manifest.write(manifest.scan(lazy_pkg), manifest_path)
+    conf.use_manifest(manifest_path)
+
+    conf.load_layers([{'db': {'host': '127.0.0.1'}}])
+    assert 'lazypkg.db' not in sys.modules
+    assert conf.db.host == '127.0.0.1'
+    assert 'lazypkg.db' in sys.modules
+    assert 'lazypkg.api' not in sys.modules
+
+    with pytest.raises(UnknownConfError):
+        conf.unknown
+
+    conf.declare_manifest_groups()
+    assert 'api' in conf
+
+
+def test_manifest_cli(lazy_pkg, tmp_path):
+    from confect.__main__ import main
+
+    manifest_path = tmp_path / 'manifest.json'
+    main(['manifest', lazy_pkg, '-o', str(manifest_path)])
+    assert manifest.read(manifest_path) == {
+        'api': 'lazypkg.api', 'db': 'lazypkg.db'}
@@ -0,0 +1,40 @@
+import textwrap
+
+import pytest
+
+from confect import Conf, FrozenConfPropError
+
+
+@pytest.fixture
+def conf():
+    conf = Conf()
+    conf.declare_group('a', x='a', y=1)
+    return conf
+
+
+def test_load_file_in_mutate_locally(conf, tmp_path):
+    conf_file = tmp_path / 'conf.py'
+    conf_file.write_text(textwrap.dedent('''
+        from confect import c
+        c.a.x = 'loaded'
+        c.b.z = 'undeclared'
+        '''))
+
+    with conf.mutate_locally():
+        conf.load_file(conf_file, cache=False)
+        assert conf.a.x == 'loaded'
+        assert conf.a.y == 1
+
+    assert conf.a.x == 'a'
+    assert conf.loaded_layers() == []
+    assert conf.undeclared_props() == {}
+    with pytest.raises(FrozenConfPropError):
+        conf.a.x = 'b'
+
+
+def test_load_envvars_in_mutate_locally(conf, monkeypatch):
+    monkeypatch.setenv('proj__a__y', '2')
+    with conf.mutate_locally():
+        conf.load_envvars('proj', lazy=True)
+        assert conf.a.y == 2
+    assert conf.a.y == 1
@@ -0,0 +1,79 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import confect
+from confect import Conf, UnknownConfError
+
+
+@pytest.fixture
+def conf():
+    conf = Conf()
+    with conf.declare_group('pickled') as group:
+        group.host = '10.3.14.15'
+        group.port = 3306
+        group.tags = ['a']
+        group.url = confect.derived(
+            lambda conf: f'{conf.pickled.host}:{conf.pickled.port}'
+        )
+    with conf.mutate_globally():
+        conf.pickled.host = '127.0.0.1'
+    return conf
+
+
+def test_pickle(conf):
+    conf.pickled.url
+    conf_copy = pickle.loads(pickle.dumps(conf))
+    assert conf_copy is not conf
+    assert conf_copy.pickled.as_dict() == {
+        'host': '127.0.0.1',
+        'port': 3306,
+        'tags': ['a'],
+        'url': '127.0.0.1:3306',
+    }
+
+    with conf_copy.mutate_globally():
+        conf_copy.pickled.port = 1
+    assert conf_copy.pickled.url == '127.0.0.1:1'
+    assert conf.pickled.port == 3306
+
+    with pytest.raises(confect.FrozenConfPropError):
+        conf_copy.pickled.port = 2
+
+
+def test_pickle_values_only(conf):
+    data = pickle.dumps(conf)
+    assert b'10.3.14.15' not in data
+    assert b'127.0.0.1' in data
+
+
+def test_pickle_global_values(conf):
+    with conf.mutate_locally():
+        conf.pickled.port = 5432
+        conf_copy = pickle.loads(pickle.dumps(conf))
+    assert conf_copy.pickled.port == 3306
+
+
+def test_unpickle_unknown_schema(conf):
+    data = pickle.dumps(conf)
+    conf.declare_group('pickled_later', x=1)
+    with pytest.raises(UnknownConfError):
+        pickle.loads(data)
+
+
+def test_pickle_frozen(conf):
+    frozen = pickle.loads(pickle.dumps(conf.freeze()))
+    assert frozen.pickled.host == '127.0.0.1'
+    assert frozen.pickled.url == '127.0.0.1:3306'
+
+
+def read_url(conf):
+    return conf.pickled.url
+
+
+def test_process_pool(conf):
+    with conf.mutate_globally():
+        conf.pickled.port = 1
+    with ProcessPoolExecutor(1) as executor:
+        assert executor.submit(read_url, conf).result() == '127.0.0.1:1'
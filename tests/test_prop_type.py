@@ -126,6 +126,11 @@ def test_parse_prop(conf):
     assert (conf.parse_prop('dummy', 'some_time', '2017-06-30T08:22+0800') ==
             pdl.datetime(2017, 6, 30, 8, 22, tz=+8))
     assert conf.parse_prop('dummy', 'color', 'red') == Color.RED
+    assert conf.parse_prop('dummy', 'a_tuple', '[1, 2]') == (1, 2)
+    assert conf.parse_prop('dummy', 'a_list', '[1, 2]') == [1, 2]
+    assert conf.parse_prop('dummy', 'a_dict', '{"A": "b"}') == {'A': 'b'}
+    with pytest.raises(confect.ParseError):
+        conf.parse_prop('dummy', 'a_dict', '[1, 2]')
 
 
 def test_load_envvar(conf):
@@ -145,3 +150,269 @@ def test_load_envvar(conf):
     assert conf.dummy.some_string == 'other string'
     assert conf.dummy.color == Color.GREEN
     assert conf.dummy.some_day == dt.date(2018, 9, 3)
+
+
+def test_load_envvars_multiple_prefixes(conf, monkeypatch):
+    monkeypatch.setenv('proj_Y__dummy__a_int', '15')
+    monkeypatch.setenv('proj_Y__dummy__a_float', '1.5')
+    monkeypatch.setenv('proj_Y_local__dummy__a_int', '16')
+    monkeypatch.setenv('proj_Y__unknown__a_int', '17')
+
+    conf.load_envvars('proj_Y', 'proj_Y_local')
+
+    assert conf.dummy.a_int == 16
+    assert conf.dummy.a_float == 1.5
+
+
+def test_load_envvars_parse_errors(conf, monkeypatch):
+    monkeypatch.setenv('proj_Z__dummy__a_int', 'not int')
+    monkeypatch.setenv('proj_Z__dummy__some_day', 'not date')
+    monkeypatch.setenv('proj_Z__dummy__a_float', '1.5')
+
+    with pytest.raises(confect.ParseError) as exc_info:
+        conf.load_envvars('proj_Z')
+
+    assert set(exc_info.value.errors) == {
+        'proj_Z__dummy__a_int', 'proj_Z__dummy__some_day'}
+    assert conf.dummy.a_float == 3.14
+
+
+def test_load_envvars_lazy(conf, monkeypatch):
+    monkeypatch.setenv('proj_W__dummy__a_int', 'not int')
+    monkeypatch.setenv('proj_W__dummy__some_day', '2018-09-03')
+
+    conf.load_envvars('proj_W', lazy=True)
+    assert isinstance(conf.get_prop('dummy', 'some_day')._value,
+                      confect.conf.Unparsed)
+    assert conf.dummy.some_day == dt.date(2018, 9, 3)
+    assert conf.get_prop('dummy', 'some_day')._value == dt.date(2018, 9, 3)
+
+    with pytest.raises(confect.ParseError):
+        conf.dummy.a_int
+
+
+def test_of_value_subclasses():
+    import decimal
+    import enum
+    import pathlib
+
+    class Level(enum.IntEnum):
+        LOW = 1
+
+    assert confect.prop_type.of_value(Level.LOW) == confect.prop_type.Integer()
+    assert confect.prop_type.of_value(True) == confect.prop_type.Bool()
+    assert confect.prop_type.of_value(pathlib.Path('a')) == confect.prop_type.Path()
+    assert confect.prop_type.of_type(pathlib.PurePath) is None
+
+    prop_type = confect.prop_type.of_value(decimal.Decimal('1.5'))
+    assert prop_type == confect.prop_type.Decimal()
+    assert prop_type.parse('0.1') == decimal.Decimal('0.1')
+    with pytest.raises(confect.ParseError):
+        prop_type.parse('abc')
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(
+        confect.prop_type, '_registry', dict(confect.prop_type._registry)
+    )
+    monkeypatch.setattr(confect.prop_type, '_resolved', {})
+    return confect.prop_type._registry
+
+
+def test_register(registry):
+    @confect.prop_type.register
+    class Hex(confect.prop_type.PropertyType):
+        name = 'hex'
+        python_type = int
+
+        def parse(self, s):
+            return int(s, 16)
+
+    assert confect.prop_type.of_value(True) == confect.prop_type.Bool()
+    assert confect.prop_type.of_value(10) == Hex()
+    assert Hex() is not confect.prop_type.Integer()
+
+    with pytest.raises(TypeError):
+        confect.prop_type.register(int)
+
+
+def test_unregistered_prop_types(registry):
+    from enum import Enum
+
+    class Shade(Enum):
+        DARK = 1
+
+    confect.make_prop_type(Shade, lambda s: Shade[s])
+
+    class Octal(confect.prop_type.PropertyType):
+        name = 'octal'
+        python_type = int
+
+        def parse(self, s):
+            return int(s, 8)
+
+    assert confect.prop_type.of_value(Shade.DARK) is None
+    assert confect.prop_type.of_value(10) == confect.prop_type.Integer()
+
+
+def test_registered_types_skip_entry_points(registry, monkeypatch):
+    import importlib.metadata
+
+    def entry_points():
+        raise AssertionError('entry points scanned')
+
+    monkeypatch.setattr(importlib.metadata, 'entry_points', entry_points)
+    monkeypatch.setattr(confect.prop_type, '_entry_points_loaded', False)
+
+    conf = confect.Conf()
+    conf.declare_group('dummy', x=3, flag=True)
+    assert conf.get_prop('dummy', 'x').prop_type == confect.prop_type.Integer()
+    assert not confect.prop_type._entry_points_loaded
+
+
+def test_register_entry_points(registry, monkeypatch):
+    import importlib.metadata
+
+    class Point:
+        pass
+
+    class EntryPoint:
+        name = 'point'
+        group = confect.prop_type.ENTRY_POINT_GROUP
+
+        def load(self):
+            class PointType(confect.prop_type.PropertyType):
+                name = 'point'
+                python_type = Point
+
+                def parse(self, s):
+                    return Point()
+
+            return PointType
+
+    class EntryPoints(list):
+        def select(self, group):
+            return [ep for ep in self if ep.group == group]
+
+    monkeypatch.setattr(
+        importlib.metadata, 'entry_points', lambda: EntryPoints([EntryPoint()])
+    )
+    monkeypatch.setattr(confect.prop_type, '_entry_points_loaded', False)
+
+    assert confect.prop_type.of_value(Point()).name == 'point'
+
+
+@pytest.mark.parametrize('string, expected', [
+    ('2020-01-02T03:04:05', dt.datetime(2020, 1, 2, 3, 4, 5)),
+    ('2020-01-02', dt.datetime(2020, 1, 2)),
+    ('2020-01-02T03:04:05.123', dt.datetime(2020, 1, 2, 3, 4, 5, 123000)),
+    ('2020-01-02 03:04', dt.datetime(2020, 1, 2, 3, 4)),
+    ('2020-1-2 3:4:5', dt.datetime(2020, 1, 2, 3, 4, 5)),
+    ('2020-01-02T03:04Z', dt.datetime(2020, 1, 2, 3, 4, tzinfo=dt.timezone.utc)),
+    (
+        '2020-01-02T03:04:05+0800',
+        dt.datetime(2020, 1, 2, 3, 4, 5, tzinfo=dt.timezone(dt.timedelta(hours=8))),
+    ),
+    (
+        '2020-01-02T03:04-05:30',
+        dt.datetime(
+            2020, 1, 2, 3, 4, tzinfo=dt.timezone(-dt.timedelta(hours=5, minutes=30))
+        ),
+    ),
+])
+def test_parse_datetime(string, expected):
+    value = confect.prop_type.DateTime().parse(string)
+    assert value == expected
+    assert value.tzinfo == expected.tzinfo
+
+
+@pytest.mark.parametrize('string', [
+    'abc',
+    '2020-13-02T03:04',
+    '2020-01-02T03:04+25:00',
+    # accepted by fromisoformat() since python 3.11 only
+    '20200102T030405',
+    '2020-01-02T03:04+08',
+    '2020-01-02T03:04:05.12',
+])
+def test_parse_datetime_error(string):
+    with pytest.raises(confect.ParseError):
+        confect.prop_type.DateTime().parse(string)
+
+
+def test_parse_date():
+    prop_type = confect.prop_type.Date()
+    assert prop_type.parse('2020-01-02') == dt.date(2020, 1, 2)
+    assert prop_type.parse('2020-1-2') == dt.date(2020, 1, 2)
+    with pytest.raises(confect.ParseError):
+        prop_type.parse('2020-02-30')
+    with pytest.raises(confect.ParseError):
+        prop_type.parse('20200102')
+
+
+def test_parse_many():
+    prop_type = confect.prop_type.Integer()
+    assert prop_type.parse_many(iter(['1', '-2', '0x10'])) == [1, -2, 16]
+
+    with pytest.raises(confect.ParseError) as exc_info:
+        prop_type.parse_many(['1', 'x', '2.5'])
+    assert sorted(exc_info.value.errors) == [1, 2]
+
+    assert confect.prop_type.String().parse_many([]) == []
+
+
+@pytest.mark.parametrize('prop_type, strings', [
+    (confect.prop_type.Integer(), ['1', '+2', ' -3 ', '1_000']),
+    (confect.prop_type.Integer(), ['1', '99999999999999999999', 'True']),
+    (confect.prop_type.Float(), ['1.5', '-2e3', '.5', '1_000.5']),
+    (confect.prop_type.Float(), ['1.5', '1e999']),
+])
+def test_parse_many_numpy(prop_type, strings):
+    pytest.importorskip('numpy')
+
+    expected = [prop_type.parse(s) for s in strings]
+    values = prop_type.parse_many(strings)
+    assert values == expected
+    assert [type(v) for v in values] == [type(v) for v in expected]
+
+
+def test_parse_many_numpy_fallback():
+    pytest.importorskip('numpy')
+
+    for invalid in ['007', '٣']:
+        with pytest.raises(confect.ParseError):
+            confect.prop_type.Integer().parse_many(['1', invalid])
+    for invalid in ['nan', '5', '٣']:
+        with pytest.raises(confect.ParseError):
+            confect.prop_type.Float().parse_many(['1.5', invalid])
+
+
+def test_parse_props(conf):
+    values, errors = conf.parse_props({
+        'dummy.a_int': '5',
+        'dummy.a_float': '2.5',
+        'dummy.some_day': '2017-06-30',
+        'dummy.color': 'blue',
+    })
+    assert errors == {}
+    assert values == {'dummy': {
+        'a_int': 5,
+        'a_float': 2.5,
+        'some_day': dt.date(2017, 6, 30),
+        'color': Color.BLUE,
+    }}
+
+    values, errors = conf.parse_props({
+        'dummy.a_int': 'x',
+        'dummy.a_float': '1.5',
+        'dummy.unknown': '1',
+        'unknown.a_int': '1',
+        'dummy': '1',
+    })
+    assert values == {'dummy': {'a_float': 1.5}}
+    assert isinstance(errors.pop('dummy.a_int'), confect.ParseError)
+    assert isinstance(errors.pop('dummy.unknown'), confect.UnknownConfError)
+    assert isinstance(errors.pop('unknown.a_int'), confect.UnknownConfError)
+    assert isinstance(errors.pop('dummy'), confect.ParameterError)
+    assert errors == {}
@@ -0,0 +1,117 @@
+import pytest
+
+from confect import Conf, ParameterError, UnknownConfError
+from confect.layer import Mapping
+
+
+@pytest.fixture
+def conf():
+    conf = Conf()
+    conf.declare_group('db', host='10.3.14.15', port=3306, user='app')
+    return conf
+
+
+@pytest.fixture
+def layers():
+    return (
+        Mapping({'db': {'host': 'file', 'port': 1}}, name='file'),
+        Mapping({'db': {'host': 'env'}}, name='env'),
+        Mapping({'db': {'user': 'cli'}}, name='cli'),
+    )
+
+
+def test_provenance(conf, layers):
+    file, env, cli = layers
+    conf.load_layers([file, env])
+    conf.load_layers([cli])
+    assert conf.provenance('db.host') is env
+    assert conf.provenance('db.port') is file
+    assert conf.provenance('db.user') is cli
+
+    with conf.mutate_globally():
+        conf.db.port = 2
+    assert conf.provenance('db.port') is None
+
+    with pytest.raises(UnknownConfError):
+        conf.provenance('db.unknown')
+
+
+def test_provenance_of_undeclared_group():
+    conf = Conf()
+    layer = Mapping({'late': {'flag': False}})
+    conf.load_layers([layer])
+    conf.declare_group('late', flag=True)
+    assert conf.late.flag is False
+    assert conf.provenance('late.flag') is layer
+
+
+def test_remove_layer(conf, layers):
+    file, env, cli = layers
+    conf.load_layers(layers)
+
+    calls = []
+    conf.subscribe_group('db', calls.append)
+    assert conf.remove_layer(env) == {'db': {'host': 'file'}}
+    assert conf.provenance('db.host') is file
+    assert conf.remove_layer(file) == {'db': {'host': '10.3.14.15', 'port': 3306}}
+    assert conf.provenance('db.host') is None
+    assert conf.loaded_layers() == [cli]
+    assert calls == [{'host': 'file'}, {'host': '10.3.14.15', 'port': 3306}]
+
+    with pytest.raises(ParameterError):
+        conf.remove_layer(file)
+
+
+def test_replace_layer(conf, layers):
+    file, env, cli = layers
+    conf.load_layers(layers)
+    new_file = Mapping({'db': {'host': 'new file', 'user': 'new'}}, name='new')
+
+    # the replaced layer keeps its precedence under env and cli
+    assert conf.replace_layer(file, new_file) == {'db': {'port': 3306}}
+    assert conf.loaded_layers() == [new_file, env, cli]
+    assert (conf.db.host, conf.db.user) == ('env', 'cli')
+
+    conf.remove_layer(env)
+    assert conf.db.host == 'new file'
+    assert conf.provenance('db.host') is new_file
+
+
+def test_failed_replace(conf, layers):
+    file, env, cli = layers
+    conf.load_layers(layers)
+
+    class Broken(Mapping):
+        def evaluate(self, conf):
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        conf.replace_layer(file, Broken({}))
+    assert conf.loaded_layers() == list(layers)
+    assert conf.db.port == 1
+
+
+def test_reload_updates_provenance(conf, layers):
+    file, env, cli = layers
+    conf.load_layers(layers)
+    env.values = {}
+    conf.reload_layer(env)
+    assert conf.provenance('db.host') is file
+
+
+def test_load_same_source_replaces_layer(conf, layers):
+    file, env, cli = layers
+    conf.load_layers(layers)
+    new_file = Mapping({'db': {'host': 'new file'}}, name='file')
+    conf.load_layers([new_file])
+    assert conf.loaded_layers() == [env, cli, new_file]
+    assert conf.db.host == 'new file'
+    assert conf.provenance('db.host') is new_file
+    # only set by the replaced layer
+    assert conf.db.port == 3306
+    assert conf.provenance('db.port') is None
+
+    for _ in range(3):
+        conf.load_layers([Mapping({'db': {'port': 1}}, name='env')])
+    assert len(conf.loaded_layers()) == 3
+    assert (conf.db.host, conf.db.port) == ('new file', 1)
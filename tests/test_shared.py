@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import confect
+from confect import Conf
+from confect import shared
+
+
+def declare(conf):
+    with conf.declare_group('shared') as group:
+        group.host = '10.3.14.15'
+        group.port = 3306
+        group.tags = ['a']
+        group.url = confect.derived(
+            lambda conf: f'{conf.shared.host}:{conf.shared.port}'
+        )
+    return conf
+
+
+@pytest.fixture
+def master():
+    return declare(Conf())
+
+
+@pytest.fixture
+def worker():
+    return declare(Conf())
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'conf.shm')
+
+
+def test_publish_and_follow(master, worker, path):
+    with master.mutate_globally():
+        master.shared.host = '127.0.0.1'
+    assert master.publish(path) == 1
+
+    follower = worker.follow(path)
+    assert follower.generation == 1
+    assert worker.shared.host == '127.0.0.1'
+    assert worker.shared.url == '127.0.0.1:3306'
+    assert follower.check() == {}
+
+    with master.mutate_globally():
+        master.shared.port = 1
+    assert master.publish(path) == 2
+    assert follower.check() == {'shared': {'port': 1}}
+    assert follower.generation == 2
+    assert worker.shared.url == '127.0.0.1:1'
+    assert follower.check() == {}
+    follower.close()
+
+
+def test_follow_notifies_subscribers(master, worker, path):
+    master.publish(path)
+    follower = worker.follow(path)
+    calls = []
+    worker.subscribe('shared', 'port', calls.append)
+
+    with master.mutate_globally():
+        master.shared.port = 1
+    master.publish(path)
+    follower.check()
+    assert calls == [1]
+
+
+def test_payload_grows(master, worker, path):
+    master.publish(path)
+    follower = worker.follow(path)
+
+    with master.mutate_globally():
+        master.shared.tags = ['x' * 100] * 1000
+    master.publish(path)
+    assert follower.check() == {'shared': {'tags': ['x' * 100] * 1000}}
+
+
+def test_check_while_publishing(master, worker, path, monkeypatch):
+    master.publish(path)
+    follower = worker.follow(path)
+
+    with open(path, 'r+b') as f:
+        f.seek(shared._SEQUENCE_OFFSET)
+        f.write(shared._SEQUENCE.pack(3))
+    monkeypatch.setattr(shared, '_READ_ATTEMPTS', 2)
+    assert follower.check() == {}
+    assert follower.generation == 1
+
+    # the next publish skips the generation of the failed publisher
+    with master.mutate_globally():
+        master.shared.port = 1
+    assert master.publish(path) == 3
+    assert follower.check() == {'shared': {'port': 1}}
+
+
+def test_invalid_file(worker, path):
+    with open(path, 'wb') as f:
+        f.write(b'\0' * 64)
+    with pytest.raises(ValueError):
+        worker.follow(path)
+
+
+def follow_in_worker(conf, path):
+    follower = conf.follow(path)
+    return follower.generation, conf.shared.port
+
+
+def test_follow_in_worker_process(master, worker, path):
+    with master.mutate_globally():
+        master.shared.port = 1
+    master.publish(path)
+    with ProcessPoolExecutor(1) as executor:
+        assert executor.submit(follow_in_worker, worker, path).result() == (1, 1)
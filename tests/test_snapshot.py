@@ -0,0 +1,95 @@
+import textwrap
+
+import pytest
+
+from confect import Conf
+
+
+def make_conf():
+    conf = Conf()
+    conf.declare_group('dummy', x=3, y='some string')
+    return conf
+
+
+@pytest.fixture
+def conf_file(tmp_path):
+    path = tmp_path / 'conf.py'
+    path.write_text('from confect import c\nc.dummy.x = 5\n')
+    return path
+
+
+def test_snapshot(conf_file, tmp_path):
+    snapshot_path = tmp_path / 'conf.snapshot'
+    conf = make_conf()
+    conf.load_file(conf_file)
+    conf.dump_snapshot(snapshot_path)
+
+    conf = make_conf()
+    assert conf.load_snapshot(snapshot_path)
+    assert conf.dummy.x == 5
+    assert conf.dummy.y == 'some string'
+
+
+def test_snapshot_stale_source(conf_file, tmp_path):
+    snapshot_path = tmp_path / 'conf.snapshot'
+    conf = make_conf()
+    conf.load_file(conf_file)
+    conf.dump_snapshot(snapshot_path)
+
+    conf_file.write_text('from confect import c\nc.dummy.x = 6\n')
+    conf = make_conf()
+    assert not conf.load_snapshot(snapshot_path)
+    assert conf.dummy.x == 3
+
+    assert conf.load_snapshot(snapshot_path, check_sources=False)
+    assert conf.dummy.x == 5
+
+
+def test_snapshot_schema_changed(conf_file, tmp_path):
+    snapshot_path = tmp_path / 'conf.snapshot'
+    conf = make_conf()
+    conf.load_file(conf_file)
+    conf.dump_snapshot(snapshot_path)
+
+    conf = make_conf()
+    conf.declare_group('yummy', kind='seafood')
+    assert not conf.load_snapshot(snapshot_path)
+
+    conf = Conf()
+    conf.declare_group('dummy', x=3.0, y='some string')
+    assert not conf.load_snapshot(snapshot_path)
+
+
+def test_snapshot_invalid(tmp_path):
+    conf = make_conf()
+    assert not conf.load_snapshot(tmp_path / 'missing.snapshot')
+
+    (tmp_path / 'broken.snapshot').write_bytes(b'broken')
+    assert not conf.load_snapshot(tmp_path / 'broken.snapshot')
+
+
+def test_compile_cli(conf_file, tmp_path, monkeypatch):
+    from confect.__main__ import main
+
+    (tmp_path / 'projx_core.py').write_text(textwrap.dedent('''
+        import confect
+        conf = confect.Conf()
+        '''))
+    (tmp_path / 'projx_dummy.py').write_text(textwrap.dedent('''
+        from projx_core import conf
+        conf.declare_group('dummy', x=3, y='some string')
+        '''))
+    (tmp_path / 'projx_conf.py').write_text(
+        'from confect import c\nc.dummy.y = "other string"\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv('projx_cli__dummy__x', '7')
+
+    snapshot_path = tmp_path / 'conf.snapshot'
+    main(['compile', 'projx_core:conf', '--import', 'projx_dummy',
+          '--envvars', 'projx_cli', '--file', str(conf_file),
+          '--module', 'projx_conf', '-o', str(snapshot_path)])
+
+    conf = make_conf()
+    assert conf.load_snapshot(snapshot_path)
+    assert conf.dummy.x == 5
+    assert conf.dummy.y == 'other string'
@@ -0,0 +1,73 @@
+from confect import layer
+
+
+def test_subscribe(conf, conf1_file):
+    values = []
+    unsubscribe = conf.subscribe('dummy', 'x', values.append)
+    conf.load_file(conf1_file)
+    assert values == [5]
+
+    # no notification for unchanged values
+    conf.load_file(conf1_file)
+    assert values == [5]
+
+    with conf.mutate_globally():
+        conf.dummy.x = 6
+        conf.dummy.x = 7
+    assert values == [5, 7]
+
+    with conf.mutate_locally():
+        conf.dummy.x = 8
+    assert values == [5, 7]
+
+    unsubscribe()
+    with conf.mutate_globally():
+        conf.dummy.x = 9
+    assert values == [5, 7]
+
+
+def test_subscribe_group(conf):
+    changes = []
+    conf.subscribe_group('yummy', changes.append)
+    conf.load_layers([
+        {'yummy': {'kind': 'dessert', 'name': 'cake'}},
+        {'yummy': {'name': 'pie', 'rank': 3}},
+    ])
+    assert changes == [{'kind': 'dessert', 'name': 'pie'}]
+
+
+def test_subscribe_reload(conf, tmp_path):
+    conf_file = tmp_path / 'conf.py'
+    conf_file.write_text('from confect import c\nc.dummy.x = 5\n')
+    file_layer = layer.File(conf_file, cache=False)
+    conf.load_layers([file_layer])
+
+    calls = []
+    conf.subscribe_group('dummy', calls.append)
+    conf_file.write_text(
+        'from confect import c\nc.dummy.x = 6\nc.dummy.y = "other"\n')
+    conf.reload_layer(file_layer)
+    assert calls == [{'x': 6, 'y': 'other'}]
+
+
+def test_subscribe_declare_after_load(conf1_file):
+    from confect import Conf
+
+    conf = Conf()
+    conf.load_file(conf1_file)
+    values = []
+    conf.subscribe('dummy', 'x', values.append)
+    conf.declare_group('dummy', x=3)
+    assert values == [5]
+
+
+def test_subscriber_error(conf, caplog):
+    def broken(value):
+        raise RuntimeError
+
+    values = []
+    conf.subscribe('dummy', 'x', broken)
+    conf.subscribe('dummy', 'x', values.append)
+    conf.load_layers([{'dummy': {'x': 5}}])
+    assert values == [5]
+    assert 'Error in configuration subscriber' in caplog.text
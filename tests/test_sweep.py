@@ -0,0 +1,94 @@
+import pytest
+
+import confect
+from confect import Conf, FrozenConfPropError, ParameterError, UnknownConfError
+from confect.sweep import Sweep
+
+
+@pytest.fixture
+def conf():
+    conf = Conf()
+    with conf.declare_group('train') as train:
+        train.lr = 0.1
+        train.epochs = 10
+        train.steps = confect.derived(
+            lambda conf: conf.train.epochs * conf.data.batches
+        )
+    conf.declare_group('data', batches=100, path='data.csv')
+    conf.declare_group('db', host='10.3.14.15', port=3306)
+    return conf
+
+
+def test_grid(conf):
+    sweep = conf.sweep({'train.lr': [0.1, 0.01], 'data.batches': [10, 20]})
+    assert len(sweep) == 4
+    assert [
+        (view.train.lr, view.data.batches, view.train.steps) for view in sweep
+    ] == [(0.1, 10, 100), (0.1, 20, 200), (0.01, 10, 100), (0.01, 20, 200)]
+    assert conf.train.lr == 0.1
+    assert conf.train.steps == 1000
+
+
+def test_sample(conf):
+    axes = {
+        'train.lr': lambda rng: rng.uniform(0.001, 0.01),
+        'train.epochs': [5, 10, 20],
+    }
+    sweep = conf.sweep(axes, samples=5, seed=42)
+    assert len(sweep) == 5
+    assert sweep.variants == conf.sweep(axes, samples=5, seed=42).variants
+    for view, variant in zip(sweep, sweep.variants):
+        assert 0.001 <= view.train.lr <= 0.01
+        assert view.train.epochs == variant['train.epochs']
+
+
+def test_structural_sharing(conf):
+    base = conf.freeze()
+    views = list(conf.sweep({'train.lr': [0.1, 0.01]}))
+    assert views[0].db is views[1].db
+    assert views[0].data is views[1].data
+    assert views[0].train is not views[1].train
+    assert type(views[0]) is type(views[1])
+
+    # derived properties of unchanged groups are shared too
+    views = list(conf.sweep({'data.batches': [10, 20]}))
+    assert views[0].train is not views[1].train
+    assert views[0].db is views[1].db
+    assert views[0].db.as_dict() == base.db.as_dict()
+
+
+def test_views_are_read_only(conf):
+    view = next(iter(conf.sweep({'train.lr': [0.5]})))
+    with pytest.raises(FrozenConfPropError):
+        view.train.lr = 1.0
+
+
+def test_conf_keeps_values_while_iterating(conf):
+    for view in conf.sweep({'train.lr': [0.5, 0.01], 'train.epochs': [5]}):
+        assert view.train.epochs == 5
+        assert conf.train.lr == 0.1
+        assert conf.train.epochs == 10
+        assert conf.train.steps == 1000
+        with pytest.raises(FrozenConfPropError):
+            conf.train.epochs = 99
+
+
+def test_invalid_paths(conf):
+    with pytest.raises(UnknownConfError):
+        list(conf.sweep({'train.unknown': [1]}))
+    with pytest.raises(ParameterError):
+        list(conf.sweep({'train': [1]}))
+    with pytest.raises(FrozenConfPropError):
+        list(conf.sweep({'train.steps': [1]}))
+
+
+def training_steps(view):
+    return view.train.lr, view.train.steps, view.db.host
+
+
+def test_map(conf):
+    sweep = Sweep(conf, [{'train.lr': 0.5}, {'data.batches': 1, 'db.host': 'x'}])
+    assert sweep.map(training_steps, max_workers=2) == [
+        (0.5, 1000, '10.3.14.15'),
+        (0.1, 10, 'x'),
+    ]
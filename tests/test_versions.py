@@ -0,0 +1,135 @@
+import pickle
+
+import pytest
+
+import confect
+from confect import Conf, ParameterError
+from confect.pmap import PersistentMap
+
+
+@pytest.fixture
+def conf():
+    conf = Conf()
+    with conf.declare_group('db') as db:
+        db.host = '10.3.14.15'
+        db.port = 3306
+        db.url = confect.derived(lambda conf: f'{conf.db.host}:{conf.db.port}')
+    conf.declare_group('cache', expire=60)
+    return conf
+
+
+def test_transactions_create_versions(conf):
+    assert conf.versions() == [0]
+    conf.load_layers([{'db': {'host': '127.0.0.1'}}])
+    with conf.mutate_globally():
+        conf.db.port = 1
+        conf.cache.expire = 1
+    assert conf.versions() == [0, 1, 2]
+
+    # blocks without changes and local changes don't create versions
+    with conf.mutate_globally():
+        conf.db.port = 1
+    with conf.mutate_locally():
+        conf.db.port = 2
+    assert conf.versions() == [0, 1, 2]
+
+
+def test_rollback(conf):
+    conf.load_layers([{'db': {'host': '127.0.0.1'}}])
+    version = conf.versions()[-1]
+    with conf.mutate_globally():
+        conf.db.port = 1
+        conf.cache.expire = 1
+    assert conf.db.url == '127.0.0.1:1'
+
+    calls = []
+    conf.subscribe('db', 'port', calls.append)
+    conf.subscribe('db', 'host', calls.append)
+    conf.rollback(version)
+    assert conf.db.url == '127.0.0.1:3306'
+    assert conf.cache.expire == 60
+    assert calls == [3306]
+    assert conf.versions() == [0, 1, 2, 3]
+
+    conf.rollback(0)
+    assert conf.db.host == '10.3.14.15'
+    # rollbacks are versions too
+    conf.rollback(2)
+    assert (conf.db.host, conf.db.port) == ('127.0.0.1', 1)
+
+
+def test_rollback_shares_map(conf):
+    conf.load_layers([{'db': {'host': '127.0.0.1'}}])
+    with conf.mutate_globally():
+        conf.db.port = 1
+    conf.rollback(1)
+    assert conf._versions[3] is conf._versions[1]
+
+
+def test_rollback_inside_transaction(conf):
+    with conf.mutate_globally():
+        conf.db.port = 1
+        conf.rollback(0)
+        assert conf.db.port == 3306
+    assert conf.db.port == 3306
+
+
+def test_max_versions():
+    conf = Conf(max_versions=3)
+    conf.declare_group('db', port=3306)
+    for port in range(5):
+        with conf.mutate_globally():
+            conf.db.port = port
+    assert conf.versions() == [3, 4, 5]
+    with pytest.raises(ParameterError):
+        conf.rollback(0)
+    conf.rollback(3)
+    assert conf.db.port == 2
+
+
+def test_unpickled_versions(conf):
+    with conf.mutate_globally():
+        conf.db.port = 1
+    conf_copy = pickle.loads(pickle.dumps(conf))
+    assert conf_copy.versions() == [0]
+    with conf_copy.mutate_globally():
+        conf_copy.db.port = 2
+    conf_copy.rollback(0)
+    assert conf_copy.db.port == 1
+
+
+class Key:
+    def __init__(self, name, hash_):
+        self.name = name
+        self.hash = hash_
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return isinstance(other, Key) and self.name == other.name
+
+
+@pytest.mark.parametrize('hash_', [1, 2 ** 40, -1])
+def test_persistent_map_collisions(hash_):
+    keys = [Key(name, hash_) for name in 'abc'] + list(range(100))
+    pmap = PersistentMap((key, key) for key in keys)
+    assert len(pmap) == len(keys)
+    assert all(pmap[key] is key for key in keys)
+
+    pmap2 = pmap.delete(keys[0]).set(keys[1], 0).update({keys[2]: 0, 100: 0})
+    assert keys[0] not in pmap2
+    assert len(pmap2) == len(keys)
+    assert pmap.diff(pmap2) == {keys[0], keys[1], keys[2], 100}
+    assert dict(pmap.items()) == {key: key for key in keys}
+    with pytest.raises(KeyError):
+        pmap2.delete(keys[0])
+
+
+def test_persistent_map_sharing():
+    pmap = PersistentMap((i, i) for i in range(10000))
+    assert pmap.set(5, 5) is pmap
+    pmap2 = pmap.set(5, -5)
+    assert pmap.diff(pmap2) == {5}
+    assert pmap.diff(pmap) == set()
+    assert sum(pmap2.get(i) for i in range(10000)) == sum(range(10000)) - 10
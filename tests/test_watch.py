@@ -0,0 +1,183 @@
+import asyncio
+import threading
+
+import pytest
+
+from confect import layer
+
+
+def write_conf(path, x, y=None):
+    lines = ['from confect import c', f'c.dummy.x = {x}']
+    if y is not None:
+        lines.append(f'c.dummy.y = {y!r}')
+    path.write_text('\n'.join(lines))
+
+
+def test_reload_layer(conf, tmp_path):
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5, 'other string')
+    file_layer = layer.File(conf_file, cache=False)
+    conf.load_layers([
+        {'dummy': {'y': 'lower string'}},
+        file_layer,
+        {'dummy': {'x': 7}},
+    ])
+    assert conf.dummy.x == 7
+    assert conf.dummy.y == 'other string'
+
+    write_conf(conf_file, 6, 'new string')
+    assert conf.reload_layer(file_layer) == {'dummy': {'y': 'new string'}}
+    assert conf.dummy.x == 7
+
+    # removed properties fall back to lower layers
+    write_conf(conf_file, 6)
+    assert conf.reload_layer(file_layer) == {'dummy': {'y': 'lower string'}}
+    assert conf.reload_layer(file_layer) == {}
+
+
+def test_reload_layer_error(conf, tmp_path):
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5)
+    conf.load_file(conf_file, cache=False)
+    [file_layer] = conf.loaded_layers()
+
+    conf_file.write_text('from confect import c\nc.dummy.x = (')
+    with pytest.raises(SyntaxError):
+        conf.reload_layer(file_layer)
+    assert conf.dummy.x == 5
+
+    with pytest.raises(Exception):
+        conf.reload_layer(layer.File(conf_file))
+
+
+def test_watcher_check(conf, tmp_path):
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5)
+    conf.load_file(conf_file, cache=False)
+
+    watcher = conf.watch()
+    assert watcher.check() == {}
+
+    write_conf(conf_file, 6, 'other string')
+    assert watcher.check() == {'dummy': {'x': 6, 'y': 'other string'}}
+    assert conf.dummy.x == 6
+    assert watcher.check() == {}
+
+    # syntax errors are logged, and the old values are kept
+    conf_file.write_text('from confect import c\nc.dummy.x = (')
+    assert watcher.check() == {}
+    assert conf.dummy.x == 6
+
+
+@pytest.mark.parametrize('use_inotify', [None, False])
+def test_watcher_thread(conf, tmp_path, use_inotify):
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5)
+    conf.load_file(conf_file, cache=False)
+
+    reloaded = threading.Event()
+    watcher = conf.watch(interval=0.05, use_inotify=use_inotify,
+                         callback=lambda changes: reloaded.set())
+    watcher.start()
+    try:
+        write_conf(conf_file, 6)
+        assert reloaded.wait(5)
+    finally:
+        watcher.stop()
+
+    assert conf.dummy.x == 6
+
+
+def test_watcher_asyncio(conf, tmp_path):
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5)
+    conf.load_file(conf_file, cache=False)
+
+    async def main():
+        reloaded = asyncio.Event()
+        watcher = conf.watch(
+            interval=0.05, callback=lambda changes: reloaded.set())
+        task = asyncio.create_task(watcher.run())
+        await asyncio.sleep(0.01)
+        write_conf(conf_file, 6)
+        await asyncio.wait_for(reloaded.wait(), 5)
+        watcher.stop()
+        await task
+
+    asyncio.run(main())
+    assert conf.dummy.x == 6
+
+
+def test_reload_layer_keeps_unchanged_props(conf, tmp_path):
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5, 'file string')
+    conf.load_file(conf_file, cache=False)
+    [file_layer] = conf.loaded_layers()
+
+    version = conf.versions()[-1]
+    with conf.mutate_globally():
+        conf.dummy.y = 'manual string'
+    write_conf(conf_file, 6, 'file string')
+    assert conf.reload_layer(file_layer) == {'dummy': {'x': 6}}
+    assert conf.dummy.y == 'manual string'
+
+    conf.rollback(version)
+    assert (conf.dummy.x, conf.dummy.y) == (5, 'file string')
+    write_conf(conf_file, 6, 'new string')
+    assert conf.reload_layer(file_layer) == {'dummy': {'y': 'new string'}}
+    assert conf.dummy.x == 5
+
+
+def test_reload_layer_keeps_conf_frozen(conf, tmp_path, monkeypatch):
+    from confect.conf import ConfGroup
+
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5)
+    conf.load_file(conf_file, cache=False)
+    [file_layer] = conf.loaded_layers()
+
+    is_frozen = []
+    set_value = ConfGroup._set_value
+
+    def recording_set_value(group, prop_name, value):
+        is_frozen.append(conf._is_frozen)
+        set_value(group, prop_name, value)
+
+    monkeypatch.setattr(ConfGroup, '_set_value', recording_set_value)
+    write_conf(conf_file, 6)
+    conf.reload_layer(file_layer)
+    assert is_frozen == [True]
+
+
+def test_reload_layer_waits_for_transaction(conf, tmp_path):
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5)
+    conf.load_file(conf_file, cache=False)
+    [file_layer] = conf.loaded_layers()
+
+    write_conf(conf_file, 6)
+    thread = threading.Thread(target=conf.reload_layer, args=(file_layer,))
+    with conf.mutate_globally():
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+        assert conf.dummy.x == 5
+    thread.join()
+    assert conf.dummy.x == 6
+
+
+def test_watcher_callback_error(conf, tmp_path, caplog):
+    conf_file = tmp_path / 'conf.py'
+    write_conf(conf_file, 5)
+    conf.load_file(conf_file, cache=False)
+
+    def callback(changes):
+        raise RuntimeError('callback failed')
+
+    watcher = conf.watch(callback=callback)
+    write_conf(conf_file, 6, 'other string')
+    assert watcher.check() == {'dummy': {'x': 6, 'y': 'other string'}}
+    assert 'Error in watcher callback' in caplog.text
+
+    write_conf(conf_file, 70, 'other string')
+    assert watcher.check() == {'dummy': {'x': 70}}